@@ -0,0 +1,96 @@
+import queue
+import threading
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from . import metrics
+from .logs import get_logger
+
+log = get_logger("acquisition")
+
+
+class FetchJob:
+    """A list of inverters for the acquisition worker, with progress and cancellation.
+
+    on_result(tab_id, inverter, data) and on_done(job) run on the worker thread, so GUI
+    callers forward them to the Tk thread (TkBridge) instead of touching widgets.
+    """
+
+    def __init__(self, inverters: Iterable[Tuple[str, Dict]], on_result: Callable,
+                 on_done: Optional[Callable] = None):
+        self.inverters = list(inverters)
+        self.on_result = on_result
+        self.on_done = on_done
+        self.completed = 0
+        self.finished = threading.Event()
+        self._cancelled = threading.Event()
+
+    @property
+    def total(self) -> int:
+        return len(self.inverters)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+
+class AcquisitionWorker:
+    """The single background thread that talks to the cloud.
+
+    Polling, Refresh and Settings-save all queue their work here, so no fetch ever runs on
+    the Tk thread and fetches never overlap on the shared tinytuya.Cloud client. Work runs
+    in submission order. A cancelled job stops before its next fetch and drops the result
+    of a fetch that was already in flight; the request itself cannot be interrupted.
+    """
+
+    def __init__(self, fetch: Callable):
+        self.fetch = fetch
+        self.jobs = queue.Queue()
+        metrics.gauge("acquisition_queue", self.jobs.qsize)
+        self.thread = threading.Thread(target=self._run, name="acquisition", daemon=True)
+        self.thread.start()
+
+    def submit(self, job: FetchJob) -> FetchJob:
+        self.jobs.put(job)
+        return job
+
+    def call(self, func: Callable, on_done: Optional[Callable] = None) -> None:
+        """Run func() in turn with the fetch jobs; on_done(result, error) follows on the worker thread."""
+        self.jobs.put((func, on_done))
+
+    def _run(self):
+        while True:
+            job = self.jobs.get()
+            try:
+                if isinstance(job, FetchJob):
+                    self._run_job(job)
+                else:
+                    func, on_done = job
+                    try:
+                        result, error = func(), None
+                    except Exception as e:
+                        result, error = None, e
+                    if on_done:
+                        on_done(result, error)
+            except Exception as e:
+                log.exception("Acquisition job failed: %s", e)
+
+    def _run_job(self, job: FetchJob):
+        try:
+            for tab_id, inverter in job.inverters:
+                if job.cancelled:
+                    break
+                with metrics.span("fetch", inverter.get("sheet")):
+                    data = self.fetch(inverter["device_id"])
+                if data is None:
+                    metrics.incr("fetch_failures")
+                if job.cancelled:
+                    break  # Cancelled while this fetch was in flight
+                job.completed += 1
+                job.on_result(tab_id, inverter, data)
+        finally:
+            job.finished.set()
+            if job.on_done:
+                job.on_done(job)
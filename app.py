@@ -12,6 +12,7 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
 from matplotlib.ticker import MaxNLocator
 import threading
 import pandas as pd
@@ -56,14 +57,24 @@ def load_config():
 
 CONFIG = load_config()
 
-# Initialize Tuya Cloud (unchanged)
+# Tuya Cloud client, created on first fetch: creating it requests a token over the network
 tinytuya.set_debug(False)
-CLOUD = tinytuya.Cloud(
-    apiRegion=CONFIG["REGION"],
-    apiKey=CONFIG["API_KEY"],
-    apiSecret=CONFIG["API_SECRET"],
-    apiDeviceID=CONFIG["INVERTERS"][0]["device_id"]
-)
+_cloud = None
+
+def get_cloud():
+    global _cloud
+    if _cloud is None:
+        _cloud = tinytuya.Cloud(
+            apiRegion=CONFIG["REGION"],
+            apiKey=CONFIG["API_KEY"],
+            apiSecret=CONFIG["API_SECRET"],
+            apiDeviceID=CONFIG["INVERTERS"][0]["device_id"]
+        )
+    return _cloud
+
+def reset_cloud():
+    global _cloud
+    _cloud = None
 
 # Functions (unchanged until fetch_inverter_data)
 def decode_tuya_value(encoded_value: str) -> Optional[Tuple[int, ...]]:
@@ -103,8 +114,9 @@ def fetch_inverter_data(device_id: str) -> Optional[Dict]:
         pass  # If app isn’t accessible, proceed to real fetch
 
     try:
-        CLOUD.apiDeviceID = device_id
-        status = CLOUD.getstatus(device_id)
+        cloud = get_cloud()
+        cloud.apiDeviceID = device_id
+        status = cloud.getstatus(device_id)
         if not status or "result" not in status:
             print(f"❌ Failed to get status for device {device_id}")
             return None
@@ -358,7 +370,8 @@ class InverterGUI:
         power_select = tk.StringVar(value="Both")
         ttk.OptionMenu(power_frame, power_select, "Both", "AC", "DC", "Both", 
                        command=lambda val: self.update_power_graph(tab_id, val)).pack(fill="x")
-        power_fig, power_ax = plt.subplots(figsize=(initial_width, initial_height))
+        power_fig = Figure(figsize=(initial_width, initial_height))  # Not registered with pyplot, so freed with the tab
+        power_ax = power_fig.add_subplot(111)
         power_fig.subplots_adjust(left=0.1, right=0.95, bottom=0.3, top=0.9)
         power_canvas = FigureCanvasTkAgg(power_fig, master=power_frame)
         power_widget = power_canvas.get_tk_widget()
@@ -369,7 +382,8 @@ class InverterGUI:
         voltage_select = tk.StringVar(value="Both")
         ttk.OptionMenu(voltage_frame, voltage_select, "Both", "AC", "DC", "Both", 
                        command=lambda val: self.update_voltage_graph(tab_id, val)).pack(fill="x")
-        voltage_fig, voltage_ax = plt.subplots(figsize=(initial_width, initial_height))
+        voltage_fig = Figure(figsize=(initial_width, initial_height))
+        voltage_ax = voltage_fig.add_subplot(111)
         voltage_fig.subplots_adjust(left=0.1, right=0.95, bottom=0.3, top=0.9)
         voltage_canvas = FigureCanvasTkAgg(voltage_fig, master=voltage_frame)
         voltage_widget = voltage_canvas.get_tk_widget()
@@ -380,7 +394,8 @@ class InverterGUI:
         current_select = tk.StringVar(value="Both")
         ttk.OptionMenu(current_frame, current_select, "Both", "AC", "DC", "Both", 
                        command=lambda val: self.update_current_graph(tab_id, val)).pack(fill="x")
-        current_fig, current_ax = plt.subplots(figsize=(initial_width, initial_height))
+        current_fig = Figure(figsize=(initial_width, initial_height))
+        current_ax = current_fig.add_subplot(111)
         current_fig.subplots_adjust(left=0.1, right=0.95, bottom=0.3, top=0.9)
         current_canvas = FigureCanvasTkAgg(current_fig, master=current_frame)
         current_widget = current_canvas.get_tk_widget()
@@ -389,7 +404,8 @@ class InverterGUI:
         energy_frame = ttk.Frame(graphs_frame)
         energy_frame.grid(row=1, column=1, padx=5, pady=5, sticky="nsew")
         ttk.Label(energy_frame, text="Reverse Energy").pack(fill="x")
-        energy_fig, energy_ax = plt.subplots(figsize=(initial_width, initial_height))
+        energy_fig = Figure(figsize=(initial_width, initial_height))
+        energy_ax = energy_fig.add_subplot(111)
         energy_fig.subplots_adjust(left=0.1, right=0.95, bottom=0.3, top=0.9)
         energy_canvas = FigureCanvasTkAgg(energy_fig, master=energy_frame)
         energy_widget = energy_canvas.get_tk_widget()
@@ -453,7 +469,8 @@ class InverterGUI:
             power_select = tk.StringVar(value="Both")
             ttk.OptionMenu(power_frame, power_select, "Both", "AC", "DC", "Both", 
                         command=lambda val: self.update_power_graph(tab_id, val)).pack(fill="x")  # Use tab_id
-            power_fig, power_ax = plt.subplots(figsize=(initial_width, initial_height))
+            power_fig = Figure(figsize=(initial_width, initial_height))
+            power_ax = power_fig.add_subplot(111)
             power_fig.subplots_adjust(left=0.1, right=0.95, bottom=0.3, top=0.9)  # Set initial margins
             power_canvas = FigureCanvasTkAgg(power_fig, master=power_frame)
             power_widget = power_canvas.get_tk_widget()
@@ -465,7 +482,8 @@ class InverterGUI:
             voltage_select = tk.StringVar(value="Both")
             ttk.OptionMenu(voltage_frame, voltage_select, "Both", "AC", "DC", "Both", 
                         command=lambda val: self.update_voltage_graph(tab_id, val)).pack(fill="x")  # Use tab_id
-            voltage_fig, voltage_ax = plt.subplots(figsize=(initial_width, initial_height))
+            voltage_fig = Figure(figsize=(initial_width, initial_height))
+            voltage_ax = voltage_fig.add_subplot(111)
             voltage_fig.subplots_adjust(left=0.1, right=0.95, bottom=0.3, top=0.9)
             voltage_canvas = FigureCanvasTkAgg(voltage_fig, master=voltage_frame)
             voltage_widget = voltage_canvas.get_tk_widget()
@@ -477,7 +495,8 @@ class InverterGUI:
             current_select = tk.StringVar(value="Both")
             ttk.OptionMenu(current_frame, current_select, "Both", "AC", "DC", "Both", 
                         command=lambda val: self.update_current_graph(tab_id, val)).pack(fill="x")  # Use tab_id
-            current_fig, current_ax = plt.subplots(figsize=(initial_width, initial_height))
+            current_fig = Figure(figsize=(initial_width, initial_height))
+            current_ax = current_fig.add_subplot(111)
             current_fig.subplots_adjust(left=0.1, right=0.95, bottom=0.3, top=0.9)
             current_canvas = FigureCanvasTkAgg(current_fig, master=current_frame)
             current_widget = current_canvas.get_tk_widget()
@@ -487,7 +506,8 @@ class InverterGUI:
             energy_frame = ttk.Frame(graphs_frame)
             energy_frame.grid(row=1, column=1, padx=5, pady=5, sticky="nsew")
             ttk.Label(energy_frame, text="Reverse Energy").pack(fill="x")
-            energy_fig, energy_ax = plt.subplots(figsize=(initial_width, initial_height))
+            energy_fig = Figure(figsize=(initial_width, initial_height))
+            energy_ax = energy_fig.add_subplot(111)
             energy_fig.subplots_adjust(left=0.1, right=0.95, bottom=0.3, top=0.9)
             energy_canvas = FigureCanvasTkAgg(energy_fig, master=energy_frame)
             energy_widget = energy_canvas.get_tk_widget()
@@ -528,8 +548,7 @@ class InverterGUI:
         graph_data["power_ax"].tick_params(axis='x', rotation=45)
         graph_data["power_ax"].xaxis.set_major_locator(MaxNLocator(nbins=6))
         graph_data["power_ax"].set_xlabel("Time (HH:MM:SS)")
-        graph_data["power_fig"].tight_layout()
-        graph_data["power_canvas"].draw()
+        graph_data["power_canvas"].draw_idle()  # Layout is fixed by subplots_adjust; no per-sample tight_layout
 
     # ... (define update_voltage_graph, update_current_graph, update_energy_graph similarly) ...
 
@@ -646,8 +665,7 @@ class InverterGUI:
         graph_data["power_ax"].tick_params(axis='x', rotation=45)
         graph_data["power_ax"].xaxis.set_major_locator(MaxNLocator(nbins=6))
         graph_data["power_ax"].set_xlabel("Time (HH:MM:SS)")
-        graph_data["power_fig"].tight_layout()
-        graph_data["power_canvas"].draw()
+        graph_data["power_canvas"].draw_idle()  # Layout is fixed by subplots_adjust; no per-sample tight_layout
 
     def update_voltage_graph(self, device_id, option):
         graph_data = self.graphs[device_id]
@@ -667,8 +685,7 @@ class InverterGUI:
         graph_data["voltage_ax"].tick_params(axis='x', rotation=45)
         graph_data["voltage_ax"].xaxis.set_major_locator(MaxNLocator(nbins=6))
         graph_data["voltage_ax"].set_xlabel("Time (HH:MM:SS)")
-        graph_data["voltage_fig"].tight_layout()
-        graph_data["voltage_canvas"].draw()
+        graph_data["voltage_canvas"].draw_idle()  # Layout is fixed by subplots_adjust; no per-sample tight_layout
 
     def update_current_graph(self, device_id, option):
         graph_data = self.graphs[device_id]
@@ -688,8 +705,7 @@ class InverterGUI:
         graph_data["current_ax"].tick_params(axis='x', rotation=45)
         graph_data["current_ax"].xaxis.set_major_locator(MaxNLocator(nbins=6))
         graph_data["current_ax"].set_xlabel("Time (HH:MM:SS)")
-        graph_data["current_fig"].tight_layout()
-        graph_data["current_canvas"].draw()
+        graph_data["current_canvas"].draw_idle()  # Layout is fixed by subplots_adjust; no per-sample tight_layout
 
     def update_energy_graph(self, device_id):
         graph_data = self.graphs[device_id]
@@ -707,8 +723,7 @@ class InverterGUI:
         graph_data["energy_ax"].tick_params(axis='x', rotation=45)
         graph_data["energy_ax"].xaxis.set_major_locator(MaxNLocator(nbins=6))
         graph_data["energy_ax"].set_xlabel("Time (HH:MM:SS)")
-        graph_data["energy_fig"].tight_layout()
-        graph_data["energy_canvas"].draw()
+        graph_data["energy_canvas"].draw_idle()  # Layout is fixed by subplots_adjust; no per-sample tight_layout
 
     def start_monitoring(self):
         if not self.running:
@@ -788,7 +803,7 @@ class InverterGUI:
             inverter_entries, save_dir_entry.get())).pack(pady=10)
 
     def save_settings(self, api_key, api_secret, region, start_time, stop_time, interval, inverter_entries, save_dir):
-        global CONFIG, CLOUD
+        global CONFIG
         try:
             start = datetime.strptime(start_time, "%H:%M").time()
             stop = datetime.strptime(stop_time, "%H:%M").time()
@@ -818,12 +833,7 @@ class InverterGUI:
         with open(CONFIG_FILE, 'w') as f:
             json.dump(config_to_save, f, indent=4)
 
-        CLOUD = tinytuya.Cloud(
-            apiRegion=CONFIG["REGION"],
-            apiKey=CONFIG["API_KEY"],
-            apiSecret=CONFIG["API_SECRET"],
-            apiDeviceID=CONFIG["INVERTERS"][0]["device_id"]
-        )
+        reset_cloud()  # Recreated with the new credentials on the next fetch
         self.log.insert(tk.END, f"[{datetime.now()}] Configuration updated\n")
         if self.running:
             self.refresh_data()
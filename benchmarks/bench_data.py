@@ -0,0 +1,116 @@
+"""Acquisition and archive hot paths: decoding, fetch parsing, Excel writes and month loads."""
+import base64
+import os
+import struct
+import tempfile
+from datetime import datetime, timedelta
+
+from common import benchmark
+
+HEADERS = ["Timestamp", "Reverse Energy (kWh)", "Temp (°C)", "AC Power (W)", "AC Voltage (V)",
+           "Frequency (Hz)", "AC Current (A)", "DC Voltage (V)", "DC Current (A)", "DC Power (W)"]
+SHEETS = ["Inverter 1", "Inverter 2", "Inverter 3", "Inverter 4"]
+
+
+def encode(*values):
+    return base64.b64encode(struct.pack(f">{len(values)}H", *values)).decode()
+
+
+# A getstatus() reply as the Tuya cloud sends it for one inverter
+CANNED_STATUS = {"success": True, "t": 1700000000000, "result": [
+    {"code": "reverse_energy_total", "value": 1234567},
+    {"code": "temp_current", "value": 41},
+    {"code": "ac_power", "value": 15320},
+    {"code": "phase_a", "value": encode(2301, 66, 500)},
+    {"code": "pv1_dc_data", "value": encode(3105, 52, 16150)},
+    {"code": "pv2_dc_data", "value": encode(0, 0, 0)},
+    {"code": "switch", "value": True},
+    {"code": "fault", "value": 0},
+]}
+
+SAMPLE = {
+    "timestamp": "12:00:00",
+    "important_dps": {"reverse_energy_total (kWh)": 12345.67, "temp_current (°C)": 41, "ac_power (W)": 1532.0},
+    "extracted": {
+        "phase_a": {"ac_voltage": 230.1, "frequency": 50.0, "ac_current (A)": 6.658},
+        "pv1_dc_data": {"dc_voltage": 310.5, "dc_current": 5.2, "dc_power": 1615.0},
+    },
+}
+
+
+class CannedCloud:
+    apiDeviceID = None
+
+    def getstatus(self, device_id):
+        return CANNED_STATUS
+
+
+def sample_rows(start, count, step_seconds=300):
+    for i in range(count):
+        t = start + timedelta(seconds=i * step_seconds)
+        yield [t.strftime("%Y-%m-%d %H:%M:%S"), 12000 + i * 0.01, 40.0, 1500.0 + i % 50, 230.0,
+               50.0, 6.5, 310.0, 5.0, 1600.0]
+
+
+@benchmark("decode_tuya_value", number=10000)
+def decode_case():
+    from inverter_monitoring.data import decode_tuya_value
+    value = encode(2301, 66, 500)
+    return lambda: decode_tuya_value(value)
+
+
+@benchmark("fetch_inverter_data[canned]", number=2000)
+def fetch_case():
+    from inverter_monitoring import data
+    data.get_cloud = CannedCloud  # Canned reply instead of the network; parsing is what is timed
+    return lambda: data.fetch_inverter_data("bench-device")
+
+
+@benchmark("FleetSimulator.sample[500 inverters]", number=5)
+def simulator_case():
+    from inverter_monitoring.simulator import FleetSimulator, sim_device_id
+    device_ids = [sim_device_id(i) for i in range(500)]
+    simulator = FleetSimulator(device_ids, seed=1)
+    start = datetime(2024, 6, 1, 12).timestamp()
+    step = iter(range(10 ** 9))
+    return lambda: [simulator.sample(device_id, start + 10 * next(step)) for device_id in device_ids]
+
+
+# Stacked decorators register bottom-up, so the largest size is listed first
+@benchmark("write_to_excel[10k rows]", rows=10000, slow=True)
+@benchmark("write_to_excel[1k rows]", rows=1000)
+@benchmark("write_to_excel[100 rows]", rows=100)
+def write_case(rows):
+    from openpyxl import Workbook
+    from inverter_monitoring.file_ops import write_to_excel
+    base_folder = tempfile.mkdtemp(prefix="bench_write_")
+    now = datetime.now()
+    folder = os.path.join(base_folder, now.strftime("%Y-%m"))
+    os.makedirs(folder)
+    wb = Workbook()
+    ws = wb.active
+    ws.title = SHEETS[0]
+    ws.append(HEADERS)
+    for row in sample_rows(now.replace(hour=0, minute=0, second=0), rows, step_seconds=max(1, 86400 // rows)):
+        ws.append(row)
+    wb.save(os.path.join(folder, now.strftime("%Y-%m-%d.xlsx")))
+    return lambda: write_to_excel(SAMPLE, SHEETS[0], base_folder=base_folder)
+
+
+@benchmark("load_historical_data[30 days]", days=30, slow=True)
+@benchmark("load_historical_data[7 days]", days=7)
+def load_case(days):
+    import pandas as pd
+    from inverter_monitoring.file_ops import load_historical_data
+    base_folder = tempfile.mkdtemp(prefix="bench_load_")
+    month = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    folder = os.path.join(base_folder, month.strftime("%Y-%m"))
+    os.makedirs(folder)
+    for day in range(days):
+        # Files only need a name inside this month's folder; the real calendar does not matter
+        start = month + timedelta(days=day)
+        frame = pd.DataFrame(list(sample_rows(start, 288)), columns=HEADERS)  # One sample per 5 minutes
+        with pd.ExcelWriter(os.path.join(folder, f"{month:%Y-%m}-{day + 1:02d}.xlsx")) as writer:
+            for sheet in SHEETS:
+                frame.to_excel(writer, sheet_name=sheet, index=False)
+    return lambda: load_historical_data(SHEETS[0], base_folder=base_folder)
@@ -0,0 +1,97 @@
+"""The live display path, update_display -> update_all_graphs, drawn with Agg instead of Tk."""
+from collections import deque
+from datetime import datetime, timedelta
+
+from common import benchmark
+
+KINDS = ("power", "voltage", "current", "energy")
+
+
+class Var:
+    """Stand-in for tk.StringVar, which needs a Tk interpreter."""
+
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+class Scheduler:
+    def mark_dirty(self, key):
+        pass
+
+
+def make_dashboard(samples):
+    """An object with the InverterGUI state update_display and the graph functions use, minus the widgets."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import numpy as np
+    import pandas as pd
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from inverter_monitoring.fleet import FleetAggregator
+    from inverter_monitoring.gui.figure_pool import FigurePool
+    from inverter_monitoring.gui.graphs import update_power_graph, update_voltage_graph, update_current_graph, update_energy_graph, update_all_graphs
+    from inverter_monitoring.gui.gui import InverterGUI
+    from inverter_monitoring.gui.overview import FleetOverview
+    from inverter_monitoring.stats import InverterStats
+
+    class AggDashboard:
+        update_display = InverterGUI.update_display
+        show_values = InverterGUI.show_values
+        update_day_stats = InverterGUI.update_day_stats
+        sample_row = staticmethod(InverterGUI.sample_row)
+
+    self = AggDashboard()
+    tab_id = "bench"
+    now = datetime.now()
+    times = pd.date_range(end=now, periods=samples, freq="10s")
+    rng = np.random.default_rng(0)
+    history = pd.DataFrame({"Timestamp": times})
+    for column in ["Reverse Energy (kWh)", "Temp (°C)", "AC Power (W)", "AC Voltage (V)", "Frequency (Hz)",
+                   "AC Current (A)", "DC Voltage (V)", "DC Current (A)", "DC Power (W)"]:
+        history[column] = rng.random(samples) * 100
+    fig, axes = FigurePool().acquire()
+    self.graphs = {tab_id: {
+        "fig": fig, "canvas": FigureCanvasAgg(fig), "image_label": None,
+        "power_select": Var("Both"), "voltage_select": Var("Both"), "current_select": Var("Both"),
+        "range_var": Var("All"), "range_choice": Var("All"), "sheet": "Inverter 1", "view": None,
+        "historical_data": history,
+    }}
+    for kind, ax in zip(KINDS, axes):
+        self.graphs[tab_id][f"{kind}_ax"] = ax
+    self.stats = {tab_id: InverterStats()}
+    self.stats[tab_id].seed(history)
+    self.fleet = FleetAggregator([tab_id], 10)
+    self.fleet.load({tab_id: history})
+    self.latest_data, self.built, self.scheduler = {}, set(), Scheduler()
+    # Row values and sparkline data only; the canvas is repainted by the scheduler, not here
+    self.overview = FleetOverview.__new__(FleetOverview)
+    self.overview.rows, self.overview.sparks = {tab_id: {}}, {tab_id: deque(maxlen=60)}
+    self.renderer = None
+    self.update_power_graph = update_power_graph.__get__(self, AggDashboard)
+    self.update_voltage_graph = update_voltage_graph.__get__(self, AggDashboard)
+    self.update_current_graph = update_current_graph.__get__(self, AggDashboard)
+    self.update_energy_graph = update_energy_graph.__get__(self, AggDashboard)
+    self.update_all_graphs = update_all_graphs.__get__(self, AggDashboard)
+    self.update_all_graphs(tab_id)  # First draw builds the lines and caches the backgrounds
+    return self, tab_id
+
+
+@benchmark("update_display+graphs[100k]", number=5, samples=100000, slow=True)
+@benchmark("update_display+graphs[10k]", number=20, samples=10000)
+@benchmark("update_display+graphs[1k]", number=20, samples=1000)
+def display_case(samples):
+    from inverter_monitoring.gui.bridge import SampleEvent
+    from bench_data import SAMPLE
+    self, tab_id = make_dashboard(samples)
+    clock = [datetime.now()]
+
+    def run():
+        clock[0] += timedelta(seconds=10)
+        self.update_display(tab_id, [SampleEvent(tab_id, "Inverter 1", SAMPLE, clock[0])])
+        self.update_all_graphs(tab_id)
+    return run
@@ -0,0 +1,62 @@
+"""Shared plumbing for the benchmark scripts: making the tree importable and the case registry."""
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, NamedTuple
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def package_root():
+    """Directory that makes this tree importable as inverter_monitoring.
+
+    The modules import each other as inverter_monitoring.*, so a checkout under another
+    name (a CI workspace, for instance) is reached through a symlink in a temp directory.
+    """
+    if os.path.basename(PACKAGE_DIR) == "inverter_monitoring":
+        return os.path.dirname(PACKAGE_DIR)
+    link_dir = tempfile.mkdtemp(prefix="inverter_monitoring_")
+    os.symlink(PACKAGE_DIR, os.path.join(link_dir, "inverter_monitoring"), target_is_directory=True)
+    return link_dir
+
+
+class Case(NamedTuple):
+    name: str
+    setup: Callable  # setup(**params) -> zero-argument callable that is timed
+    params: Dict
+    number: int      # Calls per timed repeat
+    slow: bool       # Skipped by --quick
+
+
+CASES: List[Case] = []
+
+
+def benchmark(name, number=1, slow=False, **params):
+    """Register the decorated setup function; stack it once per parameter set."""
+    def register(setup):
+        CASES.append(Case(name, setup, params, number, slow))
+        return setup
+    return register
+
+
+def time_case(case, repeat):
+    """Run a case's setup once, then time `repeat` rounds of `number` calls (one warm-up call first)."""
+    run = case.setup(**case.params)
+    run()
+    per_call = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(case.number):
+            run()
+        per_call.append((time.perf_counter() - start) * 1000 / case.number)
+    return {"median_ms": statistics.median(per_call), "min_ms": min(per_call),
+            "number": case.number, "repeat": repeat}
+
+
+def ensure_importable():
+    root = package_root()
+    if root not in sys.path:
+        sys.path.insert(0, root)
+    return root
@@ -0,0 +1,100 @@
+"""Import-time budget for the modules a collector or CLI run needs.
+
+Every module is imported in a fresh interpreter with sockets disabled. An import must not
+touch the network or print. The light modules must also stay clear of the GUI and data
+stack (tkinter, matplotlib, pandas, ...) and import within the budget. The GUI modules
+are only checked for network access and output, since they need those libraries anyway.
+
+    python benchmarks/import_budget.py [--budget-ms 300] [--repeat 3]
+
+Exits with status 1 if any module breaks a rule.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from common import package_root
+
+LIGHT_MODULES = [
+    "inverter_monitoring.config",
+    "inverter_monitoring.logs",
+    "inverter_monitoring.metrics",
+    "inverter_monitoring.data",
+    "inverter_monitoring.file_ops",
+    "inverter_monitoring.acquisition",
+    "inverter_monitoring.fake_cloud",
+    "inverter_monitoring.simulator",
+    "inverter_monitoring.http_api",
+    "inverter_monitoring.profiling",
+    "inverter_monitoring.gui.bridge",
+]
+GUI_MODULES = ["inverter_monitoring.gui.gui"]
+HEAVY = ["tkinter", "matplotlib", "pandas", "numpy", "openpyxl", "tinytuya"]
+
+# Runs in the child interpreter: time one import with the network and stdout taken away
+CHILD = r"""
+import io, json, socket, sys, time
+
+def refuse(*args, **kwargs):
+    raise RuntimeError("network access during import")
+
+socket.socket.connect = refuse
+socket.create_connection = refuse
+socket.getaddrinfo = refuse
+stdout, sys.stdout = sys.stdout, io.StringIO()
+error = None
+start = time.perf_counter()
+try:
+    __import__(sys.argv[1])
+except BaseException as e:
+    error = repr(e)
+elapsed = (time.perf_counter() - start) * 1000
+printed, sys.stdout = sys.stdout.getvalue(), stdout
+print(json.dumps({"ms": elapsed, "error": error, "printed": printed,
+                  "heavy": sorted(name for name in json.loads(sys.argv[2]) if name in sys.modules)}))
+"""
+
+
+def measure(module, repeat, root):
+    """Fastest of `repeat` cold imports, with what the import printed and pulled in."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get("PYTHONPATH")])))
+    best = None
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", CHILD, module, json.dumps(HEAVY)],
+                                capture_output=True, text=True, env=env).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        if best is None or result["ms"] < best["ms"]:
+            best = result
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=300.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    root = package_root()
+    failures = []
+    for module in LIGHT_MODULES + GUI_MODULES:
+        result = measure(module, args.repeat, root)
+        problems = []
+        if result["error"]:
+            problems.append(f"import failed: {result['error']}")
+        if result["printed"]:
+            problems.append(f"printed {result['printed'].strip()[:60]!r}")
+        if module in LIGHT_MODULES:
+            if result["heavy"]:
+                problems.append("imports " + ", ".join(result["heavy"]))
+            if result["ms"] > args.budget_ms:
+                problems.append(f"over budget ({args.budget_ms:.0f} ms)")
+        print(f"{module:40s} {result['ms']:8.1f} ms  {'; '.join(problems) or 'ok'}")
+        if problems:
+            failures.append(module)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
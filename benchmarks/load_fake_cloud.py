@@ -0,0 +1,82 @@
+"""Drive a simulated fleet through the real fetch and storage path against fake_cloud.
+
+    python benchmarks/load_fake_cloud.py --inverters 500 --cycles 2 --latency-ms 80
+
+Starts a fake_cloud server in-process, points get_cloud() at it and runs poll cycles the
+way the GUI does: one FetchJob on the AcquisitionWorker, each result written with
+write_to_excel to a temporary SAVE_DIR. Reports cycle time, samples per second and the
+fetch and write latency percentiles. For the GUI, run fake_cloud with --config-out.
+"""
+import argparse
+import shutil
+import statistics
+import tempfile
+import time
+
+from common import ensure_importable
+
+ensure_importable()
+from inverter_monitoring import config, data, fake_cloud, simulator  # noqa: E402
+from inverter_monitoring.acquisition import AcquisitionWorker, FetchJob  # noqa: E402
+from inverter_monitoring.file_ops import write_to_excel  # noqa: E402
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))] if values else 0.0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--inverters", type=int, default=500)
+    parser.add_argument("--cycles", type=int, default=1)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=0)
+    parser.add_argument("--no-write", action="store_true", help="fetch only, skip the Excel writes")
+    args = parser.parse_args(argv)
+
+    fake = fake_cloud.FakeTuyaCloud(port=0, latency_ms=args.latency_ms, error_rate=args.error_rate,
+                                    rate_limit=args.rate_limit).start()
+    save_dir = tempfile.mkdtemp(prefix="load_fake_cloud_")
+    inverters = simulator.inverters(args.inverters, fake_cloud.FAKE_PREFIX)
+    config.CONFIG.update(FAKE_CLOUD=fake.address, INVERTERS=inverters, SAVE_DIR=save_dir)
+    config.reset_cloud()
+
+    fetch_ms, write_ms = [], []
+
+    def timed_fetch(device_id):
+        start = time.perf_counter()
+        try:
+            return data.fetch_inverter_data(device_id)
+        finally:
+            fetch_ms.append((time.perf_counter() - start) * 1000)
+
+    def on_result(tab_id, inverter, sample):
+        if sample and not args.no_write:
+            start = time.perf_counter()
+            write_to_excel(sample, inverter["sheet"], save_dir)
+            write_ms.append((time.perf_counter() - start) * 1000)
+
+    worker = AcquisitionWorker(timed_fetch)
+    worker.call(config.get_cloud)  # Token request outside the timed cycles
+    try:
+        for cycle in range(1, args.cycles + 1):
+            fetch_ms.clear()
+            write_ms.clear()
+            start = time.perf_counter()
+            job = worker.submit(FetchJob(enumerate(inverters), on_result))
+            job.finished.wait()
+            elapsed = time.perf_counter() - start
+            print(f"cycle {cycle}: {job.completed} inverters in {elapsed:.2f}s "
+                  f"({job.completed / elapsed:.1f}/s); "
+                  f"fetch p50 {statistics.median(fetch_ms):.1f} ms p95 {percentile(fetch_ms, 0.95):.1f} ms; "
+                  f"write p50 {statistics.median(write_ms or [0]):.1f} ms p95 {percentile(write_ms, 0.95):.1f} ms")
+        print("server:", fake.stats())
+    finally:
+        fake.stop()
+        shutil.rmtree(save_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Run the benchmark suite, save JSON baselines and flag regressions.
+
+    python benchmarks/run.py                          # run everything, print a table
+    python benchmarks/run.py --save baseline.json     # record a baseline
+    python benchmarks/run.py --compare baseline.json  # fail if a case got slower than the threshold
+    python benchmarks/run.py --quick -k excel         # fewer repeats, no slow cases, name filter
+
+Baselines hold per-case median and best times and are only comparable on the same machine,
+so record one before an optimization and compare against it afterwards.
+"""
+import argparse
+import json
+import platform
+import sys
+
+from common import CASES, ensure_importable, time_case
+
+ensure_importable()
+import bench_data  # noqa: E402,F401  (registers cases)
+import bench_gui  # noqa: E402,F401
+
+
+def compare(results, baseline, threshold):
+    """Names of cases whose median grew by more than `threshold` (a fraction) over the baseline."""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get("results", {}).get(name)
+        if before is None:
+            continue
+        ratio = result["median_ms"] / before["median_ms"] if before["median_ms"] else 1.0
+        result["baseline_ms"] = before["median_ms"]
+        result["ratio"] = ratio
+        if ratio > 1 + threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", dest="pattern", default="", help="only cases whose name contains this")
+    parser.add_argument("--quick", action="store_true", help="one repeat, skip slow cases")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save", metavar="PATH", help="write the results as a baseline")
+    parser.add_argument("--compare", metavar="PATH", help="baseline to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown, as a fraction")
+    args = parser.parse_args(argv)
+
+    repeat = 1 if args.quick else args.repeat
+    results = {}
+    for case in CASES:
+        if args.pattern not in case.name or (args.quick and case.slow):
+            continue
+        results[case.name] = time_case(case, repeat)
+        print(f"{case.name:40s} {results[case.name]['median_ms']:10.3f} ms", flush=True)
+
+    regressions = []
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        print()
+        for name, result in results.items():
+            if "ratio" in result:
+                flag = "REGRESSION" if name in regressions else ""
+                print(f"{name:40s} {result['baseline_ms']:10.3f} -> {result['median_ms']:10.3f} ms  x{result['ratio']:.2f} {flag}")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"python": platform.python_version(), "machine": platform.platform(),
+                       "results": results}, f, indent=2)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,10 @@
 import os
-import tinytuya
+import threading
 from datetime import datetime
 import json
+from .logs import get_logger
+
+log = get_logger("config")
 
 CONFIG_FILE = "config.json"
 DEFAULT_CONFIG = {
@@ -16,7 +19,24 @@ DEFAULT_CONFIG = {
     ],
     "RECORDING_WINDOW": {"start": "06:00", "stop": "20:00"},
     "FETCH_INTERVAL": 300,
-    "SAVE_DIR": "data"
+    "SAVE_DIR": "data",
+    "LIVE_BLIT": True,
+    "UI_FRAME_MS": 100,
+    "RENDER_MODE": "inline",
+    "UI_REFRESH_MS": 10000,
+    "DEBUG_LOG": False,
+    "LOG_FILE": "",
+    "LOG_MAX_BYTES": 1000000,
+    "LOG_BACKUPS": 3,
+    "LOG_BUFFER": 2000,
+    "TAB_IDLE_SECONDS": 300,
+    "FAKE_CLOUD": "",
+    "SIM_SEED": 0,
+    "SIM_SPEED": 1.0,
+    "METRICS": True,
+    "HTTP_API": "",
+    "FRAME_OVERLAY": False,
+    "OVERVIEW_TABS": 12
 }
 
 def load_config():
@@ -30,19 +50,51 @@ def load_config():
             start_time = datetime.strptime(config["RECORDING_WINDOW"]["start"], "%H:%M").time()
             stop_time = datetime.strptime(config["RECORDING_WINDOW"]["stop"], "%H:%M").time()
             config["RECORDING_WINDOW"] = (start_time, stop_time)
-            print(f"Loaded CONFIG with inverters: {[inv['sheet'] for inv in config['INVERTERS']]}")
+            log.info("Loaded CONFIG with inverters: %s", [inv["sheet"] for inv in config["INVERTERS"]])
             return config
     default = DEFAULT_CONFIG.copy()
     start_time = datetime.strptime(default["RECORDING_WINDOW"]["start"], "%H:%M").time()
     stop_time = datetime.strptime(default["RECORDING_WINDOW"]["stop"], "%H:%M").time()
     default["RECORDING_WINDOW"] = (start_time, stop_time)
-    print(f"Loaded DEFAULT_CONFIG with inverters: {[inv['sheet'] for inv in default['INVERTERS']]}")
+    log.info("Loaded DEFAULT_CONFIG with inverters: %s", [inv["sheet"] for inv in default["INVERTERS"]])
     return default
 
 CONFIG = load_config()
-CLOUD = tinytuya.Cloud(
-    apiRegion=CONFIG["REGION"],
-    apiKey=CONFIG["API_KEY"],
-    apiSecret=CONFIG["API_SECRET"],
-    apiDeviceID=CONFIG["INVERTERS"][0]["device_id"]  # Use Inverter 1's device_id as default, but will need adjustment for multiple devices later
-)
\ No newline at end of file
+_cloud = None
+_cloud_lock = threading.Lock()
+
+def get_cloud():
+    """The shared tinytuya.Cloud client, created on first use.
+
+    Creating it fetches an API token over the network, so this is never done at import
+    time; callers on the Tk thread go through the acquisition worker. With FAKE_CLOUD set
+    to host:port the client talks to a local fake_cloud server instead of Tuya.
+
+    tinytuya uses the module-level requests functions, so the fake server's certificate
+    can only be trusted through REQUESTS_CA_BUNDLE. That setting is process-wide: while a
+    fake client exists, every requests call in the process verifies against that
+    certificate alone. reset_cloud() restores the previous value.
+    """
+    global _cloud
+    with _cloud_lock:
+        if _cloud is None and CONFIG.get("FAKE_CLOUD"):
+            from .fake_cloud import connect
+            _cloud = connect(CONFIG["FAKE_CLOUD"], CONFIG["INVERTERS"][0]["device_id"])
+        elif _cloud is None:
+            import tinytuya
+            _cloud = tinytuya.Cloud(
+                apiRegion=CONFIG["REGION"],
+                apiKey=CONFIG["API_KEY"],
+                apiSecret=CONFIG["API_SECRET"],
+                apiDeviceID=CONFIG["INVERTERS"][0]["device_id"]  # Use Inverter 1's device_id as default
+            )
+        return _cloud
+
+def reset_cloud():
+    """Forget the client so the next get_cloud() uses the current credentials."""
+    global _cloud
+    with _cloud_lock:
+        if getattr(_cloud, "fake_ca", None):
+            from .fake_cloud import disconnect
+            disconnect(_cloud)  # Stop trusting the fake server's certificate process-wide
+        _cloud = None
\ No newline at end of file
@@ -1,55 +1,46 @@
-import tinytuya
 import base64
 import struct
+import time
 from datetime import datetime
 from typing import Dict, Optional, Tuple
-import random
-from config import CONFIG, CLOUD
+from .config import CONFIG, get_cloud
+from . import logs, metrics
+
+log = logs.get_logger("data")
+_simulator = None  # FleetSimulator set by set_simulator()
 
 def decode_tuya_value(encoded_value: str) -> Optional[Tuple[int, ...]]:
     try:
         decoded_bytes = base64.b64decode(encoded_value)
         return struct.unpack(f">{len(decoded_bytes)//2}H", decoded_bytes)
     except Exception as e:
-        print(f"⚠️ Base64 decoding error: {e}")
+        log.warning("Base64 decoding error: %s", e)
         return None
 
+def set_simulator(simulator) -> None:
+    """Answer fetches for the simulator's device IDs from it instead of the cloud; None to stop."""
+    global _simulator
+    _simulator = simulator
+
 def fetch_inverter_data(device_id: str) -> Optional[Dict]:
-    try:
-        from __main__ import app
-        if app.simulate_mode and not device_id:
-            sim_data = {
-                "timestamp": datetime.now().strftime("%H:%M:%S"),
-                "important_dps": {
-                    "reverse_energy_total (kWh)": random.uniform(0, 10),
-                    "temp_current (°C)": random.uniform(20, 30),
-                    "ac_power (W)": random.uniform(50, 200)
-                },
-                "extracted": {
-                    "phase_a": {
-                        "ac_voltage": random.uniform(220, 240),
-                        "frequency": random.uniform(49.9, 50.1),
-                        "ac_current (A)": random.uniform(0.2, 1.0)
-                    },
-                    "pv1_dc_data": {
-                        "dc_voltage": random.uniform(250, 350),
-                        "dc_current": random.uniform(0.1, 0.5),
-                        "dc_power": random.uniform(50, 150)
-                    }
-                }
-            }
-            print(f"🎭 Simulated data for device {device_id}")
-            return sim_data
-    except (ImportError, AttributeError):
-        pass
+    simulator = _simulator
+    if simulator is not None and device_id in simulator:
+        if logs.DEBUG:
+            log.debug("Simulated data for device %s", device_id)
+        return simulator.sample(device_id)
 
     try:
-        CLOUD.apiDeviceID = device_id
-        status = CLOUD.getstatus(device_id)
+        cloud = get_cloud()
+        cloud.apiDeviceID = device_id
+        token = getattr(cloud, "token", None)
+        status = cloud.getstatus(device_id)
+        if getattr(cloud, "token", None) != token:
+            metrics.incr("fetch_retries")  # tinytuya renewed the token and sent the request again
         if not status or "result" not in status:
-            print(f"❌ Failed to get status for device {device_id}")
+            log.warning("Failed to get status for device %s", device_id)
             return None
 
+        decode_started = time.perf_counter()
         result = status["result"]
         data = result if isinstance(result, list) else [result]
 
@@ -84,6 +75,7 @@ def fetch_inverter_data(device_id: str) -> Optional[Dict]:
         ac_current = (important_dps.get("ac_power") / phase_a_data["ac_voltage"] 
                       if phase_a_data["ac_voltage"] and "ac_power" in important_dps else None)
 
+        metrics.observe("decode", (time.perf_counter() - decode_started) * 1000)
         return {
             "timestamp": datetime.now().strftime("%H:%M:%S"),
             "important_dps": {
@@ -97,5 +89,5 @@ def fetch_inverter_data(device_id: str) -> Optional[Dict]:
             }
         }
     except Exception as e:
-        print(f"❌ Unexpected error for device {device_id}: {e}")
+        log.exception("Unexpected error for device %s: %s", device_id, e)
         return None
\ No newline at end of file
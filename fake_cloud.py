@@ -0,0 +1,296 @@
+"""Local stand-in for the Tuya cloud, so load tests never touch the real API.
+
+    python -m inverter_monitoring.fake_cloud --port 8443 --latency-ms 80 --error-rate 0.01
+    python -m inverter_monitoring.fake_cloud --inverters 500 --config-out fleet.json
+
+Serves the two endpoints tinytuya.Cloud.getstatus() uses, the token and the device
+status, for any device ID. Every ID becomes an inverter of a seeded FleetSimulator, so
+the payloads (including base64 phase_a and pv1_dc_data) are plausible and repeatable. tinytuya always
+builds https:// URLs, so the server speaks TLS with a throwaway self-signed certificate.
+Setting FAKE_CLOUD to host:port in config.json makes get_cloud() talk to this server.
+"""
+import argparse
+import base64
+import json
+import os
+import random
+import shutil
+import ssl
+import struct
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from .logs import get_logger
+from .simulator import FleetSimulator, inverters, write_config
+
+log = get_logger("fake_cloud")
+
+STATUS_PREFIX = "/v1.0/iot-03/devices/"
+FAKE_PREFIX = "fake"  # Device IDs for fake-cloud fleets; Simulate mode answers "sim" IDs itself
+FAKE_API_KEY = "fake-key"
+FAKE_API_SECRET = "fake-secret"
+
+
+def encode(*values):
+    """Pack unsigned 16-bit big-endian values the way the inverter reports phase_a and pv1_dc_data."""
+    return base64.b64encode(struct.pack(f">{len(values)}H", *values)).decode()
+
+
+def device_status(sample):
+    """A simulator sample as the status list the cloud returns, in raw units and encodings."""
+    important, phase_a, dc = sample["important_dps"], sample["extracted"]["phase_a"], sample["extracted"]["pv1_dc_data"]
+    return [
+        {"code": "reverse_energy_total", "value": round(important["reverse_energy_total (kWh)"] * 100)},
+        {"code": "temp_current", "value": important["temp_current (°C)"]},
+        {"code": "ac_power", "value": round(important["ac_power (W)"] * 10)},
+        {"code": "phase_a", "value": encode(round(phase_a["ac_voltage"] * 10), round(phase_a["ac_current (A)"] * 10),
+                                            round(phase_a["frequency"] * 10))},
+        {"code": "pv1_dc_data", "value": encode(round(dc["dc_voltage"] * 10), round(dc["dc_current"] * 10),
+                                                round(dc["dc_power"] * 10))},
+        {"code": "pv2_dc_data", "value": encode(0, 0, 0)},
+    ]
+
+
+def make_certificate(host, directory):
+    """Write a self-signed certificate for `host` and its key into `directory`; returns both paths."""
+    import ipaddress
+    from datetime import datetime, timedelta, timezone
+    try:
+        from cryptography import x509
+        from cryptography.hazmat.primitives import hashes, serialization
+        from cryptography.hazmat.primitives.asymmetric import ec
+        from cryptography.x509.oid import NameOID
+    except ImportError as e:
+        raise RuntimeError("fake_cloud needs the 'cryptography' package for its TLS certificate; "
+                           "install it with: pip install cryptography") from e
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, host)])
+    try:
+        alt_name = x509.IPAddress(ipaddress.ip_address(host))
+    except ValueError:
+        alt_name = x509.DNSName(host)
+    now = datetime.now(timezone.utc)
+    cert = (x509.CertificateBuilder().subject_name(name).issuer_name(name)
+            .public_key(key.public_key()).serial_number(x509.random_serial_number())
+            .not_valid_before(now - timedelta(minutes=5)).not_valid_after(now + timedelta(days=30))
+            .add_extension(x509.SubjectAlternativeName([alt_name]), critical=False)
+            .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+            .sign(key, hashes.SHA256()))
+    cert_file, key_file = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    with open(key_file, "wb") as f:
+        f.write(key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                                  serialization.NoEncryption()))
+    with open(cert_file, "wb") as f:
+        f.write(cert.public_bytes(serialization.Encoding.PEM))
+    return cert_file, key_file
+
+
+class FakeTuyaCloud:
+    """The fake API: token handling, fault injection and request counters.
+
+    latency_ms (+ up to jitter_ms) is slept before every reply. error_rate is the share of
+    status calls answered with success: false, as the cloud does for a device that is
+    offline. rate_limit caps requests per second across all clients; the excess gets
+    HTTP 429. Tokens expire after token_ttl seconds, which exercises tinytuya's renewal.
+    """
+
+    def __init__(self, host="127.0.0.1", port=8443, latency_ms=0, jitter_ms=0, error_rate=0.0,
+                 rate_limit=0, token_ttl=7200, seed=0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.token_ttl = token_ttl
+        self.simulator = FleetSimulator(seed=seed)
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.tokens = {}  # access token -> expiry (epoch seconds)
+        self.counts = {"requests": 0, "tokens": 0, "status": 0, "errors": 0, "limited": 0, "expired": 0}
+        self._allowance = float(rate_limit)
+        self._last_check = time.monotonic()
+        # Each server gets its own certificate; the files are only needed until they are loaded
+        cert_dir = tempfile.mkdtemp(prefix="fake_cloud_")
+        try:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(*make_certificate(host, cert_dir))
+        finally:
+            shutil.rmtree(cert_dir, ignore_errors=True)
+        self.server = ThreadingHTTPServer((host, port), FakeCloudHandler)
+        self.server.daemon_threads = True
+        # The handshake happens in each request's thread (FakeCloudHandler.setup), not in the accept loop
+        self.server.socket = context.wrap_socket(self.server.socket, server_side=True, do_handshake_on_connect=False)
+        self.server.fake = self
+        self.thread = None
+
+    @property
+    def address(self):
+        host, port = self.server.server_address[:2]
+        return f"{host}:{port}"
+
+    def start(self):
+        """Serve on a daemon thread; returns self so tests can write FakeTuyaCloud(...).start()."""
+        self.thread = threading.Thread(target=self.server.serve_forever, name="fake-cloud", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def stats(self):
+        with self.lock:
+            return dict(self.counts)
+
+    def _admit(self):
+        # Token bucket refilled at rate_limit per second, holding at most one second's worth
+        if not self.rate_limit:
+            return True
+        now = time.monotonic()
+        self._allowance = min(self.rate_limit, self._allowance + (now - self._last_check) * self.rate_limit)
+        self._last_check = now
+        if self._allowance < 1:
+            return False
+        self._allowance -= 1
+        return True
+
+    def handle(self, path, headers):
+        """(HTTP status, reply dict) for one GET request."""
+        with self.lock:
+            self.counts["requests"] += 1
+            if not self._admit():
+                self.counts["limited"] += 1
+                return 429, {"success": False, "code": 429, "msg": "request rate limit exceeded"}
+            failed = self.rng.random() < self.error_rate
+            delay = (self.latency_ms + self.rng.uniform(0, self.jitter_ms)) / 1000
+        if delay:
+            time.sleep(delay)
+        now = time.time()
+        reply = {"success": True, "t": int(now * 1000)}
+        url = urlsplit(path)
+        if url.path == "/v1.0/token":
+            token = "fake-%032x" % random.getrandbits(128)
+            with self.lock:
+                self.counts["tokens"] += 1
+                self.tokens = {t: expiry for t, expiry in self.tokens.items() if expiry > now}
+                self.tokens[token] = now + self.token_ttl
+            reply["result"] = {"access_token": token, "expire_time": self.token_ttl,
+                               "refresh_token": token, "uid": "fake-uid"}
+            return 200, reply
+        if url.path.startswith(STATUS_PREFIX) and url.path.endswith("/status"):
+            with self.lock:
+                self.counts["status"] += 1
+                valid = self.tokens.get(headers.get("access_token"), 0) > now
+                if not valid:
+                    self.counts["expired"] += 1
+                elif failed:
+                    self.counts["errors"] += 1
+            if not valid:
+                return 200, {"success": False, "code": 1010, "msg": "token invalid", "t": reply["t"]}
+            if failed:
+                return 200, {"success": False, "code": 1106, "msg": "simulated device error", "t": reply["t"]}
+            device_id = url.path[len(STATUS_PREFIX):-len("/status")]
+            reply["result"] = device_status(self.simulator.sample(device_id, now))
+            return 200, reply
+        return 404, {"success": False, "code": 404, "msg": "uri path invalid"}
+
+
+class FakeCloudHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    timeout = 30  # Also bounds the TLS handshake, so a stalled client cannot hold its thread
+
+    def setup(self):
+        super().setup()
+        self.request.do_handshake()
+
+    def do_GET(self):
+        status, reply = self.server.fake.handle(self.path, self.headers)
+        body = json.dumps(reply).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        log.debug(format, *args)
+
+
+def connect(address, device_id):
+    """A tinytuya.Cloud client for the fake server at host:port.
+
+    The server's self-signed certificate is read from the server itself. tinytuya cannot
+    be given a CA bundle, so it is trusted through REQUESTS_CA_BUNDLE until disconnect()
+    (called by config.reset_cloud) puts the previous value back.
+    """
+    import tinytuya
+    host, _, port = address.rpartition(":")
+    ca_dir = tempfile.mkdtemp(prefix="fake_cloud_ca_")
+    ca_file = os.path.join(ca_dir, "ca.pem")
+    with open(ca_file, "w") as f:
+        f.write(ssl.get_server_certificate((host, int(port))))
+    saved = os.environ.get("REQUESTS_CA_BUNDLE")
+    os.environ["REQUESTS_CA_BUNDLE"] = ca_file
+    try:
+        # A placeholder token skips the constructor's token request against the real region
+        cloud = tinytuya.Cloud(apiRegion="eu", apiKey=FAKE_API_KEY, apiSecret=FAKE_API_SECRET,
+                               apiDeviceID=device_id, initial_token="pending")
+        cloud.fake_ca = (ca_dir, saved)
+        cloud.urlhost = address
+        cloud._gettoken()
+    except Exception:
+        _restore_ca(ca_dir, saved)
+        raise
+    return cloud
+
+
+def disconnect(cloud):
+    """Undo connect(): restore REQUESTS_CA_BUNDLE and remove the fake server's certificate."""
+    ca = getattr(cloud, "fake_ca", None)
+    if ca is not None:
+        cloud.fake_ca = None
+        _restore_ca(*ca)
+
+
+def _restore_ca(ca_dir, saved):
+    if saved is None:
+        os.environ.pop("REQUESTS_CA_BUNDLE", None)
+    else:
+        os.environ["REQUESTS_CA_BUNDLE"] = saved
+    shutil.rmtree(ca_dir, ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8443)
+    parser.add_argument("--latency-ms", type=float, default=0, help="delay before every reply")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="random extra delay, up to this much")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of status calls that fail (0-1)")
+    parser.add_argument("--rate-limit", type=float, default=0, help="requests per second, 0 for no limit")
+    parser.add_argument("--token-ttl", type=int, default=7200, help="seconds until an access token expires")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--inverters", type=int, default=500, help="fake inverters in --config-out")
+    parser.add_argument("--config-out", help="also write a config.json that uses this server")
+    args = parser.parse_args(argv)
+
+    fake = FakeTuyaCloud(args.host, args.port, args.latency_ms, args.jitter_ms, args.error_rate,
+                         args.rate_limit, args.token_ttl, args.seed)
+    if args.config_out:
+        write_config(args.config_out, inverters(args.inverters, FAKE_PREFIX), FAKE_CLOUD=fake.address)
+        print(f"Wrote {args.config_out} with {args.inverters} inverters")
+    print(f"Fake Tuya cloud on https://{fake.address} (Ctrl+C to stop)")
+    try:
+        fake.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        fake.server.server_close()
+        print("Requests:", fake.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,22 @@
-import pandas as pd
 import os
 from datetime import datetime
+from typing import TYPE_CHECKING, Dict
 from .config import CONFIG
+from .logs import get_logger
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+log = get_logger("file_ops")
+
+# pandas and openpyxl are imported where they are used, so collectors and the CLI that only
+# import this module for write_to_excel do not pay for pandas at startup
 
 def save_data(data, sheet_name):
     """Save inverter data to an Excel file, creating directories as needed."""
+    import pandas as pd
     date_str = datetime.now().strftime("%Y-%m")
-    file_path = os.path.join(CONFIG['data_path'], date_str, f"{datetime.now().strftime('%Y-%m-%d')}.xlsx")
+    file_path = os.path.join(CONFIG["SAVE_DIR"], date_str, f"{datetime.now().strftime('%Y-%m-%d')}.xlsx")
     os.makedirs(os.path.dirname(file_path), exist_ok=True)
     
     # If file exists, load existing data to append; otherwise, create new
@@ -17,23 +27,80 @@ def save_data(data, sheet_name):
                     existing_df = pd.read_excel(file_path, sheet_name=sheet_name)
                     data = pd.concat([existing_df, data], ignore_index=True)
         except Exception as e:
-            print(f"Error reading existing file: {e}")
+            log.error("Error reading existing file: %s", e)
     
     # Save data to Excel
     with pd.ExcelWriter(file_path, mode='a', if_sheet_exists='replace') as writer:
         data.to_excel(writer, sheet_name=sheet_name, index=False)
-    print(f"✅ Data saved to '{file_path}' in sheet '{sheet_name}'")
+    log.debug("Data saved to '%s' in sheet '%s'", file_path, sheet_name)
 
-def load_historical_data(sheet_name):
-    """Load historical data for a given inverter from Excel."""
-    date_str = datetime.now().strftime("%Y-%m")
-    file_path = os.path.join(CONFIG['data_path'], date_str, f"{datetime.now().strftime('%Y-%m-%d')}.xlsx")
-    
-    if os.path.exists(file_path):
+HEADERS = ["Timestamp", "Reverse Energy (kWh)", "Temp (°C)", "AC Power (W)", "AC Voltage (V)",
+           "Frequency (Hz)", "AC Current (A)", "DC Voltage (V)", "DC Current (A)", "DC Power (W)"]
+
+def write_to_excel(data: Dict, sheet_name: str, base_folder: str = None) -> None:
+    """Append one poll result to today's workbook (SAVE_DIR/YYYY-MM/YYYY-MM-DD.xlsx)."""
+    from openpyxl import Workbook, load_workbook
+    now = datetime.now()
+    folder_path = os.path.join(base_folder or CONFIG["SAVE_DIR"], now.strftime("%Y-%m"))
+    os.makedirs(folder_path, exist_ok=True)
+    filename = os.path.join(folder_path, now.strftime("%Y-%m-%d.xlsx"))
+
+    wb = load_workbook(filename) if os.path.exists(filename) else Workbook()
+    ws = wb[sheet_name] if sheet_name in wb.sheetnames else wb.create_sheet(sheet_name)
+    if ws.max_row == 0 or (ws.max_row == 1 and not ws[1][0].value):
+        ws.append(HEADERS)
+
+    ac_current = data["extracted"]["phase_a"].get("ac_current (A)")
+    ws.append([
+        now.strftime("%Y-%m-%d %H:%M:%S"),
+        data["important_dps"]["reverse_energy_total (kWh)"],
+        data["important_dps"]["temp_current (°C)"], data["important_dps"]["ac_power (W)"],
+        data["extracted"]["phase_a"]["ac_voltage"], data["extracted"]["phase_a"]["frequency"],
+        round(ac_current, 3) if isinstance(ac_current, (int, float)) else "N/A",
+        data["extracted"]["pv1_dc_data"]["dc_voltage"], data["extracted"]["pv1_dc_data"]["dc_current"],
+        data["extracted"]["pv1_dc_data"]["dc_power"]
+    ])
+    wb.save(filename)
+    log.debug("Data saved to '%s' in sheet '%s'", filename, sheet_name)
+
+def load_historical_data(sheet_name: str, base_folder: str = None) -> "pd.DataFrame":
+    """Every sample of this month for one inverter, read synchronously from the archive.
+
+    The GUI loads history in the background with history.HistoryLoader instead.
+    """
+    import pandas as pd
+    folder = os.path.join(base_folder or CONFIG["SAVE_DIR"], datetime.now().strftime("%Y-%m"))
+    if not os.path.isdir(folder):
+        return pd.DataFrame()
+    all_data = []
+    for file in sorted(os.listdir(folder)):
+        if not file.endswith(".xlsx"):
+            continue
         try:
-            with pd.ExcelFile(file_path) as xls:
+            with pd.ExcelFile(os.path.join(folder, file)) as xls:
                 if sheet_name in xls.sheet_names:
-                    return pd.read_excel(file_path, sheet_name=sheet_name)
+                    df = pd.read_excel(xls, sheet_name=sheet_name)
+                    df["Timestamp"] = pd.to_datetime(df["Timestamp"], errors='coerce')
+                    all_data.append(df)
         except Exception as e:
-            print(f"Error loading historical data: {e}")
-    return pd.DataFrame()  # Return empty DataFrame if no data exists or error occurs
\ No newline at end of file
+            log.error("Error loading historical data from %s: %s", file, e)
+    if not all_data:
+        return pd.DataFrame()
+    return pd.concat(all_data, ignore_index=True).sort_values("Timestamp", ignore_index=True)
+
+def export_historical_data(graphs, stats=None):
+    """Export each inverter's history to CSV, plus a summary read from the streaming statistics."""
+    import pandas as pd
+    now = datetime.now().strftime("%Y%m%d_%H%M%S")
+    export_dir = os.path.join(CONFIG["SAVE_DIR"], "exports")
+    os.makedirs(export_dir, exist_ok=True)
+    for tab_id, graph_data in graphs.items():
+        historical_data = graph_data["historical_data"]
+        if not historical_data.empty:
+            filename = os.path.join(export_dir, f"{tab_id}_historical_{now}.csv")
+            historical_data.to_csv(filename, index=False)
+            log.info("Exported historical data to %s", filename)
+        if stats and tab_id in stats:
+            filename = os.path.join(export_dir, f"{tab_id}_summary_{now}.csv")
+            pd.DataFrame(stats[tab_id].summary()).to_csv(filename, index=False)
+            log.info("Exported statistics summary to %s", filename)
@@ -0,0 +1,232 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+FLEET_COLUMNS = ["AC Power (W)", "DC Power (W)", "Reverse Energy (kWh)"]
+# How many grid bins a reading may be carried forward before the inverter counts as missing.
+# Energy counters are cumulative, so they are carried forward indefinitely.
+HOLD_BINS = {"AC Power (W)": 2, "DC Power (W)": 2, "Reverse Energy (kWh)": None}
+NO_BIN = np.iinfo(np.int64).min
+
+
+class FleetAggregator:
+    """Aligns every inverter onto one time grid and keeps fleet totals up to date.
+
+    Each inverter keeps only the bins it actually has readings for, as sorted
+    (bin, value) arrays per metric. The fleet totals are a running sum and count per
+    grid bin; a reading is carried forward for a few bins so that inverters sampled at
+    slightly different wall-clock times still add up. A change to one inverter only
+    recomputes that inverter's carried values over the bins it reaches and applies the
+    difference to the totals, so a new sample costs O(hold) rather than O(inverters).
+    """
+
+    def __init__(self, inverter_ids: Iterable[str], bin_seconds: int):
+        self.inverter_ids = list(inverter_ids)
+        self._columns = {inverter_id: j for j, inverter_id in enumerate(self.inverter_ids)}
+        self.bin_ns = int(max(1, bin_seconds) * 1e9)
+        self._reset()
+
+    def _reset(self) -> None:
+        n = len(self.inverter_ids)
+        self.origin = None  # Epoch ns of grid row 0
+        self.length = 0
+        self.first_bin = 0  # Absolute bin index (epoch ns // bin_ns) of grid row 0
+        self.series = {metric: [(np.empty(0, dtype=np.int64), np.empty(0)) for _ in range(n)]
+                       for metric in FLEET_COLUMNS}
+        # Each inverter's newest reading, kept alongside `series` so growing the grid stays vectorized
+        self.last_bin = {metric: np.full(n, NO_BIN, dtype=np.int64) for metric in FLEET_COLUMNS}
+        self.last_value = {metric: np.full(n, np.nan) for metric in FLEET_COLUMNS}
+        self.totals = {metric: np.empty(0) for metric in FLEET_COLUMNS}
+        self.counts = {metric: np.empty(0, dtype=np.int32) for metric in FLEET_COLUMNS}
+
+    def _to_ns(self, timestamps) -> np.ndarray:
+        return pd.to_datetime(timestamps, errors="coerce").to_numpy(dtype="datetime64[ns]").astype(np.int64)
+
+    def _cover(self, first: int, last: int) -> None:
+        """Grow the grid so absolute bins first..last fall inside it."""
+        if self.origin is None:
+            self.first_bin, self.length = first, 0
+            self.origin = first * self.bin_ns
+        if first < self.first_bin:
+            rows = self.first_bin - first
+            for metric in FLEET_COLUMNS:
+                self.totals[metric] = np.concatenate([np.zeros(rows), self.totals[metric]])
+                self.counts[metric] = np.concatenate([np.zeros(rows, dtype=np.int32), self.counts[metric]])
+            self.first_bin, self.length = first, self.length + rows
+            self.origin = first * self.bin_ns
+        end = self.first_bin + self.length
+        if last < end:
+            return
+        new_bins = np.arange(end, last + 1)
+        for metric in FLEET_COLUMNS:
+            hold = HOLD_BINS[metric]
+            last_bin, last_value = self.last_bin[metric], self.last_value[metric]
+            totals, counts = np.zeros(len(new_bins)), np.zeros(len(new_bins), dtype=np.int32)
+            carried = last_bin != NO_BIN
+            if hold is None:
+                totals[:] = last_value[carried].sum()
+                counts[:] = carried.sum()
+            elif carried.any():
+                # Only the first few new bins can still be reached by a held reading
+                reach = min(len(new_bins), int(last_bin[carried].max()) + hold + 1 - end)
+                if reach > 0:
+                    held = carried & (new_bins[:reach, None] - last_bin <= hold)
+                    totals[:reach] = np.where(held, last_value, 0.0).sum(axis=1)
+                    counts[:reach] = held.sum(axis=1)
+            self.totals[metric] = np.concatenate([self.totals[metric], totals])
+            self.counts[metric] = np.concatenate([self.counts[metric], counts])
+        self.length += len(new_bins)
+
+    @staticmethod
+    def _carried(bins: np.ndarray, values: np.ndarray, hold: Optional[int], start: int, stop: int) -> np.ndarray:
+        """One inverter's value in absolute bins start..stop-1 after carrying readings forward."""
+        grid = np.arange(start, stop)
+        out = np.full(len(grid), np.nan)
+        if not len(bins):
+            return out
+        idx = np.searchsorted(bins, grid, side="right") - 1
+        held = idx >= 0
+        if hold is not None:
+            held &= grid - bins[np.maximum(idx, 0)] <= hold
+        out[held] = values[idx[held]]
+        return out
+
+    def _merge(self, metric: str, j: int, new_bins: np.ndarray, new_values: np.ndarray, replace: bool) -> None:
+        """Merge sorted, unique readings into inverter j's series and patch the totals they reach.
+
+        With `replace` the new readings win over existing ones in the same bin (live samples);
+        otherwise existing readings are kept (history arriving after live data).
+        """
+        bins, values = self.series[metric][j]
+        hold = HOLD_BINS[metric]
+        if not replace:
+            fresh = ~np.isin(new_bins, bins)
+            new_bins, new_values = new_bins[fresh], new_values[fresh]
+            if not len(new_bins):
+                return
+        start = int(new_bins[0])
+        # Bins after the next existing reading are carried from that reading and do not change
+        stop = self.first_bin + self.length
+        following = np.searchsorted(bins, new_bins[-1], side="right")
+        if following < len(bins):
+            stop = min(stop, int(bins[following]))
+        if hold is not None:
+            stop = min(stop, int(new_bins[-1]) + hold + 1)
+        before = self._carried(bins, values, hold, start, stop)
+
+        if len(bins) and new_bins[0] == bins[-1] and len(new_bins) == 1:
+            values = values.copy()
+            values[-1] = new_values[0]
+        elif not len(bins) or new_bins[0] > bins[-1]:
+            # Live samples and newer history only ever append
+            bins, values = np.concatenate([bins, new_bins]), np.concatenate([values, new_values])
+        else:
+            kept = ~np.isin(bins, new_bins)
+            bins = np.concatenate([bins[kept], new_bins])
+            values = np.concatenate([values[kept], new_values])
+            order = np.argsort(bins, kind="stable")
+            bins, values = bins[order], values[order]
+        self.series[metric][j] = (bins, values)
+        self.last_bin[metric][j], self.last_value[metric][j] = bins[-1], values[-1]
+
+        after = self._carried(bins, values, hold, start, stop)
+        rows = slice(start - self.first_bin, stop - self.first_bin)
+        had, has = ~np.isnan(before), ~np.isnan(after)
+        self.totals[metric][rows] += np.where(has, after, 0.0) - np.where(had, before, 0.0)
+        self.counts[metric][rows] += has
+        self.counts[metric][rows] -= had
+        # Drop rounding residue where no inverter is left so it cannot leak into later sums
+        self.totals[metric][rows][self.counts[metric][rows] == 0] = 0.0
+
+    def _block(self, df: pd.DataFrame) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        if df is None or df.empty or "Timestamp" not in df:
+            return None
+        ts = self._to_ns(df["Timestamp"])
+        keep = ts != np.iinfo(np.int64).min
+        if not keep.any():
+            return None
+        return keep, ts[keep] // self.bin_ns
+
+    def load(self, histories: Dict[str, pd.DataFrame]) -> None:
+        """Rebuild the grid from full histories (used at startup)."""
+        self._reset()
+        for inverter_id, df in histories.items():
+            self.add_frame(inverter_id, df)
+
+    def add_sample(self, inverter_id: str, timestamp, row: Dict) -> None:
+        """Fold one live sample into the grid and refresh the affected totals."""
+        j = self._columns.get(inverter_id)
+        if j is None:
+            return
+        k = int(pd.Timestamp(timestamp).value) // self.bin_ns
+        self._cover(k, k)
+        for metric in FLEET_COLUMNS:
+            value = pd.to_numeric(row.get(metric), errors="coerce")
+            if value is None or np.isnan(value):
+                continue
+            self._merge(metric, j, np.array([k], dtype=np.int64), np.array([float(value)]), replace=True)
+
+    def add_frame(self, inverter_id: str, df: pd.DataFrame) -> None:
+        """Fold a block of one inverter's history into the grid; blocks may arrive in any order.
+
+        Readings already in the grid for the same bin (live samples) are kept. Only the bins
+        the block can reach are recomputed: from its first bin up to the next existing
+        reading or the end of the hold window after its last one, whichever comes first.
+        """
+        j = self._columns.get(inverter_id)
+        block = None if j is None else self._block(df)
+        if block is None:
+            return
+        keep, bins = block
+        self._cover(int(bins.min()), int(bins.max()))
+        order = np.argsort(bins, kind="stable")
+        for metric in FLEET_COLUMNS:
+            if metric not in df:
+                continue
+            readings = pd.to_numeric(df[metric], errors="coerce").to_numpy(dtype=float)[keep][order]
+            present = ~np.isnan(readings)
+            if not present.any():
+                continue
+            block_bins, block_values = bins[order][present], readings[present]
+            # Later readings in the same bin overwrite earlier ones
+            last = np.append(block_bins[1:] != block_bins[:-1], True)
+            self._merge(metric, j, block_bins[last], block_values[last], replace=False)
+
+    def grid_times(self) -> np.ndarray:
+        if self.origin is None:
+            return np.array([], dtype="datetime64[ns]")
+        return (self.origin + np.arange(self.length, dtype=np.int64) * self.bin_ns).astype("datetime64[ns]")
+
+    def _total(self, metric: str) -> np.ndarray:
+        return np.where(self.counts[metric] > 0, self.totals[metric], np.nan)
+
+    def totals_frame(self) -> pd.DataFrame:
+        """Fleet totals on the common grid, one column per metric."""
+        frame = pd.DataFrame({metric: self._total(metric) for metric in FLEET_COLUMNS})
+        frame.insert(0, "Timestamp", self.grid_times())
+        return frame
+
+    def latest(self) -> Dict[str, Optional[float]]:
+        """Fleet totals in the most recent grid bin."""
+        if not self.length:
+            return {metric: None for metric in FLEET_COLUMNS}
+        return {metric: (float(self.totals[metric][-1]) if self.counts[metric][-1] else None)
+                for metric in FLEET_COLUMNS}
+
+    def shares(self, metric: str = "AC Power (W)") -> List[Dict]:
+        """Each inverter's reading and share of the fleet total in the most recent grid bin."""
+        if not self.length:
+            return []
+        last = self.first_bin + self.length - 1
+        last_bin, hold = self.last_bin[metric], HOLD_BINS[metric]
+        held = last_bin != NO_BIN
+        if hold is not None:
+            held &= last - last_bin <= hold
+        readings = np.where(held, self.last_value[metric], np.nan)
+        total = float(self.totals[metric][-1]) if self.counts[metric][-1] else np.nan
+        rows = []
+        for inverter_id, value in zip(self.inverter_ids, readings):
+            share = float(value / total) if not np.isnan(value) and total and not np.isnan(total) else None
+            rows.append({"inverter": inverter_id, "value": None if np.isnan(value) else float(value), "share": share})
+        return rows
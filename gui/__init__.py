@@ -1,3 +1,10 @@
-from .core import InverterMonitoringGUI
+# The GUI classes pull in tkinter, matplotlib and pandas, so they are only imported on first
+# access; importing a light helper such as gui.bridge does not load the whole dashboard.
+__all__ = ['InverterMonitoringGUI']
 
-__all__ = ['InverterMonitoringGUI']
\ No newline at end of file
+
+def __getattr__(name):
+    if name == 'InverterMonitoringGUI':
+        from .core import InverterMonitoringGUI
+        return InverterMonitoringGUI
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
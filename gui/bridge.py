@@ -0,0 +1,129 @@
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Any, NamedTuple, Optional
+
+from inverter_monitoring.logs import get_logger
+
+log = get_logger("bridge")
+
+
+class SampleEvent(NamedTuple):
+    """One poll result; data is None when the fetch failed."""
+    tab_id: str
+    sheet: str
+    data: Optional[dict]
+    timestamp: datetime
+
+
+class CallEvent(NamedTuple):
+    """Run an arbitrary callable on the Tk thread (for one-off results from workers)."""
+    func: Any
+    args: tuple
+
+
+class Waker:
+    """Runs `func` once on the Tk thread however many times wake() is called, from any thread.
+
+    Only the first wake() after `func` last ran calls into Tk, so a burst of work costs one
+    after(). tkinter hands calls from other threads to the main loop (threaded Tcl, as in
+    the python.org and distribution builds). The owner wakes once from the Tk thread when
+    it is created, so work posted before mainloop() starts is picked up when it does.
+    """
+
+    def __init__(self, root, func):
+        self.root = root
+        self.func = func
+        self._lock = threading.Lock()
+        self._pending = False
+        self._closed = False
+        self._after = None
+
+    def wake(self, delay_ms=0):
+        with self._lock:
+            if self._pending or self._closed:
+                return
+            self._pending = True
+        try:
+            self._after = self.root.after(delay_ms, self._run)
+        except Exception:  # RuntimeError or TclError: the main loop is not running
+            # Not logged: the log panel wakes through here too
+            with self._lock:
+                self._pending = False  # Let a later wake try again
+
+    def _run(self):
+        self._after = None
+        with self._lock:
+            self._pending = False
+        self.func()
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+        if self._after is not None:
+            self.root.after_cancel(self._after)
+            self._after = None
+
+
+class TkBridge:
+    """Hands typed events from worker threads to the Tk main loop.
+
+    Workers only ever call post(), which wakes a drain on the Tk thread (nothing runs while
+    the queue is empty). The drain dispatches each event to the handler registered for its
+    type, stopping after budget_ms so a burst of events cannot stall the UI; whatever is
+    left is picked up on the next, immediate, drain. Backlog and drain timings are kept for
+    diagnostics.
+    """
+
+    def __init__(self, root, budget_ms=20):
+        self.root = root
+        self.budget = budget_ms / 1000
+        self.queue = queue.SimpleQueue()
+        self.handlers = {CallEvent: lambda event: event.func(*event.args)}
+        self.handled = 0
+        self.max_backlog = 0
+        self.last_drain_ms = 0.0
+        self.max_drain_ms = 0.0
+        self.waker = Waker(root, self._drain)
+        self.waker.wake()
+
+    def register(self, event_type, handler):
+        self.handlers[event_type] = handler
+
+    def post(self, event):
+        """Queue an event; safe to call from any thread."""
+        self.queue.put(event)
+        self.waker.wake()
+
+    def call(self, func, *args):
+        self.post(CallEvent(func, args))
+
+    def backlog(self):
+        return self.queue.qsize()
+
+    def metrics(self):
+        return {"backlog": self.backlog(), "max_backlog": self.max_backlog, "handled": self.handled,
+                "last_drain_ms": self.last_drain_ms, "max_drain_ms": self.max_drain_ms}
+
+    def _drain(self):
+        start = time.perf_counter()
+        self.max_backlog = max(self.max_backlog, self.queue.qsize())
+        while time.perf_counter() - start < self.budget:
+            try:
+                event = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            handler = self.handlers.get(type(event))
+            try:
+                if handler is None:
+                    log.warning("No handler for %s", type(event).__name__)
+                else:
+                    handler(event)
+            except Exception as e:
+                log.exception("Error handling %s: %s", type(event).__name__, e)
+            self.handled += 1
+        self.last_drain_ms = (time.perf_counter() - start) * 1000
+        self.max_drain_ms = max(self.max_drain_ms, self.last_drain_ms)
+        if not self.queue.empty():
+            self.waker.wake(1)  # Out of budget with events left: yield to Tk, then carry on
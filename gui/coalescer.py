@@ -0,0 +1,35 @@
+class UICoalescer:
+    """Collects poll results and applies them one fetch cycle at a time.
+
+    Results arrive through add() (from the TkBridge, on the Tk thread) and are handed to
+    `apply` as one batch when flush() is called at the end of a cycle, so a cycle costs one
+    UI update however many inverters it polled. A cycle that runs longer than max_wait_ms
+    (a slow cloud, a large fleet) is shown in parts: a timer flushes whatever has waited
+    that long, so results are never more than max_wait_ms behind.
+    """
+
+    def __init__(self, root, apply, max_wait_ms=10000):
+        self.root = root
+        self.apply = apply
+        self.max_wait_ms = max_wait_ms
+        self._batch = []
+        self._timer = None
+
+    def add(self, result):
+        """Queue one poll result; Tk thread only."""
+        self._batch.append(result)
+        if self._timer is None:
+            self._timer = self.root.after(self.max_wait_ms, self._expire)
+
+    def _expire(self):
+        self._timer = None
+        self.flush()
+
+    def flush(self):
+        """Apply everything queued so far; called when a fetch cycle finishes."""
+        if self._timer is not None:
+            self.root.after_cancel(self._timer)
+            self._timer = None
+        batch, self._batch = self._batch, []
+        if batch:
+            self.apply(batch)
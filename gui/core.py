@@ -3,12 +3,16 @@ from tkinter import ttk, messagebox
 from functools import partial
 
 import pandas as pd
-from .tabs import InverterTab
+from .tabs import InverterTab, enable_zoom, on_press, on_release
+from .figure_pool import FigurePool
 from inverter_monitoring.file_ops import save_data, load_historical_data
 from inverter_monitoring.config import CONFIG
+from inverter_monitoring import logs
 import time
 from datetime import datetime
 
+log = logs.get_logger("gui.core")
+
 class InverterMonitoringGUI:
     def __init__(self, root, inverters):
         self.root = root
@@ -17,6 +21,7 @@ class InverterMonitoringGUI:
         self.graphs = {}
         self.values = {inverter: {} for inverter in inverters}
         self.status_lights = {}
+        self.figure_pool = FigurePool()
         
         # Create notebook for tabs
         self.notebook = ttk.Notebook(root)
@@ -39,6 +44,8 @@ class InverterMonitoringGUI:
             self.notebook.add(tab, text=inverter)
             self.tabs[inverter] = tab
             InverterTab.setup_tab(self, tab, device_id, sheet_name, inverter)
+            if not device_id:
+                self.notebook.tab(tab, state="disabled")
 
     def create_menu(self):
         menubar = tk.Menu(self.root)
@@ -64,7 +71,7 @@ class InverterMonitoringGUI:
                     save_data(current_data, sheet_name)
                     self.update_graphs(inverter)
             except Exception as e:
-                print(f"❌ Failed to get status for device {inverter}: {e}")
+                log.warning("Failed to get status for device %s: %s", inverter, e, extra={"inverter": inverter})
         self.root.after(5000, self.update_data)  # Update every 5 seconds
 
     def collect_real_data(self, inverter, sheet_name):
@@ -103,7 +110,8 @@ class InverterMonitoringGUI:
         update_all_graphs(self, inverter)
 
     def handle_range_selection(self, tab_id, value):
-        print(f"Handling range selection: tab_id={tab_id}, value={value}")  # Debug print
+        if logs.DEBUG:
+            log.debug("Handling range selection: tab_id=%s, value=%s", tab_id, value)
         if value == "Specific Hour":
             self.prompt_specific_hour(tab_id)
         elif value == "Zoom":
@@ -138,32 +146,11 @@ class InverterMonitoringGUI:
 
     def enable_zoom(self, tab_id):
         # Handle tab_id=None (called from menu) by applying zoom to all tabs
-        if tab_id is None:
-            for inverter in self.inverters:
-                graph_data = self.graphs[inverter]
-                for fig_key in ["power_fig", "voltage_fig", "current_fig", "energy_fig"]:
-                    fig = graph_data[fig_key]
-                    fig.canvas.mpl_connect('button_press_event', lambda event: self.on_press(event, inverter, fig_key))
-                    fig.canvas.mpl_connect('button_release_event', lambda event: self.on_release(event, inverter, fig_key))
-                self.update_graphs(inverter)
-        else:
-            graph_data = self.graphs[tab_id]
-            for fig_key in ["power_fig", "voltage_fig", "current_fig", "energy_fig"]:
-                fig = graph_data[fig_key]
-                fig.canvas.mpl_connect('button_press_event', lambda event: self.on_press(event, tab_id, fig_key))
-                fig.canvas.mpl_connect('button_release_event', lambda event: self.on_release(event, tab_id, fig_key))
-            self.update_graphs(tab_id)
+        for inverter in (self.inverters if tab_id is None else [tab_id]):
+            enable_zoom(self, inverter)
 
-    def on_press(self, event, tab_id, fig_key):
-        self.graphs[tab_id][f"{fig_key}_zoom_start"] = (event.xdata, event.ydata) if event.xdata and event.ydata else None
+    def on_press(self, event, tab_id):
+        on_press(self, event, tab_id)
 
-    def on_release(self, event, tab_id, fig_key):
-        if hasattr(self.graphs[tab_id], f"{fig_key}_zoom_start") and self.graphs[tab_id][f"{fig_key}_zoom_start"]:
-            zoom_start = self.graphs[tab_id][f"{fig_key}_zoom_start"]
-            zoom_end = (event.xdata, event.ydata) if event.xdata and event.ydata else None
-            if zoom_end:
-                ax = self.graphs[tab_id][f"{fig_key.replace('_fig', '_ax')}"]
-                ax.set_xlim(min(zoom_start[0], zoom_end[0]), max(zoom_start[0], zoom_end[0]))
-                ax.set_ylim(min(zoom_start[1], zoom_end[1]), max(zoom_start[1], zoom_end[1]))
-                self.graphs[tab_id][f"{fig_key}_canvas"].draw()
-            del self.graphs[tab_id][f"{fig_key}_zoom_start"]
\ No newline at end of file
+    def on_release(self, event, tab_id):
+        on_release(self, event, tab_id)
\ No newline at end of file
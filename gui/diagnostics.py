@@ -0,0 +1,113 @@
+import os
+import tkinter as tk
+from tkinter import ttk
+
+from inverter_monitoring import metrics
+
+COLUMNS = ("count", "p50", "p95", "p99", "max")
+
+
+class DiagnosticsWindow(tk.Toplevel):
+    """Pipeline stage timings, counters and queue depths, refreshed while the window is open.
+
+    Timings come from metrics.snapshot(), for the whole fleet or one inverter. `extra` maps
+    a section title to a callable returning a flat dict (the TkBridge's metrics(), say),
+    shown below the counters. With a profiling.Profiler, profiling can be started and
+    stopped and memory snapshots written from here.
+    """
+
+    def __init__(self, parent, extra=None, refresh_ms=1000, profiler=None):
+        super().__init__(parent)
+        self.title("Diagnostics")
+        self.extra = extra or {}
+        self.profiler = profiler
+        self.refresh_ms = refresh_ms
+        self.refresh_after = None
+        self.inverter_var = tk.StringVar(value="All")
+
+        top = ttk.Frame(self, padding=5)
+        top.grid(row=0, column=0, sticky="ew")
+        ttk.Label(top, text="Inverter:").grid(row=0, column=0, padx=5)
+        self.inverter_box = ttk.Combobox(top, textvariable=self.inverter_var, values=["All"], state="readonly", width=20)
+        self.inverter_box.grid(row=0, column=1)
+        self.inverter_box.bind("<<ComboboxSelected>>", lambda event: self.refresh(reschedule=False))
+        ttk.Button(top, text="Reset", command=self.reset).grid(row=0, column=2, padx=5)
+        if not metrics.ENABLED:
+            ttk.Label(top, text="Instrumentation is off (METRICS)").grid(row=0, column=3, padx=5)
+
+        self.tree = ttk.Treeview(self, columns=COLUMNS, height=len(metrics.STAGES) + 1)
+        self.tree.heading("#0", text="Stage")
+        self.tree.column("#0", width=100)
+        for column in COLUMNS:
+            self.tree.heading(column, text=column if column == "count" else f"{column} (ms)")
+            self.tree.column(column, width=80, anchor="e")
+        self.tree.grid(row=1, column=0, sticky="nsew", padx=5)
+
+        self.details = tk.Text(self, height=12, width=60, font=("Courier", 9), state="disabled")
+        self.details.grid(row=2, column=0, sticky="nsew", padx=5, pady=5)
+        if profiler is not None:
+            controls = ttk.Frame(self, padding=5)
+            controls.grid(row=3, column=0, sticky="ew")
+            self.profile_button = ttk.Button(controls, command=self.toggle_profiling)
+            self.profile_button.grid(row=0, column=0, padx=5)
+            ttk.Button(controls, text="Memory snapshot", command=self.memory_snapshot).grid(row=0, column=1, padx=5)
+            self.profile_label = ttk.Label(controls, text=f"Reports: {profiler.out_dir}")
+            self.profile_label.grid(row=0, column=2, padx=5, sticky="w")
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(2, weight=1)
+        self.refresh()
+
+    def toggle_profiling(self):
+        self.show_written(self.profiler.toggle())
+
+    def memory_snapshot(self):
+        paths = self.profiler.snapshot()
+        if not paths:
+            self.profile_label.config(text="Memory tracing started; take another snapshot to see what grew")
+        self.show_written(paths)
+
+    def show_written(self, paths):
+        if paths:
+            self.profile_label.config(text="Wrote " + ", ".join(os.path.basename(path) for path in paths))
+
+    def reset(self):
+        metrics.REGISTRY.reset()
+        self.refresh(reschedule=False)
+
+    def destroy(self):
+        if self.refresh_after is not None:
+            self.after_cancel(self.refresh_after)
+            self.refresh_after = None
+        super().destroy()
+
+    def refresh(self, reschedule=True):
+        if reschedule:
+            self.refresh_after = None  # This is the timer firing (or the first refresh)
+        if not self.winfo_exists():
+            return
+        selected = self.inverter_var.get()
+        snapshot = metrics.snapshot(None if selected == "All" else selected)
+        inverters = snapshot["inverters"]
+        if list(self.inverter_box["values"]) != ["All"] + inverters:
+            self.inverter_box["values"] = ["All"] + inverters
+        stages = snapshot["stages"]
+
+        self.tree.delete(*self.tree.get_children())
+        for stage, summary in stages.items():
+            self.tree.insert("", "end", text=stage, values=[summary["count"]] + [
+                f"{summary[column]:.1f}" for column in COLUMNS[1:]])
+
+        lines = ["Counters"] + [f"  {name:<28}{value}" for name, value in sorted(snapshot["counters"].items())]
+        lines += ["Queues"] + [f"  {name:<28}{value}" for name, value in sorted(snapshot["gauges"].items())]
+        for title, source in self.extra.items():
+            lines.append(title)
+            for name, value in source().items():
+                lines.append(f"  {name:<28}{value:.1f}" if isinstance(value, float) else f"  {name:<28}{value}")
+        self.details.config(state="normal")
+        self.details.delete("1.0", "end")
+        self.details.insert("1.0", "\n".join(lines))
+        self.details.config(state="disabled")
+        if self.profiler is not None:
+            self.profile_button.config(text="Stop profiling" if self.profiler.running else "Start profiling")
+        if reschedule:
+            self.refresh_after = self.after(self.refresh_ms, self.refresh)
@@ -0,0 +1,37 @@
+from matplotlib.figure import Figure
+from inverter_monitoring.render_worker import SUBPLOT_LAYOUT
+
+
+class FigurePool:
+    """Recycles the trend figures of inverter tabs.
+
+    Every tab draws its four trends into one Figure with a 2x2 grid of axes sharing the
+    time axis. A tab that is torn down hands its figure back with release(), and the next
+    acquire() reuses it instead of allocating a new Figure and four axes. Tk widgets cannot
+    be moved to another parent, so the FigureCanvasTkAgg widget itself is always recreated.
+    """
+
+    def __init__(self, rows=2, cols=2, figsize=(8, 6), max_idle=4):
+        self.rows = rows
+        self.cols = cols
+        self.figsize = figsize
+        self.max_idle = max_idle
+        self.idle = []
+        self.created = 0
+
+    def acquire(self):
+        """(figure, axes) with axes in row order, cleared and ready for build_graph."""
+        if self.idle:
+            fig, axes = self.idle.pop()
+            for ax in axes:
+                ax.cla()
+            return fig, axes
+        fig = Figure(figsize=self.figsize, facecolor='white', dpi=100)
+        axes = list(fig.subplots(self.rows, self.cols, sharex=True).flat)
+        fig.subplots_adjust(**SUBPLOT_LAYOUT)
+        self.created += 1
+        return fig, axes
+
+    def release(self, fig, axes):
+        if len(self.idle) < self.max_idle:
+            self.idle.append((fig, axes))
@@ -0,0 +1,119 @@
+import heapq
+import time
+import tkinter as tk
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import count
+
+from inverter_monitoring import metrics
+
+
+class FrameMonitor:
+    """How responsive the Tk UI is: event-loop lag, frame times and the slowest frames.
+
+    A root.after heartbeat every interval_ms measures how late Tk runs it; that delay is
+    the time the loop spent busy elsewhere. It only runs while metrics are on or the
+    overlay is shown, so an idle window with both off has no timer ticking. Canvas draws, blits and resizes are timed
+    through instrument() and timed(), each with its cause (tab, graph, point count), and
+    the `slowest` worst frames are kept. Times go to the metrics registry as the "lag",
+    "draw", "blit" and "resize" stages, so the Diagnostics window and /metrics show them
+    too. The optional overlay shows the latest frame time and loop lag on the window.
+    """
+
+    def __init__(self, root, interval_ms=100, slowest=20):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.slowest = slowest
+        self.worst = []  # min-heap of (ms, seq, cause) holding the slowest frames
+        self.seq = count()
+        self.last_frame_ms = 0.0
+        self.last_lag_ms = 0.0
+        self.overlay = None
+        self._overlay_after = None
+        self._heartbeat_after = None
+        self.start_heartbeat()
+
+    def start_heartbeat(self):
+        """Start measuring loop lag if metrics or the overlay need it and it is not running yet."""
+        if self._heartbeat_after is None and (metrics.ENABLED or self.overlay is not None):
+            self._expected = time.perf_counter() + self.interval_ms / 1000
+            self._heartbeat_after = self.root.after(self.interval_ms, self._heartbeat)
+
+    def _heartbeat(self):
+        self._heartbeat_after = None
+        now = time.perf_counter()
+        self.last_lag_ms = max(0.0, (now - self._expected) * 1000)
+        metrics.observe("lag", self.last_lag_ms)
+        self.start_heartbeat()
+
+    def record(self, kind, ms, **cause):
+        self.last_frame_ms = ms
+        metrics.observe(kind, ms, cause.get("tab"))
+        entry = (ms, next(self.seq), dict(cause, kind=kind, at=datetime.now().strftime("%H:%M:%S")))
+        if len(self.worst) < self.slowest:
+            heapq.heappush(self.worst, entry)
+        elif ms > self.worst[0][0]:
+            heapq.heapreplace(self.worst, entry)
+
+    @contextmanager
+    def timed(self, kind, **cause):
+        start = time.perf_counter()
+        try:
+            yield cause  # The block may add to the cause, a point count found on the way, say
+        finally:
+            self.record(kind, (time.perf_counter() - start) * 1000, **cause)
+
+    def instrument(self, canvas, tab):
+        """Time every full draw of a FigureCanvasTkAgg, including the ones draw_idle() queues."""
+        draw = canvas.draw
+
+        def timed_draw(*args, **kwargs):
+            with self.timed("draw", tab=tab, points=figure_points(canvas.figure)):
+                return draw(*args, **kwargs)
+        canvas.draw = timed_draw
+
+    def slowest_frames(self):
+        """[(ms, cause)] worst first."""
+        return [(ms, cause) for ms, _, cause in sorted(self.worst, reverse=True)]
+
+    def summary(self):
+        """A flat dict for the Diagnostics window: lag percentiles, then the slowest frames."""
+        stages = metrics.snapshot()["stages"]
+        lag = stages.get("lag", {})
+        result = {"loop lag p50 (ms)": lag.get("p50", 0.0), "loop lag p95 (ms)": lag.get("p95", 0.0),
+                  "loop lag max (ms)": lag.get("max", 0.0), "last frame (ms)": self.last_frame_ms}
+        for i, (ms, cause) in enumerate(self.slowest_frames(), 1):
+            result[f"#{i} {ms:.1f} ms"] = describe(cause)
+        return result
+
+    def toggle_overlay(self, event=None):
+        if self.overlay is not None:
+            if self._overlay_after is not None:
+                self.root.after_cancel(self._overlay_after)
+                self._overlay_after = None
+            self.overlay.destroy()
+            self.overlay = None
+            return
+        self.overlay = tk.Label(self.root, font=("Courier", 9), bg="black", fg="lime")
+        self.overlay.place(relx=1.0, x=-5, y=5, anchor="ne")
+        self.start_heartbeat()
+        if self._overlay_after is None:
+            self._update_overlay()
+
+    def _update_overlay(self):
+        self._overlay_after = None
+        if self.overlay is None:
+            return
+        self.overlay.config(text=f"frame {self.last_frame_ms:6.1f} ms  lag {self.last_lag_ms:6.1f} ms")
+        self.overlay.lift()
+        self._overlay_after = self.root.after(250, self._update_overlay)
+
+
+def figure_points(fig):
+    return sum(len(line.get_xdata()) for ax in fig.axes for line in ax.lines)
+
+
+def describe(cause):
+    parts = [cause["at"], cause["kind"]]
+    parts += [f"{key}={value}" for key, value in cause.items() if key not in ("at", "kind")]
+    return " ".join(str(part) for part in parts)
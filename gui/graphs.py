@@ -1,260 +1,267 @@
-import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.ticker import MaxNLocator
+import matplotlib.dates as mdates
 import pandas as pd
 from datetime import datetime, timedelta
 import tkinter as tk
+from contextlib import nullcontext
+from inverter_monitoring.config import CONFIG
+from inverter_monitoring.decimate import decimate
+from inverter_monitoring.render_worker import set_date_axis
 
-def update_power_graph(self, tab_id, option):
+BLIT_HEADROOM = 0.1  # Fraction of the x span kept free to the right in live blit mode
+
+# Per graph: title, y padding for the "Both" view, and the series shown for each selector option
+GRAPH_SPECS = {
+    "power": {"title": "Power Trends", "pad": 10, "series": {
+        "AC": [("AC Power (W)", 'b-', "AC Power (W)")],
+        "DC": [("DC Power (W)", 'g-', "DC Power (W)")],
+        "Both": [("AC Power (W)", 'b-', "AC Power (W)"), ("DC Power (W)", 'g-', "DC Power (W)")]}},
+    "voltage": {"title": "Voltage Trends", "pad": 5, "series": {
+        "AC": [("AC Voltage (V)", 'b-', "AC Voltage (V)")],
+        "DC": [("DC Voltage (V)", 'g-', "DC Voltage (V)")],
+        "Both": [("AC Voltage (V)", 'b-', "AC Voltage (V)"), ("DC Voltage (V)", 'g-', "DC Voltage (V)")]}},
+    "current": {"title": "Current Trends", "pad": 0.5, "series": {
+        "AC": [("AC Current (A)", 'b-', "AC Current (A)")],
+        "DC": [("DC Current (A)", 'g-', "DC Current (A)")],
+        "Both": [("AC Current (A)", 'b-', "AC Current (A)"), ("DC Current (A)", 'g-', "DC Current (A)")]}},
+    "energy": {"title": "Energy Trends", "pad": 0, "series": {
+        "Energy": [("Reverse Energy (kWh)", 'm-', "Energy (kWh)")]}},
+}
+
+def both_ylim(self, tab_id, historical_data, columns, range_var):
+    """(min, max) for the "Both" view; the full range comes from the streaming accumulators in self.stats."""
+    stats = getattr(self, "stats", {}).get(tab_id)
+    if range_var == "All" and stats is not None:
+        return stats.limits(columns)
+    window = historical_data[columns].apply(pd.to_numeric, errors='coerce')
+    low, high = window.min().min(), window.max().max()
+    return None if pd.isna(low) or pd.isna(high) else (low, high)
+
+def filter_range(historical_data, range_var):
+    if range_var == "Last Hour":
+        return historical_data[historical_data["Timestamp"] > datetime.now() - timedelta(hours=1)]
+    if range_var == "Last Day":
+        return historical_data[historical_data["Timestamp"] > datetime.now() - timedelta(days=1)]
+    if range_var == "Last 7 Days":
+        return historical_data[historical_data["Timestamp"] > datetime.now() - timedelta(days=7)]
+    if range_var == "Last 30 Days":
+        return historical_data[historical_data["Timestamp"] > datetime.now() - timedelta(days=30)]
+    if range_var.startswith("Custom-"):
+        try:
+            # "Custom-<start iso>-<end iso>"; each ISO date contributes two dashes of its own
+            parts = range_var[len("Custom-"):].split("-")
+            start = datetime.fromisoformat("-".join(parts[:3]))
+            end = datetime.fromisoformat("-".join(parts[3:]))
+            return historical_data[(historical_data["Timestamp"] >= start) & (historical_data["Timestamp"] <= end)]
+        except (ValueError, IndexError):
+            return historical_data  # Fall back to all data if parsing fails
+    return historical_data  # "All"
+
+def has_timestamps(frame):
+    return not frame.empty and pd.api.types.is_datetime64_any_dtype(frame["Timestamp"])
+
+def plot_frame(graph_data):
+    """(rows to plot, range name for the y-limits) for a tab.
+
+    A zoomed view (tabs.set_view) shows the rows fetched from the archive for it, topped up
+    with live samples that arrived after the fetch. Otherwise the in-memory history is
+    filtered by range_var.
+    """
+    historical_data = graph_data["historical_data"]
+    view = graph_data.get("view")
+    if view is None:
+        range_var = graph_data["range_var"].get()
+        if not has_timestamps(historical_data):
+            return historical_data, range_var
+        return filter_range(historical_data, range_var), range_var
+    start, end = view
+    fetched = graph_data.get("view_data")
+    live = historical_data if has_timestamps(historical_data) else historical_data.iloc[0:0]
+    parts = []
+    if fetched is not None and not fetched.empty:
+        parts.append(fetched[(fetched["Timestamp"] >= start) & (fetched["Timestamp"] <= end)])
+        live = live[live["Timestamp"] > fetched["Timestamp"].max()]
+    if not live.empty:
+        parts.append(live[(live["Timestamp"] >= start) & (live["Timestamp"] <= end)])
+    if not parts:
+        return live, "View"
+    return pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0], "View"
+
+def build_graph(self, tab_id, kind, option):
+    """Create the static parts of a graph and one persistent line per series.
+
+    Only needed on first use and when the AC/DC/Both selection changes; new samples
+    go through refresh_graph, which just swaps line data.
+    """
     graph_data = self.graphs[tab_id]
-    historical_data = graph_data["historical_data"].copy()
-    # Clear the figure completely and re-add the single subplot with explicit checks and debugging
-    print(f"Updating power graph for tab {tab_id}, initial axes: {len(graph_data['power_fig'].axes)}")  # Debug: check initial axes
-    if hasattr(graph_data["power_fig"], 'axes'):
-        for ax in graph_data["power_fig"].axes:
-            ax.remove()  # Remove all existing axes
-    graph_data["power_fig"].clear()
-    graph_data["power_ax"] = graph_data["power_fig"].add_subplot(111)
-    print(f"Power graph updated for tab {tab_id}, axes after update: {len(graph_data['power_fig'].axes)}")  # Debug: check axes after update
-    graph_data["power_fig"].set_facecolor('white')  # Ensure clean background
-    
-    range_var = graph_data["range_var"].get()
-    if not historical_data.empty and pd.api.types.is_datetime64_any_dtype(historical_data["Timestamp"]):
-        historical_data["Timestamp"] = pd.to_datetime(historical_data["Timestamp"], errors='coerce')
-        
-        # Handle range filtering
-        if range_var == "Last Hour":
-            historical_data = historical_data[historical_data["Timestamp"] > datetime.now() - timedelta(hours=1)]
-        elif range_var == "Last Day":
-            historical_data = historical_data[historical_data["Timestamp"] > datetime.now() - timedelta(days=1)]
-        elif range_var == "Last 7 Days":
-            historical_data = historical_data[historical_data["Timestamp"] > datetime.now() - timedelta(days=7)]
-        elif range_var.startswith("Custom-"):
-            try:
-                start_str, end_str = range_var.split("-")[1], range_var.split("-")[2]
-                start = datetime.fromisoformat(start_str)
-                end = datetime.fromisoformat(end_str)
-                historical_data = historical_data[
-                    (historical_data["Timestamp"] >= start) & (historical_data["Timestamp"] <= end)
-                ]
-            except (ValueError, IndexError):
-                historical_data = historical_data  # Fall back to all data if parsing fails
-        elif range_var == "All":
-            pass  # No filtering for "All"
+    spec = GRAPH_SPECS[kind]
+    ax = graph_data[f"{kind}_ax"]
+    ax.cla()
+    blit = CONFIG.get("LIVE_BLIT", True)
+    lines = {}
+    for column, style, label in spec["series"][option]:
+        # Animated lines are left out of normal draws so they can be blitted over a cached background
+        lines[column] = ax.plot([], [], style, label=label, animated=blit)[0]
+    ax.set_title(spec["title"])
+    ax.legend(loc="upper left")
+    ax.grid(True)
+    set_date_axis(ax)
+    graph_data[f"{kind}_lines"] = lines
+    graph_data[f"{kind}_option"] = option
+    graph_data[f"{kind}_background"] = None
+    if blit and f"{kind}_draw_cid" not in graph_data:
+        graph_data[f"{kind}_draw_cid"] = graph_data["canvas"].mpl_connect(
+            'draw_event', lambda event: capture_background(graph_data, kind))
 
-        time_only = historical_data["Timestamp"].dt.strftime("%H:%M:%S").fillna("N/A")
-        
-        # Plot only the selected option with dynamic y-limits to prevent overlap
-        if option == "AC" and not historical_data["AC Power (W)"].isna().all():
-            graph_data["power_ax"].plot(time_only, historical_data["AC Power (W)"], 'b-', label="AC Power (W)")
-        elif option == "DC" and not historical_data["DC Power (W)"].isna().all():
-            graph_data["power_ax"].plot(time_only, historical_data["DC Power (W)"], 'g-', label="DC Power (W)")
-        elif option == "Both":
-            if not historical_data["AC Power (W)"].isna().all() and not historical_data["DC Power (W)"].isna().all():
-                # Calculate y-limits to prevent overlap
-                ac_data = historical_data["AC Power (W)"].dropna()
-                dc_data = historical_data["DC Power (W)"].dropna()
-                if not ac_data.empty and not dc_data.empty:
-                    y_min = min(ac_data.min(), dc_data.min()) - 10  # Add buffer
-                    y_max = max(ac_data.max(), dc_data.max()) + 10
-                    graph_data["power_ax"].set_ylim(y_min, y_max)
-                graph_data["power_ax"].plot(time_only, historical_data["AC Power (W)"], 'b-', label="AC Power (W)")
-                graph_data["power_ax"].plot(time_only, historical_data["DC Power (W)"], 'g-', label="DC Power (W)")
-            elif not historical_data["AC Power (W)"].isna().all():
-                graph_data["power_ax"].plot(time_only, historical_data["AC Power (W)"], 'b-', label="AC Power (W)")
-            elif not historical_data["DC Power (W)"].isna().all():
-                graph_data["power_ax"].plot(time_only, historical_data["DC Power (W)"], 'g-', label="DC Power (W)")
-    
-    graph_data["power_ax"].set_title("Power Trends")
-    graph_data["power_ax"].legend(loc="upper left")
-    graph_data["power_ax"].grid(True)
-    graph_data["power_ax"].tick_params(axis='x', rotation=45)
-    graph_data["power_ax"].xaxis.set_major_locator(MaxNLocator(nbins=6))
-    graph_data["power_ax"].set_xlabel("Time (HH:MM:SS)")
-    graph_data["power_fig"].subplots_adjust(left=0.12, right=0.88, bottom=0.15, top=0.88)  # Keep current margins
-    # Removed tight_layout to eliminate warnings, relying on subplots_adjust for layout
-    graph_data["power_canvas"].draw()
+def date_values(timestamps):
+    """Timestamps as float days for Line2D.set_data, vectorized and without per-point strings."""
+    return mdates.date2num(pd.to_datetime(timestamps, errors='coerce').to_numpy(dtype="datetime64[ns]"))
 
-def update_voltage_graph(self, tab_id, option):
+def plot_columns(ax):
+    """Width of the plot area in device pixels; decimation never needs more columns than this."""
+    return max(1, int(ax.bbox.width))
+
+def capture_background(graph_data, kind):
+    """After every full draw (first paint, resize, limit change) re-cache the static background."""
+    canvas = graph_data["canvas"]
+    ax = graph_data[f"{kind}_ax"]
+    graph_data[f"{kind}_background"] = canvas.copy_from_bbox(ax.bbox)
+    for line in graph_data[f"{kind}_lines"].values():
+        ax.draw_artist(line)  # The full draw skipped the animated lines
+
+def timed_frame(self, kind, **cause):
+    """self.frame_monitor.timed(...) on the dashboard; a no-op for GUIs without a monitor."""
+    monitor = getattr(self, "frame_monitor", None)
+    return monitor.timed(kind, **cause) if monitor is not None else nullcontext()
+
+def blit_lines(graph_data, kind):
+    canvas = graph_data["canvas"]
+    ax = graph_data[f"{kind}_ax"]
+    canvas.restore_region(graph_data[f"{kind}_background"])
+    for line in graph_data[f"{kind}_lines"].values():
+        ax.draw_artist(line)
+    canvas.blit(ax.bbox)
+
+def view_contains_data(ax):
+    (x0, x1), (y0, y1) = ax.get_xlim(), ax.get_ylim()
+    (dx0, dx1), (dy0, dy1) = ax.dataLim.intervalx, ax.dataLim.intervaly
+    return x0 <= dx0 and dx1 <= x1 and y0 <= dy0 and dy1 <= y1
+
+def graph_limits(self, tab_id, kind, historical_data, columns, range_var):
+    """Padded y-limits for the "Both" view, None when a single series may autoscale."""
+    if len(columns) < 2 or historical_data.empty:
+        return None
+    # Calculate y-limits to prevent overlap
+    limits = both_ylim(self, tab_id, historical_data, columns, range_var)
+    if not limits:
+        return None
+    pad = GRAPH_SPECS[kind]["pad"]
+    return limits[0] - pad, limits[1] + pad  # Add buffer
+
+def refresh_graph(self, tab_id, kind, option):
     graph_data = self.graphs[tab_id]
-    historical_data = graph_data["historical_data"].copy()
-    print(f"Updating voltage graph for tab {tab_id}, initial axes: {len(graph_data['voltage_fig'].axes)}")
-    if hasattr(graph_data["voltage_fig"], 'axes'):
-        for ax in graph_data["voltage_fig"].axes:
-            ax.remove()
-    graph_data["voltage_fig"].clear()
-    graph_data["voltage_ax"] = graph_data["voltage_fig"].add_subplot(111)
-    print(f"Voltage graph updated for tab {tab_id}, axes after update: {len(graph_data['voltage_fig'].axes)}")
-    graph_data["voltage_fig"].set_facecolor('white')
-    
-    range_var = graph_data["range_var"].get()
-    if not historical_data.empty and pd.api.types.is_datetime64_any_dtype(historical_data["Timestamp"]):
-        historical_data["Timestamp"] = pd.to_datetime(historical_data["Timestamp"], errors='coerce')
-        
-        if range_var == "Last Hour":
-            historical_data = historical_data[historical_data["Timestamp"] > datetime.now() - timedelta(hours=1)]
-        elif range_var == "Last Day":
-            historical_data = historical_data[historical_data["Timestamp"] > datetime.now() - timedelta(days=1)]
-        elif range_var == "Last 7 Days":
-            historical_data = historical_data[historical_data["Timestamp"] > datetime.now() - timedelta(days=7)]
-        elif range_var.startswith("Custom-"):
-            try:
-                start_str, end_str = range_var.split("-")[1], range_var.split("-")[2]
-                start = datetime.fromisoformat(start_str)
-                end = datetime.fromisoformat(end_str)
-                historical_data = historical_data[
-                    (historical_data["Timestamp"] >= start) & (historical_data["Timestamp"] <= end)
-                ]
-            except (ValueError, IndexError):
-                historical_data = historical_data  # Fall back to all data if parsing fails
-        elif range_var == "All":
-            pass
+    if graph_data.get("image_label") is not None:
+        request_render(self, tab_id)  # Process render mode: the whole tab is one bitmap
+        return
+    if graph_data.get("fig") is None:
+        return  # Not built yet, or figure released while the tab was idle; drawn when shown
+    if graph_data.get(f"{kind}_option") != option:
+        build_graph(self, tab_id, kind, option)
+    ax = graph_data[f"{kind}_ax"]
+    lines = graph_data[f"{kind}_lines"]
+    historical_data, range_var = plot_frame(graph_data)
+    view = graph_data.get("view")
+    if graph_data.get(f"{kind}_range") != (range_var, view):
+        graph_data[f"{kind}_range"] = (range_var, view)
+        graph_data[f"{kind}_background"] = None  # Limits must shrink to the new range
 
-        time_only = historical_data["Timestamp"].dt.strftime("%H:%M:%S").fillna("N/A")
-        
-        if option == "AC" and not historical_data["AC Voltage (V)"].isna().all():
-            graph_data["voltage_ax"].plot(time_only, historical_data["AC Voltage (V)"], 'b-', label="AC Voltage (V)")
-        elif option == "DC" and not historical_data["DC Voltage (V)"].isna().all():
-            graph_data["voltage_ax"].plot(time_only, historical_data["DC Voltage (V)"], 'g-', label="DC Voltage (V)")
-        elif option == "Both":
-            if not historical_data["AC Voltage (V)"].isna().all() and not historical_data["DC Voltage (V)"].isna().all():
-                ac_data = historical_data["AC Voltage (V)"].dropna()
-                dc_data = historical_data["DC Voltage (V)"].dropna()
-                if not ac_data.empty and not dc_data.empty:
-                    y_min = min(ac_data.min(), dc_data.min()) - 5  # Add buffer
-                    y_max = max(ac_data.max(), dc_data.max()) + 5
-                    graph_data["voltage_ax"].set_ylim(y_min, y_max)
-                graph_data["voltage_ax"].plot(time_only, historical_data["AC Voltage (V)"], 'b-', label="AC Voltage (V)")
-                graph_data["voltage_ax"].plot(time_only, historical_data["DC Voltage (V)"], 'g-', label="DC Voltage (V)")
-            elif not historical_data["AC Voltage (V)"].isna().all():
-                graph_data["voltage_ax"].plot(time_only, historical_data["AC Voltage (V)"], 'b-', label="AC Voltage (V)")
-            elif not historical_data["DC Voltage (V)"].isna().all():
-                graph_data["voltage_ax"].plot(time_only, historical_data["DC Voltage (V)"], 'g-', label="DC Voltage (V)")
-    
-    graph_data["voltage_ax"].set_title("Voltage Trends")
-    graph_data["voltage_ax"].legend(loc="upper left")
-    graph_data["voltage_ax"].grid(True)
-    graph_data["voltage_ax"].tick_params(axis='x', rotation=45)
-    graph_data["voltage_ax"].xaxis.set_major_locator(MaxNLocator(nbins=6))
-    graph_data["voltage_ax"].set_xlabel("Time (HH:MM:SS)")
-    graph_data["voltage_fig"].subplots_adjust(left=0.12, right=0.88, bottom=0.15, top=0.88)  # Keep current margins
-    # Removed tight_layout to eliminate warnings, relying on subplots_adjust for layout
-    graph_data["voltage_canvas"].draw()
+    if has_timestamps(historical_data):
+        times = date_values(historical_data["Timestamp"])
+        columns = plot_columns(ax)
+        for column, line in lines.items():
+            # M4 decimation: at most four points per pixel column, peaks and dips kept exactly
+            line.set_data(*decimate(times, pd.to_numeric(historical_data[column], errors='coerce'), columns))
+    else:
+        for line in lines.values():
+            line.set_data([], [])
+    ax.relim()
 
-def update_current_graph(self, tab_id, option):
+    limits = graph_limits(self, tab_id, kind, historical_data, list(lines), range_var)
+
+    # Fast path: nothing outside the cached view moved, so only the lines are redrawn
+    if (graph_data.get(f"{kind}_background") is not None and view_contains_data(ax)
+            and (limits is None or tuple(ax.get_ylim()) == limits)):
+        points = sum(len(line.get_xdata()) for line in lines.values())
+        with timed_frame(self, "blit", tab=graph_data["sheet"], graph=kind, points=points):
+            blit_lines(graph_data, kind)
+        return
+
+    ax.autoscale_view(scalex=view is None)
+    if limits:
+        ax.set_ylim(*limits)
+    if view is not None:
+        ax.set_xlim(mdates.date2num(view[0]), mdates.date2num(view[1]), auto=None)
+    elif CONFIG.get("LIVE_BLIT", True):
+        # Leave headroom on the right so the next samples fit without moving the axis
+        x0, x1 = ax.get_xlim()
+        ax.set_xlim(x0, x1 + (x1 - x0) * BLIT_HEADROOM, auto=None)  # Keep x autoscaling on
+    # All four trends share the canvas and the x-axis, so every cached background is now stale;
+    # they are re-captured by the draw_event handlers
+    for other in GRAPH_SPECS:
+        graph_data[f"{other}_background"] = None
+    graph_data["canvas"].draw_idle()
+
+def render_job(self, tab_id):
+    """Plain-data description of a tab's four trends for render_worker.render_panels."""
     graph_data = self.graphs[tab_id]
-    historical_data = graph_data["historical_data"].copy()
-    print(f"Updating current graph for tab {tab_id}, initial axes: {len(graph_data['current_fig'].axes)}")
-    if hasattr(graph_data["current_fig"], 'axes'):
-        for ax in graph_data["current_fig"].axes:
-            ax.remove()
-    graph_data["current_fig"].clear()
-    graph_data["current_ax"] = graph_data["current_fig"].add_subplot(111)
-    print(f"Current graph updated for tab {tab_id}, axes after update: {len(graph_data['current_fig'].axes)}")
-    graph_data["current_fig"].set_facecolor('white')
-    
-    range_var = graph_data["range_var"].get()
-    if not historical_data.empty and pd.api.types.is_datetime64_any_dtype(historical_data["Timestamp"]):
-        historical_data["Timestamp"] = pd.to_datetime(historical_data["Timestamp"], errors='coerce')
-        
-        if range_var == "Last Hour":
-            historical_data = historical_data[historical_data["Timestamp"] > datetime.now() - timedelta(hours=1)]
-        elif range_var == "Last Day":
-            historical_data = historical_data[historical_data["Timestamp"] > datetime.now() - timedelta(days=1)]
-        elif range_var == "Last 7 Days":
-            historical_data = historical_data[historical_data["Timestamp"] > datetime.now() - timedelta(days=7)]
-        elif range_var.startswith("Custom-"):
-            try:
-                start_str, end_str = range_var.split("-")[1], range_var.split("-")[2]
-                start = datetime.fromisoformat(start_str)
-                end = datetime.fromisoformat(end_str)
-                historical_data = historical_data[
-                    (historical_data["Timestamp"] >= start) & (historical_data["Timestamp"] <= end)
-                ]
-            except (ValueError, IndexError):
-                historical_data = historical_data  # Fall back to all data if parsing fails
-        elif range_var == "All":
-            pass
+    label = graph_data["image_label"]
+    width, height = max(200, label.winfo_width()), max(150, label.winfo_height())
+    historical_data, range_var = plot_frame(graph_data)
+    has_data = has_timestamps(historical_data)
+    if has_data:
+        times = date_values(historical_data["Timestamp"])
+    panels = []
+    for kind, spec in GRAPH_SPECS.items():
+        select = graph_data.get(f"{kind}_select")
+        option = select.get() if select is not None and select.get() in spec["series"] else next(iter(spec["series"]))
+        series = spec["series"][option]
+        data = []
+        for column, style, label_text in series:
+            if has_data:
+                # Two plot columns side by side, so each panel is about half the bitmap wide
+                x, y = decimate(times, pd.to_numeric(historical_data[column], errors='coerce'), width // 2)
+            else:
+                x, y = [], []
+            data.append((x, y, style, label_text))
+        limits = graph_limits(self, tab_id, kind, historical_data, [column for column, _, _ in series], range_var)
+        panels.append({"title": spec["title"], "series": data, "ylim": limits})
+    view = graph_data.get("view")
+    xlim = None if view is None else (mdates.date2num(view[0]), mdates.date2num(view[1]))
+    return {"width": width, "height": height, "dpi": 100, "panels": panels, "xlim": xlim}
 
-        time_only = historical_data["Timestamp"].dt.strftime("%H:%M:%S").fillna("N/A")
-        
-        if option == "AC" and not historical_data["AC Current (A)"].isna().all():
-            graph_data["current_ax"].plot(time_only, historical_data["AC Current (A)"], 'b-', label="AC Current (A)")
-        elif option == "DC" and not historical_data["DC Current (A)"].isna().all():
-            graph_data["current_ax"].plot(time_only, historical_data["DC Current (A)"], 'g-', label="DC Current (A)")
-        elif option == "Both":
-            if not historical_data["AC Current (A)"].isna().all() and not historical_data["DC Current (A)"].isna().all():
-                ac_data = historical_data["AC Current (A)"].dropna()
-                dc_data = historical_data["DC Current (A)"].dropna()
-                if not ac_data.empty and not dc_data.empty:
-                    y_min = min(ac_data.min(), dc_data.min()) - 0.5  # Add buffer
-                    y_max = max(ac_data.max(), dc_data.max()) + 0.5
-                    graph_data["current_ax"].set_ylim(y_min, y_max)
-                graph_data["current_ax"].plot(time_only, historical_data["AC Current (A)"], 'b-', label="AC Current (A)")
-                graph_data["current_ax"].plot(time_only, historical_data["DC Current (A)"], 'g-', label="DC Current (A)")
-            elif not historical_data["AC Current (A)"].isna().all():
-                graph_data["current_ax"].plot(time_only, historical_data["AC Current (A)"], 'b-', label="AC Current (A)")
-            elif not historical_data["DC Current (A)"].isna().all():
-                graph_data["current_ax"].plot(time_only, historical_data["DC Current (A)"], 'g-', label="DC Current (A)")
-    
-    graph_data["current_ax"].set_title("Current Trends")
-    graph_data["current_ax"].legend(loc="upper left")
-    graph_data["current_ax"].grid(True)
-    graph_data["current_ax"].tick_params(axis='x', rotation=45)
-    graph_data["current_ax"].xaxis.set_major_locator(MaxNLocator(nbins=6))
-    graph_data["current_ax"].set_xlabel("Time (HH:MM:SS)")
-    graph_data["current_fig"].subplots_adjust(left=0.12, right=0.88, bottom=0.15, top=0.88)  # Keep current margins
-    # Removed tight_layout to eliminate warnings, relying on subplots_adjust for layout
-    graph_data["current_canvas"].draw()
+def show_rendered(graph_data, ppm):
+    label = graph_data.get("image_label")
+    if label is None or not label.winfo_exists():
+        return  # The tab's widgets went away while this was rendering
+    image = tk.PhotoImage(data=ppm, format="PPM")
+    label.configure(image=image)
+    graph_data["image"] = image  # The label does not keep the image alive on its own
 
-def update_energy_graph(self, tab_id):
+def request_render(self, tab_id):
     graph_data = self.graphs[tab_id]
-    historical_data = graph_data["historical_data"].copy()
-    print(f"Updating energy graph for tab {tab_id}, initial axes: {len(graph_data['energy_fig'].axes)}")
-    if hasattr(graph_data["energy_fig"], 'axes'):
-        for ax in graph_data["energy_fig"].axes:
-            ax.remove()
-    graph_data["energy_fig"].clear()
-    graph_data["energy_ax"] = graph_data["energy_fig"].add_subplot(111)
-    print(f"Energy graph updated for tab {tab_id}, axes after update: {len(graph_data['energy_fig'].axes)}")
-    graph_data["energy_fig"].set_facecolor('white')
-    
-    range_var = graph_data["range_var"].get()
-    if not historical_data.empty and pd.api.types.is_datetime64_any_dtype(historical_data["Timestamp"]):
-        historical_data["Timestamp"] = pd.to_datetime(historical_data["Timestamp"], errors='coerce')
-        
-        if range_var == "Last Hour":
-            historical_data = historical_data[historical_data["Timestamp"] > datetime.now() - timedelta(hours=1)]
-        elif range_var == "Last Day":
-            historical_data = historical_data[historical_data["Timestamp"] > datetime.now() - timedelta(days=1)]
-        elif range_var == "Last 7 Days":
-            historical_data = historical_data[historical_data["Timestamp"] > datetime.now() - timedelta(days=7)]
-        elif range_var.startswith("Custom-"):
-            try:
-                start_str, end_str = range_var.split("-")[1], range_var.split("-")[2]
-                start = datetime.fromisoformat(start_str)
-                end = datetime.fromisoformat(end_str)
-                historical_data = historical_data[
-                    (historical_data["Timestamp"] >= start) & (historical_data["Timestamp"] <= end)
-                ]
-            except (ValueError, IndexError):
-                historical_data = historical_data  # Fall back to all data if parsing fails
-        elif range_var == "All":
-            pass
+    self.renderer.request(tab_id, lambda: render_job(self, tab_id), lambda ppm: show_rendered(graph_data, ppm))
 
-        time_only = historical_data["Timestamp"].dt.strftime("%H:%M:%S").fillna("N/A")
-        if not historical_data["Reverse Energy (kWh)"].isna().all():
-            graph_data["energy_ax"].plot(time_only, historical_data["Reverse Energy (kWh)"], 'm-', label="Energy (kWh)")
-    
-    graph_data["energy_ax"].set_title("Energy Trends")
-    graph_data["energy_ax"].legend(loc="upper left")
-    graph_data["energy_ax"].grid(True)
-    graph_data["energy_ax"].tick_params(axis='x', rotation=45)
-    graph_data["energy_ax"].xaxis.set_major_locator(MaxNLocator(nbins=6))
-    graph_data["energy_ax"].set_xlabel("Time (HH:MM:SS)")
-    graph_data["energy_fig"].subplots_adjust(left=0.12, right=0.88, bottom=0.15, top=0.88)  # Keep current margins
-    # Removed tight_layout to eliminate warnings, relying on subplots_adjust for layout
-    graph_data["energy_canvas"].draw()
+def update_power_graph(self, tab_id, option):
+    refresh_graph(self, tab_id, "power", option)
+
+def update_voltage_graph(self, tab_id, option):
+    refresh_graph(self, tab_id, "voltage", option)
+
+def update_current_graph(self, tab_id, option):
+    refresh_graph(self, tab_id, "current", option)
+
+def update_energy_graph(self, tab_id):
+    refresh_graph(self, tab_id, "energy", "Energy")
 
 def update_all_graphs(self, tab_id):
     self.update_power_graph(tab_id, self.graphs[tab_id]["power_select"].get())
@@ -262,19 +269,23 @@ def update_all_graphs(self, tab_id):
     self.update_current_graph(tab_id, self.graphs[tab_id]["current_select"].get())
     self.update_energy_graph(tab_id)
 
-def resize_graphs(self):
-    for tab_id, tab in self.tabs.items():
-        graphs_frame = tab.winfo_children()[1]
-        # Use actual canvas dimensions for more precise sizing, assuming 100 DPI
-        width = graphs_frame.winfo_width() / 100  # Convert pixels to inches
-        height = graphs_frame.winfo_height() / 200  # Convert pixels to inches
-        graphs = self.graphs[tab_id]
-        for fig_key in ["power_fig", "voltage_fig", "current_fig", "energy_fig"]:
-            fig = graphs[fig_key]
-            # Calculate new sizes to match canvas exactly, no buffers
-            new_width = max(1, width / 2)  # Ensure minimum width of 1 inch
-            new_height = max(1, height - 0.1)  # Ensure minimum height of 1 inch, minimal buffer
-            fig.set_size_inches(new_width, new_height)
-            fig.subplots_adjust(left=0.12, right=0.88, bottom=0.15, top=0.88)  # Keep current margins
-            # Removed tight_layout to eliminate warnings, relying on subplots_adjust for layout
-            graphs[f"{fig_key.replace('_fig', '')}_canvas"].draw()  # Redraw to apply new size and margins
\ No newline at end of file
+def update_fleet_graph(self):
+    fleet_graph = self.fleet_graph
+    ax = fleet_graph["ax"]
+    if "lines" not in fleet_graph:
+        fleet_graph["lines"] = {
+            "AC Power (W)": ax.plot([], [], 'b-', label="Total AC Power (W)")[0],
+            "DC Power (W)": ax.plot([], [], 'g-', label="Total DC Power (W)")[0],
+        }
+        ax.set_title("Fleet Power")
+        ax.legend(loc="upper left")
+        ax.grid(True)
+        set_date_axis(ax)
+    totals = self.fleet.totals_frame()
+    times = date_values(totals["Timestamp"])
+    columns = plot_columns(ax)
+    for column, line in fleet_graph["lines"].items():
+        line.set_data(*decimate(times, totals[column], columns))
+    ax.relim()
+    ax.autoscale_view()
+    fleet_graph["canvas"].draw_idle()
\ No newline at end of file
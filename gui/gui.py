@@ -1,21 +1,41 @@
 import tkinter as tk
 from tkinter import ttk
-import threading
 from tkinter import filedialog
 from tkinter import messagebox
 from matplotlib.ticker import MaxNLocator
-import tinytuya
-from .tabs import setup_tab, handle_range_selection, prompt_specific_hour, enable_zoom, on_press, on_release
-from .graphs import update_power_graph, update_voltage_graph, update_current_graph, update_energy_graph, update_all_graphs, resize_graphs
+from .tabs import setup_tab, attach_tab_figure, release_tab_figure, handle_range_selection, prompt_specific_hour, enable_zoom, on_press, on_release
+from .graphs import update_power_graph, update_voltage_graph, update_current_graph, update_energy_graph, update_all_graphs, update_fleet_graph
+from .tabs import FleetTab
+from .scheduler import RenderScheduler
+from .figure_pool import FigurePool
+from .coalescer import UICoalescer
+from .bridge import TkBridge, SampleEvent
+from .log_panel import LogPanel
+from .diagnostics import DiagnosticsWindow
+from .frame_monitor import FrameMonitor
+from .overview import FleetOverview
 from datetime import datetime, timedelta
 import time
-from inverter_monitoring.data import fetch_inverter_data
-from inverter_monitoring.file_ops import load_historical_data, write_to_excel, export_historical_data
-from inverter_monitoring.config import CONFIG, CONFIG_FILE, CLOUD
+from inverter_monitoring.data import fetch_inverter_data, set_simulator
+from inverter_monitoring.simulator import FleetSimulator, SimClock, SIM_PREFIX, sim_device_id
+from inverter_monitoring.file_ops import write_to_excel, export_historical_data
+from inverter_monitoring.config import CONFIG, CONFIG_FILE, get_cloud, reset_cloud
+from inverter_monitoring.stats import InverterStats
+from inverter_monitoring.fleet import FleetAggregator
+from inverter_monitoring.render_worker import ProcessRenderer
+from inverter_monitoring.history import HistoryStore, HistoryLoader
+from inverter_monitoring.acquisition import AcquisitionWorker, FetchJob
+from inverter_monitoring.http_api import LiveState, start_server
+from inverter_monitoring.profiling import Profiler, install_signal_handlers
+from inverter_monitoring import logs, metrics
 import json
+import os
+import logging
 import pandas as pd
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.pyplot as plt
+
+log = logs.get_logger("gui")
+
+TAB_IDLE_CHECK_MS = 60000  # How often hidden tabs are checked for release_idle_tabs
 
 class InverterGUI:
     def __init__(self, root):
@@ -32,6 +52,7 @@ class InverterGUI:
         self.update_current_graph = update_current_graph.__get__(self, InverterGUI)
         self.update_energy_graph = update_energy_graph.__get__(self, InverterGUI)
         self.update_all_graphs = update_all_graphs.__get__(self, InverterGUI)
+        self.update_fleet_graph = update_fleet_graph.__get__(self, InverterGUI)
 
         # Dynamically bind tab-related methods to self
         self.handle_range_selection = handle_range_selection.__get__(self, InverterGUI)
@@ -45,13 +66,32 @@ class InverterGUI:
 
         self.notebook = ttk.Notebook(self.main_frame)
         self.notebook.grid(row=0, column=0, sticky="nsew")
+        metrics.setup_metrics(CONFIG)
+        # Event-loop lag and draw times; F12 toggles the frame-time overlay
+        self.frame_monitor = FrameMonitor(self.root)
+        self.root.bind("<F12>", self.frame_monitor.toggle_overlay)
+        if CONFIG.get("FRAME_OVERLAY", False):
+            self.frame_monitor.toggle_overlay()
+        self.scheduler = RenderScheduler(self.root, self.notebook, CONFIG.get("UI_FRAME_MS", 100))
+        self.figure_pool = FigurePool()
+        self.history = HistoryStore()  # Archive range queries for zoom, pan and multi-day ranges
+        # "process" renders trend bitmaps in a worker process; "inline" draws on the Tk thread
+        self.renderer = ProcessRenderer(self.root) if CONFIG.get("RENDER_MODE", "inline") == "process" else None
 
         self.tabs = {}
         self.values = {}
         self.graphs = {}
         self.status_lights = {}
-
-        print(f"Creating tabs for inverters: {[inv['sheet'] for inv in CONFIG['INVERTERS']]}")
+        self.stats = {}
+        self.sheet_names = {}
+        self.label_state = {}  # Last text/options set per widget, so unchanged values are not re-configured
+        self.device_ids = {}
+        self.built = set()       # Tabs whose widgets exist
+        self.last_viewed = {}    # tab_id -> time.monotonic() when it was last on screen
+        self.latest_data = {}    # tab_id -> newest poll result, shown when the tab is built
+        self.current_tab = None
+
+        log.debug("Creating tabs for inverters: %s", [inv["sheet"] for inv in CONFIG["INVERTERS"]])
         for i, inverter in enumerate(CONFIG["INVERTERS"]):
             tab = ttk.Frame(self.notebook)
             self.notebook.add(tab, text=inverter["sheet"])
@@ -59,10 +99,35 @@ class InverterGUI:
             self.tabs[tab_id] = tab
             self.values[tab_id] = {}
             self.status_lights[tab_id] = None
-            setup_tab(self, tab, inverter["device_id"], inverter["sheet"], tab_id)
-
-            # Initialize graphs with default range (ensure new options are available)
-            self.handle_range_selection(tab_id, "All")
+            self.stats[tab_id] = InverterStats()
+            self.sheet_names[tab_id] = inverter["sheet"]
+            self.device_ids[tab_id] = inverter["device_id"]
+            # Only the data exists until the tab is first shown; build_tab adds widgets and figure
+            self.graphs[tab_id] = {"sheet": inverter["sheet"], "historical_data": pd.DataFrame(), "fig": None}
+            if not inverter["device_id"]:
+                self.notebook.tab(tab, state="disabled")
+            self.scheduler.register(tab_id, tab, lambda tab_id=tab_id: self.show_tab(tab_id))
+
+        # Overview page: one light-weight row per inverter. Large fleets start there with the
+        # inverter tabs hidden; a tab is shown when its row is clicked and hidden again when idle
+        self.overview_tab = ttk.Frame(self.notebook)
+        self.notebook.insert(0, self.overview_tab, text="Overview")
+        self.overview = FleetOverview(self.overview_tab, list(self.sheet_names.items()), self.open_inverter_tab)
+        self.overview.pack(fill="both", expand=True)
+        self.scheduler.register("overview", self.overview_tab, self.overview.redraw)
+        self.hide_inverter_tabs = len(self.tabs) > CONFIG.get("OVERVIEW_TABS", 12)
+        if self.hide_inverter_tabs:
+            for tab in self.tabs.values():
+                self.notebook.hide(tab)
+            self.notebook.select(self.overview_tab)
+
+        # Fleet tab: all inverters aligned on one time grid
+        self.fleet = FleetAggregator(self.sheet_names, CONFIG["FETCH_INTERVAL"])
+        self.fleet_tab = ttk.Frame(self.notebook)
+        self.notebook.add(self.fleet_tab, text="Fleet")
+        FleetTab.setup_tab(self, self.fleet_tab)
+        self.scheduler.register("fleet", self.fleet_tab, self.show_fleet)
+        self.update_fleet()
 
         self.control_frame = ttk.Frame(self.main_frame)
         self.control_frame.grid(row=1, column=0, pady=5, sticky="ew")
@@ -76,9 +141,47 @@ class InverterGUI:
         self.last_update_label.grid(row=0, column=4, padx=5)
         ttk.Button(self.control_frame, text="Simulate", command=self.toggle_simulate).grid(row=0, column=5, padx=5)
         ttk.Button(self.control_frame, text="Export Data", command=self.export_historical_data).grid(row=0, column=6, padx=5)
-
-        self.log = tk.Text(self.main_frame, height=5, width=80, font=("Arial", 10))
+        self.refresh_progress = ttk.Progressbar(self.control_frame, length=100, mode="determinate")
+        self.refresh_progress.grid(row=0, column=7, padx=5)
+        self.cancel_button = ttk.Button(self.control_frame, text="Cancel", command=self.cancel_refresh, state="disabled")
+        self.cancel_button.grid(row=0, column=8, padx=5)
+        ttk.Button(self.control_frame, text="Diagnostics", command=self.open_diagnostics).grid(row=0, column=9, padx=5)
+        self.diagnostics = None
+
+        self.log = LogPanel(self.main_frame, logs.setup_logging(CONFIG), [inv["sheet"] for inv in CONFIG["INVERTERS"]])
         self.log.grid(row=2, column=0, pady=10, sticky="ew")
+        # Samples are applied once per fetch cycle; UI_REFRESH_MS caps how long a slow cycle holds them
+        self.coalescer = UICoalescer(self.root, self.apply_batch, CONFIG.get("UI_REFRESH_MS", 10000))
+        # Worker threads never touch widgets; they post events that are handled on the main loop
+        self.bridge = TkBridge(self.root)
+        self.bridge.register(SampleEvent, self.coalescer.add)
+        metrics.gauge("bridge_backlog", self.bridge.backlog)
+        # Profiling on demand: Diagnostics window, or SIGUSR1/SIGUSR2 (profiling.py toggle/snapshot PID)
+        self.profiler = Profiler(os.path.join(CONFIG["SAVE_DIR"], "profiles"))
+        install_signal_handlers(self.profiler, run=self.bridge.call)
+        # Every network call (polling, Refresh, Settings-save) runs on the acquisition thread
+        self.acquisition = AcquisitionWorker(fetch_inverter_data)
+        self.poll_job = None
+        self.poll_after = None
+        self.refresh_job = None
+        # Newest samples for the optional local HTTP endpoint (HTTP_API), kept in memory
+        self.live = LiveState()
+        self.http_api = None
+        if CONFIG.get("HTTP_API"):
+            try:
+                self.http_api = start_server(self.live, CONFIG["HTTP_API"])
+            except (OSError, ValueError) as e:
+                log.error("Could not start the HTTP API on %s: %s", CONFIG["HTTP_API"], e)
+
+        # The window opens with empty graphs; this month's archive is merged in afterwards,
+        # newest day and visible tab first. Live samples from now on come from polling.
+        self.started_at = datetime.now()
+        self.history_loader = HistoryLoader(
+            self.history, lambda tab_id, frame: self.bridge.call(self.add_history_chunk, tab_id, frame))
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed, add="+")
+        self.on_tab_changed()
+        self.history_loader.start(self.sheet_names)
+        self.root.after(TAB_IDLE_CHECK_MS, self.release_idle_tabs)
 
         self.root.columnconfigure(0, weight=1)
         self.root.rowconfigure(0, weight=1)
@@ -86,114 +189,98 @@ class InverterGUI:
         self.main_frame.rowconfigure(0, weight=1)
 
         self.root.bind("<Configure>", self.on_resize)
-
-    # ... (rest of the methods remain the same)
-
-    def setup_tab(self, tab, device_id, sheet_name, tab_id):
-        data_frame = ttk.LabelFrame(tab, text="Current Values", padding="5")
-        data_frame.grid(row=0, column=0, padx=5, pady=5, sticky="nsew")
-
-        labels = ["AC Power (W)", "AC Voltage (V)", "Frequency (Hz)", "DC Power (W)", 
-                  "DC Voltage (V)", "DC Current (A)", "Temperature (°C)", "Reverse Energy (kWh)"]
-        for i, label in enumerate(labels):
-            ttk.Label(data_frame, text=label, font=("Arial", 10)).grid(row=i, column=0, sticky="w", padx=5)
-            value_label = ttk.Label(data_frame, text="N/A", font=("Arial", 10))
-            value_label.grid(row=i, column=1, sticky="w", padx=5)
-            self.values[tab_id][label] = value_label
-        
-        status_frame = ttk.Frame(data_frame)
-        status_frame.grid(row=0, column=2, rowspan=len(labels), padx=5)
-        ttk.Label(status_frame, text="Status", font=("Arial", 10)).grid(row=0, column=0)
-        status_canvas = tk.Canvas(status_frame, width=20, height=20)
-        status_canvas.grid(row=1, column=0)
-        status_canvas.create_oval(2, 2, 18, 18, fill="grey" if device_id else "lightgrey", tags="status")
-        self.status_lights[tab_id] = status_canvas
-        
-        if not device_id:
-            self.notebook.tab(tab, state="disabled")
-
-        graphs_frame = ttk.LabelFrame(tab, text="Trends", padding="5")
-        graphs_frame.grid(row=0, column=1, padx=5, pady=5, sticky="nsew")
-        tab.columnconfigure(1, weight=1)
-        tab.rowconfigure(0, weight=1)
-        graphs_frame.columnconfigure((0, 1), weight=1)
-        graphs_frame.rowconfigure((0, 1, 2), weight=1)
-
-        range_frame = ttk.Frame(graphs_frame)
-        range_frame.grid(row=0, column=0, columnspan=2, pady=5)
-        range_var = tk.StringVar(value="All")
-        ttk.OptionMenu(range_frame, range_var, "All", "Last Hour", "Last Day", "All", 
-                       command=lambda val: self.update_all_graphs(tab_id)).pack()
-
-        initial_width, initial_height = 8, 5
-
-        power_frame = ttk.Frame(graphs_frame)
-        power_frame.grid(row=1, column=0, padx=5, pady=5, sticky="nsew")
-        power_select = tk.StringVar(value="Both")
-        ttk.OptionMenu(power_frame, power_select, "Both", "AC", "DC", "Both", 
-                       command=lambda val: self.update_power_graph(tab_id, val)).pack(fill="x")
-        power_fig, power_ax = plt.subplots(figsize=(initial_width, initial_height))
-        power_fig.subplots_adjust(left=0.1, right=0.95, bottom=0.3, top=0.9)
-        power_canvas = FigureCanvasTkAgg(power_fig, master=power_frame)
-        power_widget = power_canvas.get_tk_widget()
-        power_widget.pack(fill="both", expand=True)
-
-        voltage_frame = ttk.Frame(graphs_frame)
-        voltage_frame.grid(row=1, column=1, padx=5, pady=5, sticky="nsew")
-        voltage_select = tk.StringVar(value="Both")
-        ttk.OptionMenu(voltage_frame, voltage_select, "Both", "AC", "DC", "Both", 
-                       command=lambda val: self.update_voltage_graph(tab_id, val)).pack(fill="x")
-        voltage_fig, voltage_ax = plt.subplots(figsize=(initial_width, initial_height))
-        voltage_fig.subplots_adjust(left=0.1, right=0.95, bottom=0.3, top=0.9)
-        voltage_canvas = FigureCanvasTkAgg(voltage_fig, master=voltage_frame)
-        voltage_widget = voltage_canvas.get_tk_widget()
-        voltage_widget.pack(fill="both", expand=True)
-
-        current_frame = ttk.Frame(graphs_frame)
-        current_frame.grid(row=2, column=0, padx=5, pady=5, sticky="nsew")
-        current_select = tk.StringVar(value="Both")
-        ttk.OptionMenu(current_frame, current_select, "Both", "AC", "DC", "Both", 
-                       command=lambda val: self.update_current_graph(tab_id, val)).pack(fill="x")
-        current_fig, current_ax = plt.subplots(figsize=(initial_width, initial_height))
-        current_fig.subplots_adjust(left=0.1, right=0.95, bottom=0.3, top=0.9)
-        current_canvas = FigureCanvasTkAgg(current_fig, master=current_frame)
-        current_widget = current_canvas.get_tk_widget()
-        current_widget.pack(fill="both", expand=True)
-
-        energy_frame = ttk.Frame(graphs_frame)
-        energy_frame.grid(row=2, column=1, padx=5, pady=5, sticky="nsew")
-        ttk.Label(energy_frame, text="Reverse Energy").pack(fill="x")
-        energy_fig, energy_ax = plt.subplots(figsize=(initial_width, initial_height))
-        energy_fig.subplots_adjust(left=0.1, right=0.95, bottom=0.3, top=0.9)
-        energy_canvas = FigureCanvasTkAgg(energy_fig, master=energy_frame)
-        energy_widget = energy_canvas.get_tk_widget()
-        energy_widget.pack(fill="both", expand=True)
-
-        historical_data = load_historical_data(sheet_name)
-        self.graphs[tab_id] = {
-            "power_fig": power_fig, "power_ax": power_ax, "power_canvas": power_canvas, "power_select": power_select,
-            "voltage_fig": voltage_fig, "voltage_ax": voltage_ax, "voltage_canvas": voltage_canvas, "voltage_select": voltage_select,
-            "current_fig": current_fig, "current_ax": current_ax, "current_canvas": current_canvas, "current_select": current_select,
-            "energy_fig": energy_fig, "energy_ax": energy_ax, "energy_canvas": energy_canvas,
-            "range_var": range_var,
-            "historical_data": historical_data
-        }
-        self.update_all_graphs(tab_id)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def on_close(self):
+        """Stop polling and the render worker processes before the window goes away."""
+        self.stop_monitoring()
+        if self.renderer is not None:
+            self.renderer.close()
+        if self.http_api is not None:
+            self.http_api.shutdown()
+        self.root.destroy()
+
+    def on_tab_changed(self, event=None):
+        now = time.monotonic()
+        if self.current_tab is not None:
+            self.last_viewed[self.current_tab] = now  # Idle time counts from when it was left
+        self.current_tab = self.scheduler.visible_key()
+        if self.current_tab in self.tabs:
+            self.build_tab(self.current_tab)
+            self.last_viewed[self.current_tab] = now
+        self.history_loader.prioritize(self.current_tab)
+
+    def build_tab(self, tab_id):
+        """Create a tab's widgets and figure on first view and fill them from the current data."""
+        if tab_id in self.built:
+            return
+        self.built.add(tab_id)
+        setup_tab(self, self.tabs[tab_id], self.device_ids[tab_id], self.sheet_names[tab_id], tab_id)
+        color = self.label_state.pop(("status", tab_id), None)
+        if color:
+            self.set_status(tab_id, color)
+        self.show_values(tab_id)
+        self.update_day_stats(tab_id)
+        # Initialize graphs with default range (ensure new options are available)
+        self.handle_range_selection(tab_id, "All")
+
+    def show_tab(self, tab_id):
+        """Scheduler render for an inverter tab: build or re-attach its figure, then draw."""
+        self.build_tab(tab_id)
+        attach_tab_figure(self, tab_id)
+        with metrics.span("render", self.sheet_names[tab_id]):
+            self.update_all_graphs(tab_id)
+
+    def show_fleet(self):
+        with metrics.span("render"):  # Fleet-wide only; no inverter of its own
+            self.update_fleet_graph()
+
+    def release_idle_tabs(self):
+        """Return the figures of tabs not shown for TAB_IDLE_SECONDS to the figure pool."""
+        idle_seconds = CONFIG.get("TAB_IDLE_SECONDS", 300)
+        now = time.monotonic()
+        for tab_id, viewed in self.last_viewed.items():
+            graph_data = self.graphs[tab_id]
+            holding = graph_data.get("fig") is not None or graph_data.get("image") is not None
+            if tab_id != self.current_tab and now - viewed > idle_seconds and holding:
+                release_tab_figure(self, tab_id)
+                self.scheduler.mark_dirty(tab_id)  # Redrawn from scratch when shown again
+                if self.hide_inverter_tabs:
+                    self.notebook.hide(self.tabs[tab_id])
+        self.root.after(TAB_IDLE_CHECK_MS, self.release_idle_tabs)
+
+    def open_inverter_tab(self, tab_id):
+        """Overview row click: show the inverter's tab (built on selection) and switch to it."""
+        tab = self.tabs[tab_id]
+        if not self.device_ids[tab_id] and not self.simulate_mode:
+            self.log_message(f"{self.sheet_names[tab_id]} is not configured", inverter=self.sheet_names[tab_id])
+            return
+        self.notebook.add(tab)  # Restores a hidden tab in its old position
+        self.notebook.select(tab)
 
     def toggle_simulate(self):
         self.simulate_mode = not self.simulate_mode
-        self.log.insert(tk.END, f"[{datetime.now()}] Simulation {'enabled' if self.simulate_mode else 'disabled'}\n")
+        self.log_message(f"Simulation {'enabled' if self.simulate_mode else 'disabled'}")
+        if self.simulate_mode:
+            # Unconfigured inverters, plus the IDs of a fleet written by simulator --config-out
+            device_ids = [sim_device_id(i) if not inverter["device_id"] else inverter["device_id"]
+                          for i, inverter in enumerate(CONFIG["INVERTERS"])
+                          if not inverter["device_id"] or inverter["device_id"].startswith(SIM_PREFIX)]
+            clock = SimClock(speed=CONFIG.get("SIM_SPEED", 1.0))
+            set_simulator(FleetSimulator(device_ids, CONFIG.get("SIM_SEED", 0), clock))
+        else:
+            set_simulator(None)
         for i, inverter in enumerate(CONFIG["INVERTERS"]):
             tab_id = inverter["device_id"] if inverter["device_id"] else f"unconfigured_{i}"
             tab = self.tabs[tab_id]
-            if not inverter["device_id"]:
+            if not inverter["device_id"] and self.notebook.tab(tab, "state") != "hidden":
                 state = "normal" if self.simulate_mode else "disabled"
                 self.notebook.tab(tab, state=state)
         if self.simulate_mode:
             self.refresh_data()
 
     def export_historical_data(self):
-        export_historical_data(self.graphs, self.log)
+        export_historical_data(self.graphs, self.stats)
 
     def on_resize(self, event):
         if self.resize_timer is not None:
@@ -201,70 +288,129 @@ class InverterGUI:
         self.resize_timer = self.root.after(200, self.resize_graphs)
 
     def resize_graphs(self):
-        for tab_id, tab in self.tabs.items():
-            graphs_frame = tab.winfo_children()[1]
-            width = graphs_frame.winfo_width() / 100
-            height = graphs_frame.winfo_height() / 200
-            graphs = self.graphs[tab_id]
-            for fig_key in ["power_fig", "voltage_fig", "current_fig", "energy_fig"]:
-                fig = graphs[fig_key]
-                new_width = max(4, width / 2 - 0.5)
-                new_height = max(3, height - 0.5)
-                fig.set_size_inches(new_width, new_height)
-                fig.subplots_adjust(left=0.1, right=0.95, bottom=0.28, top=0.9)
-                graphs[f"{fig_key.replace('_fig', '')}_canvas"].draw()
-
-    def update_data(self):
-        while self.running:
-            current_time = datetime.now().time()
-            if CONFIG["RECORDING_WINDOW"][0] <= current_time <= CONFIG["RECORDING_WINDOW"][1]:
-                for i, inverter in enumerate(CONFIG["INVERTERS"]):
-                    tab_id = inverter["device_id"] if inverter["device_id"] else f"unconfigured_{i}"
-                    data = fetch_inverter_data(inverter["device_id"])
-                    if data:
-                        self.update_display(tab_id, data, inverter["sheet"])
-                        write_to_excel(data, inverter["sheet"])
-                        self.log.insert(tk.END, f"[{datetime.now()}] Data updated for {inverter['sheet']}\n")
-                        self.status_lights[tab_id].itemconfig("status", fill="green")
-                    else:
-                        self.log.insert(tk.END, f"[{datetime.now()}] Failed to fetch data for {inverter['sheet']}\n")
-                        self.status_lights[tab_id].itemconfig("status", fill="orange")
-                    self.log.see(tk.END)
-                    self.last_update = datetime.now().strftime("%H:%M:%S")
-                    self.last_update_label.config(text=f"Last Update: {self.last_update}")
-            time.sleep(CONFIG["FETCH_INTERVAL"])
-
-    def refresh_data(self):
+        # Each tab's canvas resizes its own figure; re-decimating for the new width is a normal
+        # redraw, done now for the visible tab and on selection for the rest
+        with self.frame_monitor.timed("resize", visible=self.sheet_names.get(self.current_tab, self.current_tab)):
+            self.scheduler.mark_all_dirty()
+
+    def inverter_targets(self):
+        """(tab_id, inverter) for every configured inverter, in tab order."""
+        targets = []
         for i, inverter in enumerate(CONFIG["INVERTERS"]):
             tab_id = inverter["device_id"] if inverter["device_id"] else f"unconfigured_{i}"
-            data = fetch_inverter_data(inverter["device_id"])
-            if data:
-                self.update_display(tab_id, data, inverter["sheet"])
-                self.status_lights[tab_id].itemconfig("status", fill="green")
-            else:
-                self.status_lights[tab_id].itemconfig("status", fill="orange")
-            self.last_update = datetime.now().strftime("%H:%M:%S")
-            self.last_update_label.config(text=f"Last Update: {self.last_update}")
+            if self.simulate_mode and not inverter["device_id"]:
+                inverter = dict(inverter, device_id=sim_device_id(i))  # Answered by the simulator
+            targets.append((tab_id, inverter))
+        return targets
 
-    def update_display(self, tab_id, data, sheet_name):
-        def format_value(val):
-            return f"{val:.2f}" if isinstance(val, (int, float)) else "N/A"
-        self.values[tab_id]["AC Power (W)"].config(text=format_value(data["important_dps"]["ac_power (W)"]))
-        self.values[tab_id]["AC Voltage (V)"].config(text=format_value(data["extracted"]["phase_a"]["ac_voltage"]))
-        self.values[tab_id]["Frequency (Hz)"].config(text=format_value(data["extracted"]["phase_a"]["frequency"]))
-        self.values[tab_id]["DC Power (W)"].config(text=format_value(data["extracted"]["pv1_dc_data"]["dc_power"]))
-        self.values[tab_id]["DC Voltage (V)"].config(text=format_value(data["extracted"]["pv1_dc_data"]["dc_voltage"]))
-        self.values[tab_id]["DC Current (A)"].config(text=format_value(data["extracted"]["pv1_dc_data"]["dc_current"]))
-        temp = data["important_dps"]["temp_current (°C)"]
-        self.values[tab_id]["Temperature (°C)"].config(
-            text=format_value(temp),
-            foreground="red" if isinstance(temp, (int, float)) and temp > 50 else "black"
-        )
-        self.values[tab_id]["Reverse Energy (kWh)"].config(text=format_value(data["important_dps"]["reverse_energy_total (kWh)"]))
+    def poll_cycle(self):
+        """Queue one acquisition cycle and schedule the next."""
+        if not self.running:
+            return
+        current_time = datetime.now().time()
+        in_window = CONFIG["RECORDING_WINDOW"][0] <= current_time <= CONFIG["RECORDING_WINDOW"][1]
+        # A cycle still waiting on a slow or unreachable cloud is not queued a second time
+        if in_window and (self.poll_job is None or self.poll_job.finished.is_set()):
+            self.poll_job = self.acquisition.submit(FetchJob(
+                self.inverter_targets(), self.on_polled, on_done=lambda job: self.bridge.call(self.coalescer.flush)))
+        self.poll_after = self.root.after(CONFIG["FETCH_INTERVAL"] * 1000, self.poll_cycle)
+
+    def on_polled(self, tab_id, inverter, data):
+        # Acquisition thread: save, then pass the sample to the Tk thread through the bridge
+        now = datetime.now()
+        self.live.record(inverter["sheet"], data, now)
+        if data:
+            try:
+                with metrics.span("store", inverter["sheet"]):
+                    write_to_excel(data, inverter["sheet"])
+            except Exception as e:
+                log.error("Failed to save data for %s: %s", inverter["sheet"], e, extra={"inverter": inverter["sheet"]})
+        self.bridge.post(SampleEvent(tab_id, inverter["sheet"], data, now))
 
-        historical_data = self.graphs[tab_id]["historical_data"]
-        new_row = pd.DataFrame([{
-            "Timestamp": datetime.now(),
+    def refresh_data(self):
+        """Fetch every inverter once in the background, with progress and a Cancel button."""
+        if self.refresh_job is not None and not self.refresh_job.finished.is_set():
+            return  # Already refreshing
+        self.refresh_job = FetchJob(self.inverter_targets(), self.on_refreshed,
+                                    on_done=lambda job: self.bridge.call(self.finish_refresh, job))
+        self.refresh_progress.config(maximum=max(1, self.refresh_job.total), value=0)
+        self.cancel_button.config(state="normal")
+        self.acquisition.submit(self.refresh_job)
+
+    def on_refreshed(self, tab_id, inverter, data):
+        # Acquisition thread: results take the same path as polled samples
+        now = datetime.now()
+        self.live.record(inverter["sheet"], data, now)
+        self.bridge.post(SampleEvent(tab_id, inverter["sheet"], data, now))
+        self.bridge.call(self.show_refresh_progress)
+
+    def show_refresh_progress(self):
+        if self.refresh_job is not None:
+            self.refresh_progress.config(value=self.refresh_job.completed)
+
+    def cancel_refresh(self):
+        if self.refresh_job is not None and not self.refresh_job.finished.is_set():
+            self.refresh_job.cancel()
+            self.cancel_button.config(state="disabled")
+            self.log_message("Refresh cancelled")
+
+    def finish_refresh(self, job):
+        self.coalescer.flush()
+        if job is self.refresh_job:
+            self.refresh_progress.config(value=0)
+            self.cancel_button.config(state="disabled")
+
+    def apply_batch(self, batch):
+        """Apply one poll cycle: every sample goes into history, labels and graphs update once."""
+        samples = {}
+        for result in batch:
+            tab_id = result.tab_id
+            if result.data:
+                samples.setdefault(tab_id, []).append(result)
+                if logs.DEBUG:
+                    log.debug("Data updated for %s", result.sheet, extra={"inverter": result.sheet})
+                self.set_status(tab_id, "green")
+            else:
+                log.warning("Failed to fetch data for %s", result.sheet, extra={"inverter": result.sheet})
+                self.set_status(tab_id, "orange")
+        for tab_id, results in samples.items():
+            with metrics.span("display", self.sheet_names[tab_id]):
+                self.update_display(tab_id, results)
+        self.scheduler.mark_dirty("overview")
+        if samples:
+            self.update_fleet()
+        self.last_update = batch[-1].timestamp.strftime("%H:%M:%S")
+        self.set_label(self.last_update_label, f"Last Update: {self.last_update}")
+
+    def open_diagnostics(self):
+        if self.diagnostics is not None and self.diagnostics.winfo_exists():
+            self.diagnostics.lift()
+            return
+        self.diagnostics = DiagnosticsWindow(
+            self.root, {"Tk bridge": self.bridge.metrics, "UI frames": self.frame_monitor.summary}, profiler=self.profiler)
+
+    def log_message(self, message, level=logging.INFO, inverter=None):
+        log.log(level, message, extra={"inverter": inverter})
+
+    def set_label(self, label, text, **options):
+        """Configure a label only if its text or options differ from what it already shows."""
+        state = (text, tuple(sorted(options.items())))
+        if self.label_state.get(label) != state:
+            self.label_state[label] = state
+            label.config(text=text, **options)
+
+    def set_status(self, tab_id, color):
+        if self.label_state.get(("status", tab_id)) != color:
+            self.label_state[("status", tab_id)] = color
+            self.overview.set_status(tab_id, color)
+            if self.status_lights[tab_id] is not None:  # Unbuilt tabs get the color when built
+                self.status_lights[tab_id].itemconfig("status", fill=color)
+
+    @staticmethod
+    def sample_row(timestamp, data):
+        """One poll result as a history row."""
+        return {
+            "Timestamp": timestamp,
             "Reverse Energy (kWh)": data["important_dps"]["reverse_energy_total (kWh)"],
             "Temp (°C)": data["important_dps"]["temp_current (°C)"],
             "AC Power (W)": data["important_dps"]["ac_power (W)"],
@@ -274,138 +420,109 @@ class InverterGUI:
             "DC Voltage (V)": data["extracted"]["pv1_dc_data"]["dc_voltage"],
             "DC Current (A)": data["extracted"]["pv1_dc_data"]["dc_current"],
             "DC Power (W)": data["extracted"]["pv1_dc_data"]["dc_power"]
-        }])
-        self.graphs[tab_id]["historical_data"] = pd.concat([historical_data, new_row], ignore_index=True)
-        self.update_all_graphs(tab_id)
+        }
 
-    def update_all_graphs(self, tab_id):
-        self.update_power_graph(tab_id, self.graphs[tab_id]["power_select"].get())
-        self.update_voltage_graph(tab_id, self.graphs[tab_id]["voltage_select"].get())
-        self.update_current_graph(tab_id, self.graphs[tab_id]["current_select"].get())
-        self.update_energy_graph(tab_id)
+    def update_display(self, tab_id, results):
+        rows = [self.sample_row(result.timestamp, result.data) for result in results]
+        for row in rows:
+            self.stats[tab_id].update(row["Timestamp"], row)
+            self.fleet.add_sample(tab_id, row["Timestamp"], row)
+            self.overview.set_values(tab_id, row, row["Timestamp"])
+        self.update_day_stats(tab_id)
 
-    def update_power_graph(self, tab_id, option):
-        graph_data = self.graphs[tab_id]
-        historical_data = graph_data["historical_data"]
-        graph_data["power_ax"].clear()
-        range_var = graph_data["range_var"].get()
-        if not historical_data.empty and pd.api.types.is_datetime64_any_dtype(historical_data["Timestamp"]):
-            if range_var == "Last Hour":
-                historical_data = historical_data[historical_data["Timestamp"] > datetime.now() - timedelta(hours=1)]
-            elif range_var == "Last Day":
-                historical_data = historical_data[historical_data["Timestamp"] > datetime.now() - timedelta(days=1)]
-            time_only = historical_data["Timestamp"].dt.strftime("%H:%M:%S").fillna("N/A")
-            if option == "AC" and not historical_data["AC Power (W)"].isna().all():
-                graph_data["power_ax"].plot(time_only, historical_data["AC Power (W)"], 'b-', label="AC Power (W)")
-            elif option == "DC" and not historical_data["DC Power (W)"].isna().all():
-                graph_data["power_ax"].plot(time_only, historical_data["DC Power (W)"], 'g-', label="DC Power (W)")
-            elif option == "Both":
-                if not historical_data["AC Power (W)"].isna().all():
-                    graph_data["power_ax"].plot(time_only, historical_data["AC Power (W)"], 'b-', label="AC Power (W)")
-                if not historical_data["DC Power (W)"].isna().all():
-                    graph_data["power_ax"].plot(time_only, historical_data["DC Power (W)"], 'g-', label="DC Power (W)")
-        graph_data["power_ax"].set_title("Power Trends")
-        graph_data["power_ax"].legend(loc="upper left")
-        graph_data["power_ax"].grid(True)
-        graph_data["power_ax"].tick_params(axis='x', rotation=45)
-        graph_data["power_ax"].xaxis.set_major_locator(MaxNLocator(nbins=6))
-        graph_data["power_ax"].set_xlabel("Time (HH:MM:SS)")
-        graph_data["power_fig"].tight_layout()
-        graph_data["power_canvas"].draw()
-
-    def update_voltage_graph(self, tab_id, option):
-        graph_data = self.graphs[tab_id]
-        historical_data = graph_data["historical_data"]
-        graph_data["voltage_ax"].clear()
-        range_var = graph_data["range_var"].get()
-        if not historical_data.empty and pd.api.types.is_datetime64_any_dtype(historical_data["Timestamp"]):
-            if range_var == "Last Hour":
-                historical_data = historical_data[historical_data["Timestamp"] > datetime.now() - timedelta(hours=1)]
-            elif range_var == "Last Day":
-                historical_data = historical_data[historical_data["Timestamp"] > datetime.now() - timedelta(days=1)]
-            time_only = historical_data["Timestamp"].dt.strftime("%H:%M:%S").fillna("N/A")
-            if option == "AC" and not historical_data["AC Voltage (V)"].isna().all():
-                graph_data["voltage_ax"].plot(time_only, historical_data["AC Voltage (V)"], 'b-', label="AC Voltage (V)")
-            elif option == "DC" and not historical_data["DC Voltage (V)"].isna().all():
-                graph_data["voltage_ax"].plot(time_only, historical_data["DC Voltage (V)"], 'g-', label="DC Voltage (V)")
-            elif option == "Both":
-                if not historical_data["AC Voltage (V)"].isna().all():
-                    graph_data["voltage_ax"].plot(time_only, historical_data["AC Voltage (V)"], 'b-', label="AC Voltage (V)")
-                if not historical_data["DC Voltage (V)"].isna().all():
-                    graph_data["voltage_ax"].plot(time_only, historical_data["DC Voltage (V)"], 'g-', label="DC Voltage (V)")
-        graph_data["voltage_ax"].set_title("Voltage Trends")
-        graph_data["voltage_ax"].legend(loc="upper left")
-        graph_data["voltage_ax"].grid(True)
-        graph_data["voltage_ax"].tick_params(axis='x', rotation=45)
-        graph_data["voltage_ax"].xaxis.set_major_locator(MaxNLocator(nbins=6))
-        graph_data["voltage_ax"].set_xlabel("Time (HH:MM:SS)")
-        graph_data["voltage_fig"].tight_layout()
-        graph_data["voltage_canvas"].draw()
-
-    def update_current_graph(self, tab_id, option):
-        graph_data = self.graphs[tab_id]
-        historical_data = graph_data["historical_data"]
-        graph_data["current_ax"].clear()
-        range_var = graph_data["range_var"].get()
-        if not historical_data.empty and pd.api.types.is_datetime64_any_dtype(historical_data["Timestamp"]):
-            if range_var == "Last Hour":
-                historical_data = historical_data[historical_data["Timestamp"] > datetime.now() - timedelta(hours=1)]
-            elif range_var == "Last Day":
-                historical_data = historical_data[historical_data["Timestamp"] > datetime.now() - timedelta(days=1)]
-            time_only = historical_data["Timestamp"].dt.strftime("%H:%M:%S").fillna("N/A")
-            if option == "AC" and not historical_data["AC Current (A)"].isna().all():
-                graph_data["current_ax"].plot(time_only, historical_data["AC Current (A)"], 'b-', label="AC Current (A)")
-            elif option == "DC" and not historical_data["DC Current (A)"].isna().all():
-                graph_data["current_ax"].plot(time_only, historical_data["DC Current (A)"], 'g-', label="DC Current (A)")
-            elif option == "Both":
-                if not historical_data["AC Current (A)"].isna().all():
-                    graph_data["current_ax"].plot(time_only, historical_data["AC Current (A)"], 'b-', label="AC Current (A)")
-                if not historical_data["DC Current (A)"].isna().all():
-                    graph_data["current_ax"].plot(time_only, historical_data["DC Current (A)"], 'g-', label="DC Current (A)")
-        graph_data["current_ax"].set_title("Current Trends")
-        graph_data["current_ax"].legend(loc="upper left")
-        graph_data["current_ax"].grid(True)
-        graph_data["current_ax"].tick_params(axis='x', rotation=45)
-        graph_data["current_ax"].xaxis.set_major_locator(MaxNLocator(nbins=6))
-        graph_data["current_ax"].set_xlabel("Time (HH:MM:SS)")
-        graph_data["current_fig"].tight_layout()
-        graph_data["current_canvas"].draw()
-
-    def update_energy_graph(self, tab_id):
+        # Labels only show the newest sample of the batch
+        self.latest_data[tab_id] = results[-1].data
+        self.show_values(tab_id)
+
+        historical_data = self.graphs[tab_id]["historical_data"]
+        self.graphs[tab_id]["historical_data"] = pd.concat([historical_data, pd.DataFrame(rows)], ignore_index=True)
+        self.scheduler.mark_dirty(tab_id)
+
+    def show_values(self, tab_id):
+        def format_value(val):
+            return f"{val:.2f}" if isinstance(val, (int, float)) else "N/A"
+        data = self.latest_data.get(tab_id)
+        if tab_id not in self.built or data is None:
+            return
+        values = self.values[tab_id]
+        self.set_label(values["AC Power (W)"], format_value(data["important_dps"]["ac_power (W)"]))
+        self.set_label(values["AC Voltage (V)"], format_value(data["extracted"]["phase_a"]["ac_voltage"]))
+        self.set_label(values["Frequency (Hz)"], format_value(data["extracted"]["phase_a"]["frequency"]))
+        self.set_label(values["DC Power (W)"], format_value(data["extracted"]["pv1_dc_data"]["dc_power"]))
+        self.set_label(values["DC Voltage (V)"], format_value(data["extracted"]["pv1_dc_data"]["dc_voltage"]))
+        self.set_label(values["DC Current (A)"], format_value(data["extracted"]["pv1_dc_data"]["dc_current"]))
+        temp = data["important_dps"]["temp_current (°C)"]
+        self.set_label(values["Temperature (°C)"], format_value(temp),
+                       foreground="red" if isinstance(temp, (int, float)) and temp > 50 else "black")
+        self.set_label(values["Reverse Energy (kWh)"], format_value(data["important_dps"]["reverse_energy_total (kWh)"]))
+
+    def add_history_chunk(self, tab_id, frame):
+        """Merge one archived day into a tab; it may be older than what is already shown."""
+        frame = frame[frame["Timestamp"] < self.started_at]  # Later rows already arrived live
+        if frame.empty:
+            return
         graph_data = self.graphs[tab_id]
         historical_data = graph_data["historical_data"]
-        graph_data["energy_ax"].clear()
-        range_var = graph_data["range_var"].get()
-        if not historical_data.empty and pd.api.types.is_datetime64_any_dtype(historical_data["Timestamp"]):
-            if range_var == "Last Hour":
-                historical_data = historical_data[historical_data["Timestamp"] > datetime.now() - timedelta(hours=1)]
-            elif range_var == "Last Day":
-                historical_data = historical_data[historical_data["Timestamp"] > datetime.now() - timedelta(days=1)]
-            time_only = historical_data["Timestamp"].dt.strftime("%H:%M:%S").fillna("N/A")
-            if not historical_data["Reverse Energy (kWh)"].isna().all():
-                graph_data["energy_ax"].plot(time_only, historical_data["Reverse Energy (kWh)"], 'm-', label="Energy (kWh)")
-        graph_data["energy_ax"].set_title("Energy Trends")
-        graph_data["energy_ax"].legend(loc="upper left")
-        graph_data["energy_ax"].grid(True)
-        graph_data["energy_ax"].tick_params(axis='x', rotation=45)
-        graph_data["energy_ax"].xaxis.set_major_locator(MaxNLocator(nbins=6))
-        graph_data["energy_ax"].set_xlabel("Time (HH:MM:SS)")
-        graph_data["energy_fig"].tight_layout()
-        graph_data["energy_canvas"].draw()
+        if historical_data.empty:
+            graph_data["historical_data"] = frame
+        else:
+            merged = pd.concat([frame, historical_data], ignore_index=True)
+            graph_data["historical_data"] = merged.sort_values("Timestamp", kind="stable", ignore_index=True)
+        self.stats[tab_id].seed(frame)
+        self.fleet.add_frame(tab_id, frame)
+        self.overview.backfill(tab_id, frame["AC Power (W)"].tail(self.overview.sparks[tab_id].maxlen).tolist())
+        self.update_day_stats(tab_id)
+        self.scheduler.mark_dirty(tab_id)
+        self.scheduler.mark_dirty("fleet")
+        self.scheduler.mark_dirty("overview")
+
+    def update_day_stats(self, tab_id):
+        if tab_id not in self.built:
+            return
+        stats = self.stats[tab_id]
+        values = self.values[tab_id]
+        ac_today = stats.today["AC Power (W)"]
+        self.set_label(values["Peak Power Today (W)"], f"{stats.peak_power:.2f}" if stats.peak_power is not None else "N/A")
+        self.set_label(values["Peak Time"], stats.peak_time.strftime("%H:%M:%S") if stats.peak_time else "N/A")
+        self.set_label(values["Energy Today (kWh)"], f"{stats.energy_today:.2f}")
+        self.set_label(values["Avg AC Power Today (W)"], f"{ac_today.mean:.2f}" if ac_today.count else "N/A")
+
+    def update_fleet(self):
+        def format_value(val):
+            return f"{val:.2f}" if isinstance(val, (int, float)) else "N/A"
+        latest = self.fleet.latest()
+        self.set_label(self.fleet_values["Total AC Power (W)"], format_value(latest["AC Power (W)"]))
+        self.set_label(self.fleet_values["Total DC Power (W)"], format_value(latest["DC Power (W)"]))
+        self.set_label(self.fleet_values["Fleet Energy Counter (kWh)"], format_value(latest["Reverse Energy (kWh)"]))
+        self.set_label(self.fleet_values["Fleet Energy Today (kWh)"],
+                       format_value(sum(stats.energy_today for stats in self.stats.values())))
+        for share in self.fleet.shares("AC Power (W)"):
+            tab_id = share["inverter"]
+            row = (format_value(share["value"]),
+                   format_value(share["share"] * 100) if share["share"] is not None else "N/A",
+                   format_value(self.stats[tab_id].energy_today))
+            if self.label_state.get(("share", tab_id)) != row:
+                self.label_state[("share", tab_id)] = row
+                self.fleet_share_tree.item(tab_id, values=row)
+        self.scheduler.mark_dirty("fleet")
 
     def start_monitoring(self):
         if not self.running:
             self.running = True
-            self.thread = threading.Thread(target=self.update_data, daemon=True)
-            self.thread.start()
-            self.log.insert(tk.END, f"[{datetime.now()}] Monitoring started\n")
+            self.poll_cycle()
+            self.log_message("Monitoring started")
             self.start_button.config(bg="green")
             self.stop_button.config(bg="gray")
 
     def stop_monitoring(self):
         if self.running:
             self.running = False
-            self.log.insert(tk.END, f"[{datetime.now()}] Monitoring stopped\n")
+            if self.poll_after is not None:
+                self.root.after_cancel(self.poll_after)
+                self.poll_after = None
+            if self.poll_job is not None:
+                self.poll_job.cancel()
+            self.log_message("Monitoring stopped")
             self.start_button.config(bg="gray")
             self.stop_button.config(bg="red")
 
@@ -471,7 +588,6 @@ class InverterGUI:
             inverter_entries, save_dir_entry.get())).pack(pady=10)
 
     def save_settings(self, api_key, api_secret, region, start_time, stop_time, interval, inverter_entries, save_dir):
-        global CONFIG, CLOUD
         try:
             start = datetime.strptime(start_time, "%H:%M").time()
             stop = datetime.strptime(stop_time, "%H:%M").time()
@@ -501,12 +617,14 @@ class InverterGUI:
         with open(CONFIG_FILE, 'w') as f:
             json.dump(config_to_save, f, indent=4)
 
-        CLOUD = tinytuya.Cloud(
-            apiRegion=CONFIG["REGION"],
-            apiKey=CONFIG["API_KEY"],
-            apiSecret=CONFIG["API_SECRET"],
-            apiDeviceID=CONFIG["INVERTERS"][0]["device_id"]
-        )
-        self.log.insert(tk.END, f"[{datetime.now()}] Configuration updated\n")
+        self.log_message("Configuration updated")
+        # Creating the client fetches a token, so it is rebuilt on the acquisition thread;
+        # the refresh below is queued behind it and uses the new credentials
+        reset_cloud()
+        self.acquisition.call(get_cloud, on_done=lambda cloud, error: self.bridge.call(self.cloud_connected, error))
         if self.running:
-            self.refresh_data()
\ No newline at end of file
+            self.refresh_data()
+
+    def cloud_connected(self, error):
+        if error is not None:
+            self.log_message(f"Could not connect to the Tuya cloud: {error}", logging.ERROR)
\ No newline at end of file
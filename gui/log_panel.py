@@ -0,0 +1,86 @@
+import logging
+import tkinter as tk
+from datetime import datetime
+from tkinter import ttk
+
+from inverter_monitoring.gui.bridge import Waker
+
+
+class LogPanel(ttk.Frame):
+    """Read-only log view fed from the logging ring buffer.
+
+    New records wake the panel (see bridge.Waker), which pulls everything new and adds it
+    with one Text.insert; the widget never holds more than max_lines lines. Changing the level or inverter filter
+    re-renders from the ring buffer, which is bounded as well.
+    """
+
+    LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR")
+
+    def __init__(self, parent, ring, inverters=(), max_lines=1000, height=5):
+        super().__init__(parent)
+        self.ring = ring
+        self.max_lines = max_lines
+        self.last_seq = 0
+        self.level_var = tk.StringVar(value="INFO")
+        self.inverter_var = tk.StringVar(value="All")
+
+        filters = ttk.Frame(self)
+        filters.grid(row=0, column=0, columnspan=2, sticky="w")
+        ttk.Label(filters, text="Level:").grid(row=0, column=0, padx=5)
+        ttk.OptionMenu(filters, self.level_var, "INFO", *self.LEVELS,
+                       command=lambda _: self.rebuild()).grid(row=0, column=1)
+        ttk.Label(filters, text="Inverter:").grid(row=0, column=2, padx=5)
+        ttk.OptionMenu(filters, self.inverter_var, "All", "All", *inverters,
+                       command=lambda _: self.rebuild()).grid(row=0, column=3)
+
+        self.text = tk.Text(self, height=height, width=80, font=("Arial", 10), state="disabled")
+        scrollbar = ttk.Scrollbar(self, command=self.text.yview)
+        self.text.config(yscrollcommand=scrollbar.set)
+        self.text.grid(row=1, column=0, sticky="ew")
+        scrollbar.grid(row=1, column=1, sticky="ns")
+        self.columnconfigure(0, weight=1)
+        self.waker = Waker(self, self._poll)
+        self.ring.listeners.append(self.waker.wake)
+        self.waker.wake()
+
+    def matches(self, record):
+        if record.levelno < logging.getLevelName(self.level_var.get()):
+            return False
+        inverter = self.inverter_var.get()
+        return inverter == "All" or getattr(record, "inverter", None) == inverter
+
+    @staticmethod
+    def format(record):
+        return f"[{datetime.fromtimestamp(record.created):%Y-%m-%d %H:%M:%S}] {record.levelname}: {record.getMessage()}\n"
+
+    def _poll(self):
+        entries = self.ring.since(self.last_seq)
+        if entries:
+            self.last_seq = entries[-1][0]
+            self.append([record for _, record in entries if self.matches(record)])
+
+    def append(self, records):
+        if not records:
+            return
+        at_end = self.text.yview()[1] >= 1.0  # Only follow new lines if the user has not scrolled up
+        self.text.config(state="normal")
+        self.text.insert(tk.END, "".join(self.format(record) for record in records[-self.max_lines:]))
+        excess = int(self.text.index("end-1c").split(".")[0]) - 1 - self.max_lines
+        if excess > 0:
+            self.text.delete("1.0", f"{excess + 1}.0")
+        self.text.config(state="disabled")
+        if at_end:
+            self.text.see(tk.END)
+
+    def rebuild(self):
+        entries = self.ring.since(0)
+        self.last_seq = entries[-1][0] if entries else self.last_seq
+        self.text.config(state="normal")
+        self.text.delete("1.0", tk.END)
+        self.text.config(state="disabled")
+        self.append([record for _, record in entries if self.matches(record)])
+
+    def destroy(self):
+        self.ring.listeners.remove(self.waker.wake)
+        self.waker.close()
+        super().destroy()
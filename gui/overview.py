@@ -0,0 +1,163 @@
+import tkinter as tk
+from collections import deque
+from tkinter import ttk
+
+# (heading, width in pixels, key into the row's values); the sparkline takes the rest
+COLUMNS = [
+    ("", 24, None),
+    ("Inverter", 140, "sheet"),
+    ("AC Power (W)", 100, "AC Power (W)"),
+    ("DC Power (W)", 100, "DC Power (W)"),
+    ("AC Voltage (V)", 100, "AC Voltage (V)"),
+    ("Temp (°C)", 80, "Temp (°C)"),
+    ("Energy (kWh)", 110, "Reverse Energy (kWh)"),
+    ("Updated", 80, "updated"),
+]
+SPARK_COLUMN = "AC Power (W)"
+SPARK_MIN_WIDTH = 120
+
+
+class FleetOverview(ttk.Frame):
+    """One row per inverter on a Tk canvas, drawing only the rows that are on screen.
+
+    A fixed pool of canvas items (one slot per visible row) is re-pointed at whichever
+    rows are in view when scrolling or resizing, so the item count depends on the window
+    height, not the fleet size. Values are stored with set_values() and set_status() and
+    the visible slots are repainted by redraw(), which the caller schedules (the
+    RenderScheduler, so nothing is drawn while the page is hidden). Each row ends in a
+    sparkline of the last spark_points AC power samples, a plain canvas line. Clicking a
+    row calls on_open(key).
+    """
+
+    def __init__(self, parent, rows, on_open, row_height=24, spark_points=60):
+        super().__init__(parent)
+        self.keys = [key for key, _ in rows]
+        self.rows = {key: {"sheet": sheet} for key, sheet in rows}
+        self.status = {key: "grey" for key in self.keys}
+        self.sparks = {key: deque(maxlen=spark_points) for key in self.keys}
+        self.on_open = on_open
+        self.row_height = row_height
+        self.top = 0  # First visible row
+        self.slots = []  # Canvas item ids per visible row: (background, light, [texts], spark)
+
+        self.header = tk.Canvas(self, height=row_height, highlightthickness=0, bg="#e8e8e8")
+        self.header.grid(row=0, column=0, sticky="ew")
+        self.canvas = tk.Canvas(self, highlightthickness=0, bg="white")
+        self.canvas.grid(row=1, column=0, sticky="nsew")
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.scrollbar.grid(row=1, column=1, sticky="ns")
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(1, weight=1)
+
+        x = 0
+        for heading, width, _ in COLUMNS:
+            self.header.create_text(x + 4, row_height // 2, text=heading, anchor="w", font=("Arial", 9, "bold"))
+            x += width
+        self.spark_x = x
+        self.header.create_text(x + 4, row_height // 2, text=f"{SPARK_COLUMN}, recent", anchor="w",
+                                font=("Arial", 9, "bold"))
+
+        self.canvas.bind("<Configure>", lambda event: self.redraw())
+        self.canvas.bind("<Button-1>", self.on_click)
+        self.canvas.bind("<MouseWheel>", lambda event: self.scroll(-1 if event.delta > 0 else 1, "units"))
+        self.canvas.bind("<Button-4>", lambda event: self.scroll(-1, "units"))
+        self.canvas.bind("<Button-5>", lambda event: self.scroll(1, "units"))
+
+    def set_values(self, key, values, updated=None):
+        """Store a row's newest readings (a history row dict); repainted on the next redraw()."""
+        row = self.rows[key]
+        row.update(values)
+        if updated is not None:
+            row["updated"] = updated.strftime("%H:%M:%S")
+        value = values.get(SPARK_COLUMN)
+        if isinstance(value, (int, float)):
+            self.sparks[key].append(value)
+
+    def backfill(self, key, values):
+        """Fill a sparkline that has no live samples yet, from archived values (oldest first)."""
+        spark = self.sparks[key]
+        if not spark:
+            spark.extend(value for value in values if isinstance(value, (int, float)) and value == value)
+
+    def set_status(self, key, color):
+        self.status[key] = color
+
+    def visible_rows(self):
+        return max(1, self.canvas.winfo_height() // self.row_height + 1)
+
+    def yview(self, action, amount, unit=None):
+        if action == "moveto":
+            self.top = int(float(amount) * len(self.keys))
+            self.redraw()
+        else:
+            self.scroll(int(amount), unit)
+
+    def scroll(self, amount, unit):
+        step = self.visible_rows() - 1 if unit == "pages" else 1
+        self.top += amount * max(1, step)
+        self.redraw()
+
+    def on_click(self, event):
+        index = self.top + event.y // self.row_height
+        if 0 <= index < len(self.keys):
+            self.on_open(self.keys[index])
+
+    def _slot(self, i):
+        # Items for visible row i, created the first time the view is that tall, then reused
+        while len(self.slots) <= i:
+            y = len(self.slots) * self.row_height
+            h = self.row_height
+            background = self.canvas.create_rectangle(0, y, 0, y + h, outline="", fill="white")
+            light = self.canvas.create_oval(6, y + 6, 6 + h - 12, y + h - 6, outline="black")
+            texts, x = [], COLUMNS[0][1]
+            for _, width, _ in COLUMNS[1:]:
+                texts.append(self.canvas.create_text(x + 4, y + h // 2, anchor="w", font=("Arial", 9)))
+                x += width
+            spark = self.canvas.create_line(0, 0, 0, 0, fill="blue", state="hidden")
+            self.slots.append((background, light, texts, spark))
+        return self.slots[i]
+
+    def redraw(self):
+        """Repaint the rows in view; costs the same for 5 inverters or 500."""
+        count = self.visible_rows()
+        self.top = max(0, min(self.top, len(self.keys) - count + 1))
+        width = max(self.canvas.winfo_width(), self.spark_x + SPARK_MIN_WIDTH)
+        for i in range(count):
+            background, light, texts, spark = self._slot(i)
+            index = self.top + i
+            if index >= len(self.keys):
+                for item in (background, light, spark, *texts):
+                    self.canvas.itemconfigure(item, state="hidden")
+                continue
+            key = self.keys[index]
+            row = self.rows[key]
+            y = i * self.row_height
+            self.canvas.coords(background, 0, y, width, y + self.row_height)
+            self.canvas.itemconfigure(background, state="normal", fill="#f4f4f4" if index % 2 else "white")
+            self.canvas.itemconfigure(light, state="normal", fill=self.status[key])
+            for item, (_, _, field) in zip(texts, COLUMNS[1:]):
+                value = row.get(field)
+                text = f"{value:.2f}" if isinstance(value, float) else ("N/A" if value is None else str(value))
+                self.canvas.itemconfigure(item, state="normal", text=text)
+            self.draw_spark(spark, self.sparks[key], y, width)
+        for background, light, texts, spark in self.slots[count:]:
+            for item in (background, light, spark, *texts):
+                self.canvas.itemconfigure(item, state="hidden")
+        total = max(1, len(self.keys))
+        self.scrollbar.set(self.top / total, min(1.0, (self.top + count - 1) / total))
+
+    def draw_spark(self, item, values, y, width):
+        if len(values) < 2:
+            self.canvas.itemconfigure(item, state="hidden")
+            return
+        left, right = self.spark_x + 4, width - 8
+        top, bottom = y + 4, y + self.row_height - 4
+        low, high = min(values), max(values)
+        span = (high - low) or 1.0
+        step = (right - left) / (values.maxlen - 1)
+        start = left + (values.maxlen - len(values)) * step  # Right-aligned, so the newest is at the edge
+        coords = []
+        for n, value in enumerate(values):
+            coords += [start + n * step, bottom - (value - low) / span * (bottom - top)]
+        self.canvas.coords(item, *coords)
+        self.canvas.itemconfigure(item, state="normal")
@@ -0,0 +1,54 @@
+class RenderScheduler:
+    """Coalesces graph redraws and only renders the notebook tab that is on screen.
+
+    Data and settings changes call mark_dirty(). At most one render pass runs per
+    frame budget, and it only touches the selected tab. Hidden tabs stay dirty until
+    the user switches to them, so an idle dashboard schedules nothing at all.
+    """
+
+    def __init__(self, root, notebook, frame_ms=100):
+        self.root = root
+        self.notebook = notebook
+        self.frame_ms = frame_ms
+        self.frames = {}   # key -> notebook tab frame
+        self.renderers = {}  # key -> callable that redraws that tab
+        self.dirty = set()
+        self._pending = None
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed, add="+")
+
+    def register(self, key, frame, render):
+        self.frames[key] = frame
+        self.renderers[key] = render
+        self.dirty.add(key)
+
+    def mark_dirty(self, key):
+        self.dirty.add(key)
+        if key == self.visible_key():
+            self._schedule()
+
+    def mark_all_dirty(self):
+        self.dirty.update(self.frames)
+        self._schedule()
+
+    def visible_key(self):
+        selected = self.notebook.select()
+        for key, frame in self.frames.items():
+            if str(frame) == selected:
+                return key
+        return None
+
+    def _schedule(self):
+        if self._pending is None:
+            self._pending = self.root.after(self.frame_ms, self.flush)
+
+    def flush(self):
+        self._pending = None
+        key = self.visible_key()
+        if key in self.dirty:
+            self.dirty.discard(key)
+            self.renderers[key]()
+
+    def _on_tab_changed(self, event):
+        # Bring a hidden tab up to date lazily, now that it is being shown
+        if self.visible_key() in self.dirty:
+            self._schedule()
@@ -1,9 +1,8 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from inverter_monitoring.config import CONFIG, CONFIG_FILE, CLOUD
+from inverter_monitoring.config import CONFIG, CONFIG_FILE, reset_cloud
 import json
 from datetime import datetime
-import tinytuya
 
 def open_settings(self):
     settings_win = tk.Toplevel(self.root)
@@ -67,7 +66,6 @@ def open_settings(self):
         inverter_entries, save_dir_entry.get())).pack(pady=10)
 
 def save_settings(self, api_key, api_secret, region, start_time, stop_time, interval, inverter_entries, save_dir):
-    global CONFIG, CLOUD
     try:
         start = datetime.strptime(start_time, "%H:%M").time()
         stop = datetime.strptime(stop_time, "%H:%M").time()
@@ -97,12 +95,7 @@ def save_settings(self, api_key, api_secret, region, start_time, stop_time, inte
     with open(CONFIG_FILE, 'w') as f:
         json.dump(config_to_save, f, indent=4)
 
-    CLOUD = tinytuya.Cloud(
-        apiRegion=CONFIG["REGION"],
-        apiKey=CONFIG["API_KEY"],
-        apiSecret=CONFIG["API_SECRET"],
-        apiDeviceID=CONFIG["INVERTERS"][0]["device_id"]
-    )
-    self.log.insert(tk.END, f"[{datetime.now()}] Configuration updated\n")
+    reset_cloud()  # Recreated with the new credentials on the next fetch
+    self.log_message("Configuration updated")
     if self.running:
         self.refresh_data()
\ No newline at end of file
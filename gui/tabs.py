@@ -1,15 +1,25 @@
-import sys
 from tkinter import ttk
 import tkinter as tk
 from tkinter import messagebox
-from .graphs import update_all_graphs
-import matplotlib.pyplot as plt
+from .graphs import GRAPH_SPECS, plot_columns
+from matplotlib.figure import Figure
+import matplotlib.dates as mdates
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from inverter_monitoring.file_ops import load_historical_data  # Absolute import
+import pandas as pd
 from inverter_monitoring.config import CONFIG
-from datetime import datetime
+from inverter_monitoring.logs import get_logger
+from datetime import datetime, timedelta
 
-print(f"sys.path in tabs.py: {sys.path}")  # Debug print to check module search path
+log = get_logger("gui.tabs")
+
+DAY_STAT_LABELS = ["Peak Power Today (W)", "Peak Time", "Energy Today (kWh)", "Avg AC Power Today (W)"]
+# Ranges longer than the in-memory history, queried from the archive through self.history
+ARCHIVE_RANGES = {"Last 7 Days": timedelta(days=7), "Last 30 Days": timedelta(days=30)}
+ZOOM_STEP = 1.5             # Scroll-wheel zoom factor
+MIN_VIEW_SECONDS = 60       # Narrowest zoom
+VIEW_QUERY_DELAY_MS = 150   # Debounce for archive queries while scrolling or panning
+VIEW_POLL_MS = 50
+FLEET_LABELS = ["Total AC Power (W)", "Total DC Power (W)", "Fleet Energy Counter (kWh)", "Fleet Energy Today (kWh)"]
 
 class InverterTab:
     @staticmethod
@@ -25,7 +35,15 @@ class InverterTab:
             value_label = ttk.Label(data_frame, text="N/A", font=("Arial", 10))
             value_label.grid(row=i, column=1, sticky="w", padx=5)
             self.values[tab_id][label] = value_label
-        
+
+        # Day statistics, fed from the streaming accumulators in self.stats
+        ttk.Separator(data_frame, orient="horizontal").grid(row=len(labels), column=0, columnspan=2, sticky="ew", pady=5)
+        for i, label in enumerate(DAY_STAT_LABELS, start=len(labels) + 1):
+            ttk.Label(data_frame, text=label, font=("Arial", 10)).grid(row=i, column=0, sticky="w", padx=5)
+            value_label = ttk.Label(data_frame, text="N/A", font=("Arial", 10))
+            value_label.grid(row=i, column=1, sticky="w", padx=5)
+            self.values[tab_id][label] = value_label
+
         status_frame = ttk.Frame(data_frame)
         status_frame.grid(row=0, column=2, rowspan=len(labels), padx=5)
         ttk.Label(status_frame, text="Status", font=("Arial", 10)).grid(row=0, column=0)
@@ -33,121 +51,268 @@ class InverterTab:
         status_canvas.grid(row=1, column=0)
         status_canvas.create_oval(2, 2, 18, 18, fill="grey" if device_id else "lightgrey", tags="status")
         self.status_lights[tab_id] = status_canvas
-        
-        if not device_id:
-            self.notebook.tab(tab, state="disabled")
 
-        # Trends Frame (only graph selection dropdowns)
+        # Trends Frame: one figure, four trends on a shared time axis
         graphs_frame = ttk.LabelFrame(tab, text="Trends", padding="0")  # No padding
         graphs_frame.grid(row=0, column=1, padx=0, pady=0, sticky="nsew")  # No padding
         tab.columnconfigure(1, weight=1)
         tab.rowconfigure(0, weight=1)
-        graphs_frame.columnconfigure((0, 1), weight=1)
-        graphs_frame.rowconfigure((0, 1), weight=1)  # Adjust for only graph frames
+        graphs_frame.columnconfigure(0, weight=1)
+        graphs_frame.rowconfigure(1, weight=1)
 
-        initial_width, initial_height = 8, 5
-
-        # Power Graph
-        power_frame = ttk.Frame(graphs_frame, padding="0")  # No frame padding
-        power_frame.grid(row=0, column=0, padx=0, pady=0, sticky="nsew")  # No padding
+        select_frame = ttk.Frame(graphs_frame, padding="0")
+        select_frame.grid(row=0, column=0, sticky="ew")
+        range_choice = tk.StringVar(value="All")
+        ttk.Label(select_frame, text="Range").pack(side="left", padx=(5, 0))
+        ttk.OptionMenu(select_frame, range_choice, "All", "All", "Last Hour", "Last Day", "Last 7 Days", "Last 30 Days", "Specific Hour",
+                       command=lambda val: self.handle_range_selection(tab_id, val)).pack(side="left")
         power_select = tk.StringVar(value="Both")
-        ttk.OptionMenu(power_frame, power_select, "Both", "AC", "DC", "Both", 
-                       command=lambda val: self.update_power_graph(tab_id, val)).pack(fill="x", padx=0, pady=0)  # No padding
-        # Ensure a completely clean figure with a single subplot, with balanced margins
-        power_fig = plt.Figure(figsize=(initial_width, initial_height), facecolor='white', dpi=100)  # Explicit DPI
-        if hasattr(power_fig, 'axes'):
-            for ax in power_fig.axes:
-                ax.remove()  # Remove any default axes
-        power_fig.clf()  # Explicitly clear any default subplots
-        power_ax = power_fig.add_subplot(111)  # Single subplot
-        power_fig.subplots_adjust(left=0.12, right=0.88, bottom=0.15, top=0.88)  # Keep current margins
-        # Removed tight_layout to eliminate potential warnings, relying on subplots_adjust for layout
-        # power_fig.tight_layout(pad=2.0)  # Commented out to prevent warnings
-        # Reset and recreate canvas with resize event handling
-        if hasattr(self, 'graphs') and tab_id in self.graphs and self.graphs[tab_id].get("power_canvas"):
-            self.graphs[tab_id]["power_canvas"].get_tk_widget().destroy()  # Destroy old canvas
-        power_canvas = FigureCanvasTkAgg(power_fig, master=power_frame)
-        power_canvas.mpl_connect('resize_event', lambda event: power_canvas.draw())  # Handle resize events
-        power_canvas.draw()  # Explicitly draw the figure after setup
-        power_widget = power_canvas.get_tk_widget()
-        power_widget.pack(fill="both", expand=True, padx=0, pady=0)  # Tight packing, no padding
-
-        # Voltage Graph
-        voltage_frame = ttk.Frame(graphs_frame, padding="0")
-        voltage_frame.grid(row=0, column=1, padx=0, pady=0, sticky="nsew")
         voltage_select = tk.StringVar(value="Both")
-        ttk.OptionMenu(voltage_frame, voltage_select, "Both", "AC", "DC", "Both", 
-                       command=lambda val: self.update_voltage_graph(tab_id, val)).pack(fill="x", padx=0, pady=0)
-        voltage_fig = plt.Figure(figsize=(initial_width, initial_height), facecolor='white', dpi=100)
-        if hasattr(voltage_fig, 'axes'):
-            for ax in voltage_fig.axes:
-                ax.remove()
-        voltage_fig.clf()
-        voltage_ax = voltage_fig.add_subplot(111)  # Single subplot
-        voltage_fig.subplots_adjust(left=0.12, right=0.88, bottom=0.15, top=0.88)  # Keep current margins
-        # Removed tight_layout to eliminate potential warnings, relying on subplots_adjust for layout
-        # voltage_fig.tight_layout(pad=2.0)  # Commented out to prevent warnings
-        if hasattr(self, 'graphs') and tab_id in self.graphs and self.graphs[tab_id].get("voltage_canvas"):
-            self.graphs[tab_id]["voltage_canvas"].get_tk_widget().destroy()
-        voltage_canvas = FigureCanvasTkAgg(voltage_fig, master=voltage_frame)
-        voltage_canvas.mpl_connect('resize_event', lambda event: voltage_canvas.draw())
-        voltage_canvas.draw()  # Explicitly draw the figure
-        voltage_widget = voltage_canvas.get_tk_widget()
-        voltage_widget.pack(fill="both", expand=True, padx=0, pady=0)
-
-        # Current Graph
-        current_frame = ttk.Frame(graphs_frame, padding="0")
-        current_frame.grid(row=1, column=0, padx=0, pady=0, sticky="nsew")
         current_select = tk.StringVar(value="Both")
-        ttk.OptionMenu(current_frame, current_select, "Both", "AC", "DC", "Both", 
-                       command=lambda val: self.update_current_graph(tab_id, val)).pack(fill="x", padx=0, pady=0)
-        current_fig = plt.Figure(figsize=(initial_width, initial_height), facecolor='white', dpi=100)
-        if hasattr(current_fig, 'axes'):
-            for ax in current_fig.axes:
-                ax.remove()
-        current_fig.clf()
-        current_ax = current_fig.add_subplot(111)  # Single subplot
-        current_fig.subplots_adjust(left=0.12, right=0.88, bottom=0.15, top=0.88)  # Keep current margins
-        # Removed tight_layout to eliminate potential warnings, relying on subplots_adjust for layout
-        # current_fig.tight_layout(pad=2.0)  # Commented out to prevent warnings
-        if hasattr(self, 'graphs') and tab_id in self.graphs and self.graphs[tab_id].get("current_canvas"):
-            self.graphs[tab_id]["current_canvas"].get_tk_widget().destroy()
-        current_canvas = FigureCanvasTkAgg(current_fig, master=current_frame)
-        current_canvas.mpl_connect('resize_event', lambda event: current_canvas.draw())
-        current_canvas.draw()  # Explicitly draw the figure
-        current_widget = current_canvas.get_tk_widget()
-        current_widget.pack(fill="both", expand=True, padx=0, pady=0)
-
-        # Energy Graph
-        energy_frame = ttk.Frame(graphs_frame, padding="0")
-        energy_frame.grid(row=1, column=1, padx=0, pady=0, sticky="nsew")
-        ttk.Label(energy_frame, text="Reverse Energy").pack(fill="x", padx=0, pady=0)
-        energy_fig = plt.Figure(figsize=(initial_width, initial_height), facecolor='white', dpi=100)
-        if hasattr(energy_fig, 'axes'):
-            for ax in energy_fig.axes:
-                ax.remove()
-        energy_fig.clf()
-        energy_ax = energy_fig.add_subplot(111)  # Single subplot
-        energy_fig.subplots_adjust(left=0.12, right=0.88, bottom=0.15, top=0.88)  # Keep current margins
-        # Removed tight_layout to eliminate potential warnings, relying on subplots_adjust for layout
-        # energy_fig.tight_layout(pad=2.0)  # Commented out to prevent warnings
-        if hasattr(self, 'graphs') and tab_id in self.graphs and self.graphs[tab_id].get("energy_canvas"):
-            self.graphs[tab_id]["energy_canvas"].get_tk_widget().destroy()
-        energy_canvas = FigureCanvasTkAgg(energy_fig, master=energy_frame)
-        energy_canvas.mpl_connect('resize_event', lambda event: energy_canvas.draw())
-        energy_canvas.draw()  # Explicitly draw the figure
-        energy_widget = energy_canvas.get_tk_widget()
-        energy_widget.pack(fill="both", expand=True, padx=0, pady=0)
-
-        historical_data = load_historical_data(sheet_name)
+        for text, select, update in (("Power", power_select, self.update_power_graph),
+                                     ("Voltage", voltage_select, self.update_voltage_graph),
+                                     ("Current", current_select, self.update_current_graph)):
+            ttk.Label(select_frame, text=text).pack(side="left", padx=(10, 0))
+            ttk.OptionMenu(select_frame, select, "Both", "AC", "DC", "Both",
+                           command=lambda val, update=update: update(tab_id, val)).pack(side="left")
+
+        # Rebuilding a tab hands the old figure back to the pool before taking one out again
+        release_tab_figure(self, tab_id)
+        if getattr(self, "renderer", None) is not None:
+            # Process render mode: a worker draws the trends and Tk only shows the bitmap
+            image_label = tk.Label(graphs_frame, bg="white")
+            image_label.grid(row=1, column=0, sticky="nsew", padx=0, pady=0)
+        else:
+            image_label = None
+
+        # Starts empty; the archive is merged in chunk by chunk by the history loader
+        historical_data = self.graphs[tab_id]["historical_data"] if tab_id in self.graphs else pd.DataFrame()
         self.graphs[tab_id] = {
-            "power_fig": power_fig, "power_ax": power_ax, "power_canvas": power_canvas, "power_select": power_select,
-            "voltage_fig": voltage_fig, "voltage_ax": voltage_ax, "voltage_canvas": voltage_canvas, "voltage_select": voltage_select,
-            "current_fig": current_fig, "current_ax": current_ax, "current_canvas": current_canvas, "current_select": current_select,
-            "energy_fig": energy_fig, "energy_ax": energy_ax, "energy_canvas": energy_canvas,
-            "range_var": tk.StringVar(value="All"),  # Keep range_var for graph updates, controlled by menu
+            "fig": None, "canvas": None, "image_label": image_label, "graphs_frame": graphs_frame,
+            "power_select": power_select, "voltage_select": voltage_select, "current_select": current_select,
+            "range_var": tk.StringVar(value="All"),  # Active range for filter_range; range_choice is only the menu
+            "range_choice": range_choice,
+            "sheet": sheet_name,
+            "view": None,  # (start, end) while zoomed or showing an archive range
             "historical_data": historical_data
         }
+        attach_tab_figure(self, tab_id)
+
+def setup_tab(self, tab, device_id, sheet_name, tab_id):
+    InverterTab.setup_tab(self, tab, device_id, sheet_name, tab_id)
+
+def attach_tab_figure(self, tab_id):
+    """Give a built tab a figure from self.figure_pool and a new canvas, unless it has one."""
+    graph_data = self.graphs[tab_id]
+    if graph_data.get("fig") is not None or graph_data.get("image_label") is not None:
+        return
+    fig, axes = self.figure_pool.acquire()
+    canvas = FigureCanvasTkAgg(fig, master=graph_data["graphs_frame"])
+    canvas.get_tk_widget().grid(row=1, column=0, sticky="nsew", padx=0, pady=0)
+    if getattr(self, "frame_monitor", None) is not None:
+        self.frame_monitor.instrument(canvas, graph_data["sheet"])
+    graph_data["fig"], graph_data["canvas"] = fig, canvas
+    for kind, ax in zip(GRAPH_SPECS, axes):
+        graph_data[f"{kind}_ax"] = ax
+    enable_zoom(self, tab_id)
+
+def release_tab_figure(self, tab_id):
+    """Destroy a tab's canvas widget and return its figure to self.figure_pool.
+
+    The tab's data and controls stay; attach_tab_figure gives it a figure again.
+    """
+    graph_data = self.graphs.get(tab_id)
+    if graph_data and graph_data.get("image_label") is not None:
+        # Process render mode: drop the bitmap, and any render still on its way for it
+        self.renderer.discard(tab_id)
+        graph_data["image_label"].configure(image="")
+        graph_data.pop("image", None)
+    if not graph_data or graph_data.get("fig") is None:
+        return
+    canvas = graph_data["canvas"]
+    # mpl_connect callbacks live on the figure, so they would otherwise follow it to the next tab
+    for key in [key for key in graph_data if key.endswith("_draw_cid")]:
+        canvas.mpl_disconnect(graph_data.pop(key))
+    for cid in graph_data.pop("zoom_cids", []):
+        canvas.mpl_disconnect(cid)
+    canvas.get_tk_widget().destroy()
+    self.figure_pool.release(graph_data["fig"], [graph_data[f"{kind}_ax"] for kind in GRAPH_SPECS])
+    for kind in GRAPH_SPECS:
+        for suffix in ("_ax", "_lines", "_option", "_background", "_range"):
+            graph_data.pop(f"{kind}{suffix}", None)
+    graph_data["fig"] = graph_data["canvas"] = None
+
+def handle_range_selection(self, tab_id, value):
+    graph_data = self.graphs[tab_id]
+    if value == "Specific Hour":
+        self.prompt_specific_hour(tab_id)
+    elif value == "Zoom":
+        self.enable_zoom(tab_id)
+    elif value in ARCHIVE_RANGES and getattr(self, "history", None) is not None:
+        # Longer than what is kept in memory: served from the archive at a coarse resolution
+        now = datetime.now()
+        graph_data["range_var"].set(value)
+        set_view(self, tab_id, now - ARCHIVE_RANGES[value], now)
+    else:
+        clear_view(graph_data)
+        graph_data["range_var"].set(value)
+        self.update_all_graphs(tab_id)
+
+def prompt_specific_hour(self, tab_id):
+    def on_submit():
+        try:
+            hour = datetime.strptime(hour_entry.get(), "%H:%M").time()
+        except ValueError:
+            messagebox.showerror("Invalid Input", "Please enter time in HH:MM format (e.g., 14:30)")
+            return
+        start = datetime.combine(datetime.now().date(), hour)
+        end = start + timedelta(hours=1)
+        clear_view(self.graphs[tab_id])
+        self.graphs[tab_id]["range_var"].set(f"Custom-{start.isoformat()}-{end.isoformat()}")
+        self.update_all_graphs(tab_id)
+        dialog.destroy()
+
+    dialog = tk.Toplevel(self.root)
+    dialog.title("Select Specific Hour")
+    dialog.geometry("300x150")
+    ttk.Label(dialog, text="Enter Time (HH:MM):").pack(pady=10)
+    hour_entry = ttk.Entry(dialog, width=10)
+    hour_entry.pack(pady=5)
+    ttk.Button(dialog, text="Submit", command=on_submit).pack(pady=10)
+
+def set_view(self, tab_id, start, end):
+    """Show [start, end] on the tab's shared time axis and fetch that range from the archive.
 
-        # Initialize graphs with default range (handled by menu)
-        self.handle_range_selection(tab_id, "All")
\ No newline at end of file
+    Whatever is already loaded is drawn at once. The archive query is debounced, runs on
+    the history thread at a resolution matched to the plot width, and its rows replace
+    the preview when they arrive. Only the newest query of a tab is ever applied.
+    """
+    graph_data = self.graphs[tab_id]
+    if (end - start).total_seconds() < MIN_VIEW_SECONDS:
+        return
+    graph_data["view"] = (start, end)
+    self.update_all_graphs(tab_id)
+    if getattr(self, "history", None) is None:
+        return
+    if graph_data.get("view_after") is not None:
+        self.root.after_cancel(graph_data["view_after"])
+    graph_data["view_after"] = self.root.after(VIEW_QUERY_DELAY_MS, lambda: request_view_data(self, tab_id))
+
+def request_view_data(self, tab_id):
+    graph_data = self.graphs[tab_id]
+    graph_data["view_after"] = None
+    if graph_data.get("view") is None:
+        return
+    generation = graph_data["view_generation"] = graph_data.get("view_generation", 0) + 1
+    ax = graph_data.get("power_ax")
+    points = plot_columns(ax) if ax is not None else max(1, graph_data["image_label"].winfo_width() // 2)
+    future = self.history.submit(graph_data["sheet"], *graph_data["view"], points)
+
+    def poll():
+        if not future.done():
+            self.root.after(VIEW_POLL_MS, poll)
+            return
+        if graph_data.get("view_generation") != generation:
+            return  # Superseded by a newer zoom, pan or range change
+        try:
+            graph_data["view_data"], _ = future.result()
+        except Exception as e:
+            log.error("History query for %s failed: %s", tab_id, e, extra={"inverter": graph_data.get("sheet")})
+            return
+        self.update_all_graphs(tab_id)
+
+    self.root.after(VIEW_POLL_MS, poll)
+
+def clear_view(graph_data):
+    graph_data["view"] = None
+    graph_data["view_data"] = None
+    graph_data["view_generation"] = graph_data.get("view_generation", 0) + 1  # Drops queries in flight
+
+def num_to_datetime(x):
+    return mdates.num2date(x).replace(tzinfo=None)  # Timestamps are naive local time throughout
+
+def enable_zoom(self, tab_id):
+    """Connect zoom and pan handlers to a tab's canvas; safe to call again, they are only connected once.
+
+    Left-drag selects a time range, the scroll wheel zooms around the cursor, right-drag
+    pans and a double click returns to the range chosen in the menu. The four trends share
+    the x-axis, so all of them follow.
+    """
+    graph_data = self.graphs[tab_id]
+    if "zoom_cids" in graph_data or graph_data["canvas"] is None:
+        return  # Already connected, or a worker-rendered bitmap that cannot be zoomed
+    canvas = graph_data["canvas"]
+    graph_data["zoom_cids"] = [
+        canvas.mpl_connect('button_press_event', lambda event: self.on_press(event, tab_id)),
+        canvas.mpl_connect('button_release_event', lambda event: self.on_release(event, tab_id)),
+        canvas.mpl_connect('scroll_event', lambda event: on_scroll(self, event, tab_id)),
+    ]
+
+def on_press(self, event, tab_id):
+    graph_data = self.graphs[tab_id]
+    graph_data["zoom_start"] = None
+    if event.inaxes is None:
+        return
+    if event.dblclick:
+        self.handle_range_selection(tab_id, graph_data["range_choice"].get())
+        return
+    graph_data["zoom_start"] = (event.button, event.xdata)
+
+def on_release(self, event, tab_id):
+    zoom_start = self.graphs[tab_id].pop("zoom_start", None)
+    if not zoom_start or event.inaxes is None or event.xdata == zoom_start[1]:
+        return  # A click, not a drag
+    button, x0 = zoom_start
+    if button == 1:
+        set_view(self, tab_id, num_to_datetime(min(x0, event.xdata)), num_to_datetime(max(x0, event.xdata)))
+    elif button == 3:
+        left, right = event.inaxes.get_xlim()
+        shift = x0 - event.xdata
+        set_view(self, tab_id, num_to_datetime(left + shift), num_to_datetime(right + shift))
+
+def on_scroll(self, event, tab_id):
+    if event.inaxes is None:
+        return
+    left, right = event.inaxes.get_xlim()
+    scale = 1 / ZOOM_STEP if event.button == "up" else ZOOM_STEP
+    x = event.xdata
+    set_view(self, tab_id, num_to_datetime(x - (x - left) * scale), num_to_datetime(x + (right - x) * scale))
+
+class FleetTab:
+    @staticmethod
+    def setup_tab(self, tab):
+        # Fleet totals, fed from the FleetAggregator in self.fleet
+        totals_frame = ttk.LabelFrame(tab, text="Fleet Totals", padding="5")
+        totals_frame.grid(row=0, column=0, padx=5, pady=5, sticky="nsew")
+        self.fleet_values = {}
+        for i, label in enumerate(FLEET_LABELS):
+            ttk.Label(totals_frame, text=label, font=("Arial", 10)).grid(row=i, column=0, sticky="w", padx=5)
+            value_label = ttk.Label(totals_frame, text="N/A", font=("Arial", 10))
+            value_label.grid(row=i, column=1, sticky="w", padx=5)
+            self.fleet_values[label] = value_label
+
+        share_tree = ttk.Treeview(totals_frame, columns=("ac_power", "share", "energy"), height=10)
+        share_tree.heading("ac_power", text="AC Power (W)")
+        share_tree.heading("share", text="Share (%)")
+        share_tree.heading("energy", text="Energy Today (kWh)")
+        for column in ("ac_power", "share", "energy"):
+            share_tree.column(column, width=110, anchor="e")
+        share_tree.grid(row=len(FLEET_LABELS), column=0, columnspan=2, pady=5, sticky="nsew")
+        share_tree.heading("#0", text="Inverter")
+        share_tree.column("#0", width=110)
+        for tab_id, name in self.sheet_names.items():
+            share_tree.insert("", "end", iid=tab_id, text=name, values=("N/A", "N/A", "N/A"))
+        self.fleet_share_tree = share_tree
+
+        graphs_frame = ttk.LabelFrame(tab, text="Fleet Trends", padding="0")
+        graphs_frame.grid(row=0, column=1, padx=0, pady=0, sticky="nsew")
+        tab.columnconfigure(1, weight=1)
+        tab.rowconfigure(0, weight=1)
+        fig = Figure(figsize=(8, 5), facecolor='white', dpi=100)
+        ax = fig.add_subplot(111)
+        fig.subplots_adjust(left=0.12, right=0.88, bottom=0.15, top=0.88)
+        canvas = FigureCanvasTkAgg(fig, master=graphs_frame)
+        canvas.get_tk_widget().pack(fill="both", expand=True, padx=0, pady=0)
+        if getattr(self, "frame_monitor", None) is not None:
+            self.frame_monitor.instrument(canvas, "Fleet")
+        self.fleet_graph = {"fig": fig, "ax": ax, "canvas": canvas}
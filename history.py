@@ -0,0 +1,196 @@
+import os
+import threading
+import time
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+
+import pandas as pd
+
+from .config import CONFIG
+from .logs import get_logger
+
+log = get_logger("history")
+
+SUMMARY_SECONDS = 300  # Bin width of the coarse per-day summaries
+DAY_CACHE_SIZE = 8     # Full-resolution days kept in memory
+READ_RETRIES = 3       # Attempts at a workbook caught half-written by write_to_excel
+READ_RETRY_SECONDS = 0.5
+
+
+class HistoryStore:
+    """Range queries over the daily Excel archive at a resolution that suits the view.
+
+    The archive is SAVE_DIR/YYYY-MM/YYYY-MM-DD.xlsx with one sheet per inverter. Wide views
+    are served from per-day summaries (min and max of every column per SUMMARY_SECONDS bin),
+    narrow ones from the raw samples. Raw days are kept in a small LRU cache; summaries are
+    also written to SAVE_DIR/.lod so a month view never has to parse a month of raw rows
+    twice. Cache entries are keyed on the workbook's mtime, so today's file stays current.
+    Queries run on one background thread; the caches are only touched from there.
+    """
+
+    def __init__(self, base_folder=None):
+        self.base_folder = base_folder or CONFIG["SAVE_DIR"]
+        self._days = OrderedDict()  # (sheet, day) -> (mtime, frame)
+        self._summaries = {}        # (sheet, day) -> (mtime, frame)
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="history")
+
+    def day_path(self, day):
+        return os.path.join(self.base_folder, day.strftime("%Y-%m"), day.strftime("%Y-%m-%d.xlsx"))
+
+    def summary_path(self, sheet_name, day):
+        return os.path.join(self.base_folder, ".lod", sheet_name, day.strftime("%Y-%m-%d.csv"))
+
+    def day_frame(self, sheet_name, day, cache=True):
+        """Every sample of one day, or an empty frame if the day or sheet does not exist."""
+        path = self.day_path(day)
+        if not os.path.exists(path):
+            return pd.DataFrame()
+        mtime = os.path.getmtime(path)
+        key = (sheet_name, day)
+        cached = self._days.get(key)
+        if cached and cached[0] == mtime:
+            self._days.move_to_end(key)
+            return cached[1]
+        frame = self._read_sheet(path, sheet_name)
+        if not frame.empty:
+            frame["Timestamp"] = pd.to_datetime(frame["Timestamp"], errors='coerce')
+            for column in frame.columns.drop("Timestamp"):
+                frame[column] = pd.to_numeric(frame[column], errors='coerce')
+            frame = frame.dropna(subset=["Timestamp"]).sort_values("Timestamp", ignore_index=True)
+        # Today's file is rewritten on the acquisition thread; a read it overlapped is not kept
+        if cache and os.path.getmtime(path) == mtime:
+            self._days[key] = (mtime, frame)
+            while len(self._days) > DAY_CACHE_SIZE:
+                self._days.popitem(last=False)
+        return frame
+
+    @staticmethod
+    def _read_sheet(path, sheet_name):
+        for attempt in range(READ_RETRIES):
+            try:
+                return pd.read_excel(path, sheet_name=sheet_name)
+            except ValueError:
+                return pd.DataFrame()  # Workbook without a sheet for this inverter
+            except (zipfile.BadZipFile, KeyError, EOFError):
+                # write_to_excel is rewriting the workbook right now; it is whole again shortly
+                if attempt == READ_RETRIES - 1:
+                    raise
+                time.sleep(READ_RETRY_SECONDS)
+
+    def day_summary(self, sheet_name, day):
+        """One day reduced to a min row and a max row per SUMMARY_SECONDS bin."""
+        path = self.day_path(day)
+        if not os.path.exists(path):
+            return pd.DataFrame()
+        mtime = os.path.getmtime(path)
+        key = (sheet_name, day)
+        cached = self._summaries.get(key)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        cache_file = self.summary_path(sheet_name, day)
+        if os.path.exists(cache_file) and os.path.getmtime(cache_file) >= mtime:
+            summary = pd.read_csv(cache_file, parse_dates=["Timestamp"])
+        else:
+            summary = summarize(self.day_frame(sheet_name, day))
+            if os.path.getmtime(path) != mtime:
+                return summary  # Rewritten while it was read; summarized again next time
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            summary.to_csv(cache_file, index=False)
+        self._summaries[key] = (mtime, summary)
+        return summary
+
+    def query(self, sheet_name, start: datetime, end: datetime, points: int = 1000):
+        """(frame, coarse) for [start, end]; coarse is True when summaries were used."""
+        coarse = (end - start).total_seconds() / max(1, points) >= SUMMARY_SECONDS
+        frames = []
+        for day in pd.date_range(start.date(), end.date(), freq="D"):
+            frame = self.day_summary(sheet_name, day) if coarse else self.day_frame(sheet_name, day)
+            if not frame.empty:
+                frames.append(frame)
+        if not frames:
+            return pd.DataFrame(), coarse
+        data = pd.concat(frames, ignore_index=True)
+        data = data[(data["Timestamp"] >= start) & (data["Timestamp"] <= end)]
+        return data.reset_index(drop=True), coarse
+
+    def submit(self, sheet_name, start, end, points=1000):
+        return self.executor.submit(self.query, sheet_name, start, end, points)
+
+
+class HistoryLoader:
+    """Feeds the archive to the GUI one (inverter, day) chunk at a time.
+
+    Chunks run on the HistoryStore's thread, in between view queries, newest day first.
+    The key passed to prioritize() (the visible tab) goes before the others, so the graphs
+    on screen fill in from the most recent data backwards. on_chunk(key, frame) runs on
+    that thread. Chunks bypass the day cache so loading a month does not evict the days
+    that zoom queries use.
+    """
+
+    def __init__(self, store, on_chunk):
+        self.store = store
+        self.on_chunk = on_chunk
+        self.pending = {}  # key -> (sheet, [day, ...] newest first)
+        self.focus = None
+        self.lock = threading.Lock()
+
+    def start(self, sheets, first_day=None, last_day=None):
+        """Queue first_day..last_day (default: this month up to today) for every key -> sheet name."""
+        last_day = last_day or date.today()
+        first_day = first_day or last_day.replace(day=1)
+        days = list(pd.date_range(first_day, last_day, freq="D"))[::-1]
+        with self.lock:
+            for key, sheet_name in sheets.items():
+                self.pending[key] = (sheet_name, list(days))
+        self.store.executor.submit(self._step)
+
+    def prioritize(self, key):
+        with self.lock:
+            self.focus = key
+
+    def cancel(self):
+        with self.lock:
+            self.pending.clear()
+
+    def remaining(self):
+        with self.lock:
+            return sum(len(days) for _, days in self.pending.values())
+
+    def _next(self):
+        with self.lock:
+            keys = [key for key, (_, days) in self.pending.items() if days]
+            if not keys:
+                return None
+            # The focused tab first, then whichever tab has the newest day left (ties in tab order)
+            key = self.focus if self.focus in keys else max(keys, key=lambda key: self.pending[key][1][0])
+            sheet_name, days = self.pending[key]
+            return key, sheet_name, days.pop(0)
+
+    def _step(self):
+        task = self._next()
+        if task is None:
+            return
+        key, sheet_name, day = task
+        try:
+            frame = self.store.day_frame(sheet_name, day, cache=False)
+            if not frame.empty:
+                self.on_chunk(key, frame)
+        except Exception as e:
+            log.error("Loading %s for %s failed: %s", day.strftime("%Y-%m-%d"), sheet_name, e)
+        # One chunk per task, so queries submitted meanwhile are not stuck behind a whole month
+        self.store.executor.submit(self._step)
+
+
+def summarize(frame):
+    """Min and max of every column per SUMMARY_SECONDS bin, interleaved as two rows per bin.
+
+    Plotted as a line this draws the envelope of the raw data, so short peaks survive.
+    """
+    if frame.empty:
+        return pd.DataFrame(columns=["Timestamp"])
+    bins = frame.set_index("Timestamp").resample(f"{SUMMARY_SECONDS}s")
+    low, high = bins.min().dropna(how="all"), bins.max().dropna(how="all")
+    high.index = high.index + pd.Timedelta(seconds=SUMMARY_SECONDS / 2)
+    return pd.concat([low, high]).sort_index().rename_axis("Timestamp").reset_index()
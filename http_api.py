@@ -0,0 +1,155 @@
+"""Read-only local HTTP endpoint for other tools, served from memory so scrapes never touch disk.
+
+    GET /latest                           newest sample per inverter (JSON)
+    GET /metrics                          Prometheus text format: readings and pipeline timings
+    GET /history?inverter=Sheet&minutes=60  recent samples of one inverter (JSON)
+
+Started by the dashboard when HTTP_API is set to host:port in config.json. Bind it to
+127.0.0.1 unless the plant network should see it; there is no authentication.
+"""
+import json
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from . import metrics
+from .logs import get_logger
+
+log = get_logger("http_api")
+
+HISTORY_SIZE = 720  # Samples kept per inverter for /history (60 h at the default 300 s FETCH_INTERVAL)
+
+# (metric name, help, type, path into a fetch_inverter_data() result)
+READINGS = [
+    ("inverter_ac_power_watts", "AC output power", "gauge", ("important_dps", "ac_power (W)")),
+    ("inverter_ac_voltage_volts", "AC grid voltage", "gauge", ("extracted", "phase_a", "ac_voltage")),
+    ("inverter_ac_current_amperes", "AC output current", "gauge", ("extracted", "phase_a", "ac_current (A)")),
+    ("inverter_frequency_hertz", "Grid frequency", "gauge", ("extracted", "phase_a", "frequency")),
+    ("inverter_dc_power_watts", "PV1 DC power", "gauge", ("extracted", "pv1_dc_data", "dc_power")),
+    ("inverter_dc_voltage_volts", "PV1 DC voltage", "gauge", ("extracted", "pv1_dc_data", "dc_voltage")),
+    ("inverter_dc_current_amperes", "PV1 DC current", "gauge", ("extracted", "pv1_dc_data", "dc_current")),
+    ("inverter_temperature_celsius", "Inverter temperature", "gauge", ("important_dps", "temp_current (°C)")),
+    ("inverter_energy_kwh_total", "Lifetime energy fed to the grid", "counter",
+     ("important_dps", "reverse_energy_total (kWh)")),
+]
+
+
+def _reading(data, path):
+    for key in path:
+        data = data.get(key) if isinstance(data, dict) else None
+    return data if isinstance(data, (int, float)) and not isinstance(data, bool) else None
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class LiveState:
+    """Newest sample and a short history per inverter; record() is safe from any thread."""
+
+    def __init__(self, history_size=HISTORY_SIZE):
+        self.lock = threading.Lock()
+        self.history_size = history_size
+        self.latest = {}   # sheet -> (timestamp, data)
+        self.history = {}  # sheet -> deque of (timestamp, data)
+
+    def record(self, sheet, data, timestamp=None):
+        if not data:
+            return
+        entry = (timestamp or datetime.now(), data)
+        with self.lock:
+            self.latest[sheet] = entry
+            self.history.setdefault(sheet, deque(maxlen=self.history_size)).append(entry)
+
+    def latest_json(self):
+        with self.lock:
+            latest = dict(self.latest)
+        return {sheet: {"time": timestamp.isoformat(timespec="seconds"), **data}
+                for sheet, (timestamp, data) in latest.items()}
+
+    def history_json(self, sheet, minutes):
+        since = datetime.now() - timedelta(minutes=minutes)
+        with self.lock:
+            entries = list(self.history.get(sheet, ()))
+        return [{"time": timestamp.isoformat(timespec="seconds"), **data}
+                for timestamp, data in entries if timestamp >= since]
+
+    def prometheus(self):
+        """Readings per inverter, then pipeline stage timings, counters and queue depths."""
+        with self.lock:
+            latest = dict(self.latest)
+        lines = []
+        for name, help_text, kind, path in READINGS:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+            for sheet, (_, data) in sorted(latest.items()):
+                value = _reading(data, path)
+                if value is not None:
+                    lines.append(f'{name}{{inverter="{_label(sheet)}"}} {value}')
+        lines += ["# HELP inverter_last_sample_timestamp_seconds When the newest sample arrived",
+                  "# TYPE inverter_last_sample_timestamp_seconds gauge"]
+        for sheet, (timestamp, _) in sorted(latest.items()):
+            lines.append(f'inverter_last_sample_timestamp_seconds{{inverter="{_label(sheet)}"}} {timestamp.timestamp():.3f}')
+
+        snapshot = metrics.snapshot()
+        name = "inverter_pipeline_stage_seconds"
+        lines += [f"# HELP {name} Time per pipeline stage over the recent window", f"# TYPE {name} summary"]
+        for stage, summary in snapshot["stages"].items():
+            for quantile in ("p50", "p95", "p99"):
+                lines.append(f'{name}{{stage="{stage}",quantile="0.{quantile[1:]}"}} {summary[quantile] / 1000:.6f}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {summary["mean"] * summary["count"] / 1000:.6f}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {summary["count"]}')
+        for counter, value in sorted(snapshot["counters"].items()):
+            lines += [f"# TYPE inverter_{counter}_total counter", f"inverter_{counter}_total {value}"]
+        for gauge, value in sorted(snapshot["gauges"].items()):
+            if value is not None:
+                lines += [f"# TYPE inverter_{gauge} gauge", f"inverter_{gauge} {value}"]
+        return "\n".join(lines) + "\n"
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        state = self.server.state
+        url = urlsplit(self.path)
+        if url.path == "/metrics":
+            self.reply(200, state.prometheus(), "text/plain; version=0.0.4; charset=utf-8")
+        elif url.path == "/latest":
+            self.reply_json(200, state.latest_json())
+        elif url.path == "/history":
+            query = parse_qs(url.query)
+            sheet = query.get("inverter", [""])[0]
+            try:
+                minutes = float(query.get("minutes", ["60"])[0])
+            except ValueError:
+                return self.reply_json(400, {"error": "minutes must be a number"})
+            if sheet not in state.latest:
+                return self.reply_json(404, {"error": f"unknown inverter {sheet!r}", "inverters": sorted(state.latest)})
+            self.reply_json(200, state.history_json(sheet, minutes))
+        else:
+            self.reply_json(404, {"error": "not found", "paths": ["/latest", "/metrics", "/history"]})
+
+    def reply_json(self, status, payload):
+        self.reply(status, json.dumps(payload, ensure_ascii=False), "application/json; charset=utf-8")
+
+    def reply(self, status, text, content_type):
+        body = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        log.debug(format, *args)
+
+
+def start_server(state, address):
+    """Serve `state` on host:port from a daemon thread; returns the server (call shutdown() to stop)."""
+    host, _, port = address.rpartition(":")
+    server = ThreadingHTTPServer((host or "127.0.0.1", int(port)), ApiHandler)
+    server.daemon_threads = True
+    server.state = state
+    threading.Thread(target=server.serve_forever, name="http-api", daemon=True).start()
+    log.info("HTTP API on http://%s:%d", *server.server_address[:2])
+    return server
@@ -0,0 +1,84 @@
+import logging
+import logging.handlers
+import os
+from collections import deque
+
+LOGGER_NAME = "inverter_monitoring"
+LOG_FORMAT = "[%(asctime)s] %(levelname)s %(name)s: %(message)s"
+RING_SIZE = 2000  # Records kept in memory for the log panel
+
+# Per-sample and per-draw debug output is only built when this is set (INVERTER_DEBUG=1 or
+# DEBUG_LOG in the config). Guard such calls with `if logs.DEBUG:` so a normal run skips
+# the formatting as well as the record.
+DEBUG = os.environ.get("INVERTER_DEBUG", "") not in ("", "0")
+
+_ring = None
+
+
+def get_logger(name=None):
+    return logging.getLogger(f"{LOGGER_NAME}.{name}" if name else LOGGER_NAME)
+
+
+class RingBufferHandler(logging.Handler):
+    """Keeps the newest records in memory, numbered so readers can ask for what is new.
+
+    emit() may run on any thread; logging.Handler.handle() already holds self.lock.
+    Listeners are called after each new record, outside that lock, so a reader can wake
+    up when there is something to read instead of polling.
+    """
+
+    def __init__(self, capacity=RING_SIZE):
+        super().__init__()
+        self.records = deque(maxlen=capacity)
+        self.seq = 0
+        self.listeners = []
+
+    def emit(self, record):
+        self.seq += 1
+        self.records.append((self.seq, record))
+
+    def handle(self, record):
+        emitted = super().handle(record)
+        if emitted:
+            for listener in list(self.listeners):
+                listener()
+        return emitted
+
+    def since(self, seq):
+        """[(seq, record)] newer than seq, oldest first; records already evicted are skipped."""
+        with self.lock:
+            count = min(self.seq - seq, len(self.records))
+            return list(self.records)[len(self.records) - count:] if count > 0 else []
+
+
+def setup_logging(config=None):
+    """Attach the ring buffer, a console handler and, if LOG_FILE is set, a rotating file.
+
+    Safe to call more than once; handlers are only added the first time. Returns the ring buffer.
+    """
+    global DEBUG, _ring
+    config = config or {}
+    DEBUG = DEBUG or bool(config.get("DEBUG_LOG", False))
+    logger = get_logger()
+    logger.setLevel(logging.DEBUG if DEBUG else logging.INFO)
+    if _ring is not None:
+        return _ring
+    _ring = RingBufferHandler(config.get("LOG_BUFFER", RING_SIZE))
+    logger.addHandler(_ring)
+    console = logging.StreamHandler()
+    console.setLevel(logging.WARNING)
+    console.setFormatter(logging.Formatter(LOG_FORMAT))
+    logger.addHandler(console)
+    log_file = config.get("LOG_FILE")
+    if log_file:
+        os.makedirs(os.path.dirname(os.path.abspath(log_file)), exist_ok=True)
+        rotating = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=config.get("LOG_MAX_BYTES", 1_000_000),
+            backupCount=config.get("LOG_BACKUPS", 3), encoding="utf-8")
+        rotating.setFormatter(logging.Formatter(LOG_FORMAT))
+        logger.addHandler(rotating)
+    return _ring
+
+
+def ring_buffer():
+    return _ring if _ring is not None else setup_logging()
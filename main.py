@@ -10,10 +10,12 @@ if project_root not in sys.path:
 from gui.core import InverterMonitoringGUI
 from inverter_monitoring.config import CONFIG
 from inverter_monitoring.file_ops import save_data, load_historical_data
+from inverter_monitoring import logs
 
 def main():
-    print(f"sys.path in main.py: {sys.path}")  # Debug print to check module search path
     
+    logs.setup_logging(CONFIG)
+
     # Load configuration
     inverters = CONFIG['inverters']
     
@@ -0,0 +1,160 @@
+import threading
+import time
+from collections import deque
+
+WINDOW = 1024  # Durations kept per stage for the fleet-wide rolling percentiles
+INVERTER_WINDOW = 64  # Durations kept per (stage, inverter); one per poll, so about an hour
+STAGES = ("fetch", "decode", "store", "display", "render", "lag", "draw", "blit", "resize")
+
+# Spans cost one perf_counter pair and a deque append when this is set, and a function
+# call returning a shared no-op object when not. Set from METRICS in the config.
+ENABLED = True
+
+
+class RollingHistogram:
+    """The newest `size` durations of one stage; percentiles are computed when read."""
+    __slots__ = ("samples", "count", "total_ms", "max_ms")
+
+    def __init__(self, size=WINDOW):
+        self.samples = deque(maxlen=size)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, ms):
+        self.samples.append(ms)
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def state(self):
+        """A cheap copy to summarize later, so the sort happens outside the registry lock."""
+        return list(self.samples), self.count, self.total_ms, self.max_ms
+
+    def summary(self):
+        return summarize(*self.state())
+
+
+def summarize(samples, count, total_ms, max_ms):
+    ordered = sorted(samples)
+
+    def percentile(fraction):
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+    return {"count": count, "p50": percentile(0.5), "p95": percentile(0.95), "p99": percentile(0.99),
+            "max": max_ms, "mean": total_ms / count if count else 0.0}
+
+
+class Registry:
+    """Timings per stage (overall and per inverter), counters and gauges, safe across threads."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.timings = {}   # (stage, inverter or None) -> RollingHistogram
+        self.counters = {}  # name -> int
+        self.gauges = {}    # name -> callable returning the current value, or a number
+
+    def observe(self, stage, ms, inverter=None):
+        with self.lock:
+            for key in ((stage, None), (stage, inverter)) if inverter else ((stage, None),):
+                histogram = self.timings.get(key)
+                if histogram is None:
+                    histogram = self.timings[key] = RollingHistogram(WINDOW if key[1] is None else INVERTER_WINDOW)
+                histogram.add(ms)
+
+    def incr(self, name, amount=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def gauge(self, name, value):
+        """Register a number, or a callable read at snapshot time (a queue's qsize, say)."""
+        with self.lock:
+            self.gauges[name] = value
+
+    def snapshot(self, inverter=None):
+        """{"stages": {stage: summary}, "inverters": [names], "counters", "gauges"}.
+
+        Stages are summarized for the whole fleet, or for one inverter when given; the
+        samples are copied under the lock and sorted after it is released, so readers never
+        hold up observe() on the acquisition thread.
+        """
+        with self.lock:
+            states = {stage: histogram.state() for (stage, name), histogram in self.timings.items() if name == inverter}
+            inverters = sorted({name for _, name in self.timings if name is not None})
+            counters = dict(self.counters)
+            gauges = dict(self.gauges)
+        stages = {stage: summarize(*state) for stage, state in sorted(states.items())}
+        for name, value in gauges.items():
+            try:
+                gauges[name] = value() if callable(value) else value
+            except Exception:
+                gauges[name] = None
+        return {"stages": stages, "inverters": inverters, "counters": counters, "gauges": gauges}
+
+    def reset(self):
+        with self.lock:
+            self.timings.clear()
+            self.counters.clear()
+
+
+class Span:
+    """Times a with-block into the registry; a failing block is counted as {stage}_failures."""
+    __slots__ = ("stage", "inverter", "start")
+
+    def __init__(self, stage, inverter=None):
+        self.stage = stage
+        self.inverter = inverter
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        REGISTRY.observe(self.stage, (time.perf_counter() - self.start) * 1000, self.inverter)
+        if exc_type is not None:
+            REGISTRY.incr(f"{self.stage}_failures")
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+REGISTRY = Registry()
+_NULL_SPAN = _NullSpan()
+
+
+def span(stage, inverter=None):
+    """with span("fetch", sheet): ... times the block as one sample of that stage."""
+    return Span(stage, inverter) if ENABLED else _NULL_SPAN
+
+
+def observe(stage, ms, inverter=None):
+    if ENABLED:
+        REGISTRY.observe(stage, ms, inverter)
+
+
+def incr(name, amount=1):
+    if ENABLED:
+        REGISTRY.incr(name, amount)
+
+
+def gauge(name, value):
+    REGISTRY.gauge(name, value)
+
+
+def snapshot(inverter=None):
+    return REGISTRY.snapshot(inverter)
+
+
+def setup_metrics(config=None):
+    """Turn instrumentation on or off from METRICS in the config."""
+    global ENABLED
+    ENABLED = bool((config or {}).get("METRICS", True))
+    return REGISTRY
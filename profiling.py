@@ -0,0 +1,182 @@
+"""On-demand CPU and memory profiling of a running dashboard, without a restart.
+
+    python -m inverter_monitoring.profiling toggle PID     # start/stop cProfile + tracemalloc
+    python -m inverter_monitoring.profiling snapshot PID   # write a memory snapshot now (the first starts tracing)
+    python -m inverter_monitoring.profiling diff OLD.tracemalloc NEW.tracemalloc
+
+The dashboard installs SIGUSR1 (toggle) and SIGUSR2 (snapshot) handlers and has the same
+controls in its Diagnostics window. Reports are written to SAVE_DIR/profiles with a
+timestamp in the name: profile-*.txt (top functions) next to the raw .prof for
+snakeviz or pstats, and memory-*.txt (top allocation sites, plus growth since the
+previous snapshot) next to the raw .tracemalloc that `diff` reads.
+"""
+import argparse
+import cProfile
+import io
+import linecache
+import os
+import pstats
+import signal
+import sys
+import threading
+import tracemalloc
+from datetime import datetime
+
+from .logs import get_logger
+
+log = get_logger("profiling")
+
+TOP = 40          # Lines per table in the reports
+TRACE_FRAMES = 10  # Stack depth tracemalloc keeps per allocation
+# Allocations made by tracemalloc itself and by reading source lines for the reports
+IGNORED = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, linecache.__file__)]
+
+
+def memory_report(snapshot, previous=None, top=TOP):
+    """Top allocation sites of `snapshot` and, given `previous`, the sites that grew most since."""
+    snapshot = snapshot.filter_traces(IGNORED)
+    stats = snapshot.statistics("lineno")
+    lines = [f"Traced memory: {sum(stat.size for stat in stats) / 1e6:.1f} MB in {len(stats)} sites",
+             "", f"Top {top} allocation sites"]
+    lines += [f"  {stat}" for stat in stats[:top]]
+    if previous is not None:
+        previous = previous.filter_traces(IGNORED)
+        growth = snapshot.compare_to(previous, "traceback")
+        lines += ["", f"Top {top} growth since the previous snapshot (with the call stack)"]
+        for stat in [stat for stat in growth if stat.size_diff > 0][:top]:
+            lines.append(f"  {stat.size_diff / 1024:+.1f} KiB, {stat.count_diff:+d} blocks")
+            lines += [f"      {frame}" for frame in stat.traceback.format()[-2 * TRACE_FRAMES:]]
+    return "\n".join(lines) + "\n"
+
+
+class Profiler:
+    """cProfile around the Tk thread and tracemalloc around the process, started and stopped at will.
+
+    cProfile only sees the thread that called start(), which for the dashboard is the Tk
+    main loop; the acquisition and history threads show up in the memory reports only.
+    Every method returns the paths of the files it wrote.
+    """
+
+    def __init__(self, out_dir):
+        self.out_dir = out_dir
+        self.profile = None
+        self.last_snapshot = None
+        self.owns_tracing = False  # Tracing started here, not by PYTHONTRACEMALLOC or the host program
+        self.lock = threading.Lock()
+
+    @property
+    def running(self):
+        return self.profile is not None
+
+    def _path(self, prefix, extension):
+        os.makedirs(self.out_dir, exist_ok=True)
+        stem = os.path.join(self.out_dir, f"{prefix}-{datetime.now():%Y%m%d-%H%M%S}")
+        path, n = f"{stem}.{extension}", 1
+        while os.path.exists(path):  # Two reports within a second
+            n += 1
+            path = f"{stem}-{n}.{extension}"
+        return path
+
+    def start(self):
+        with self.lock:
+            if self.profile is not None:
+                return []
+            self._start_tracing()
+            self.last_snapshot = tracemalloc.take_snapshot()
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+        log.info("Profiling started; reports go to %s", self.out_dir)
+        return []
+
+    def stop(self):
+        with self.lock:
+            if self.profile is None:
+                return []
+            self.profile.disable()
+            profile, self.profile = self.profile, None
+        paths = self._write_profile(profile) + self.snapshot()
+        if self.owns_tracing:
+            tracemalloc.stop()
+            self.owns_tracing = False
+            self.last_snapshot = None
+        log.info("Profiling stopped; wrote %s", ", ".join(paths))
+        return paths
+
+    def toggle(self):
+        return self.stop() if self.running else self.start()
+
+    def _start_tracing(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+            self.owns_tracing = True
+
+    def snapshot(self):
+        """Write the current allocations and their growth since the last snapshot (or start).
+
+        With tracing off nothing useful has been recorded yet, so the first call only starts
+        tracing and keeps a baseline; it writes nothing and the next call reports the growth.
+        """
+        if not tracemalloc.is_tracing():
+            self._start_tracing()
+            self.last_snapshot = tracemalloc.take_snapshot()
+            log.info("Memory tracing started; the next snapshot reports what grew since now")
+            return []
+        snapshot = tracemalloc.take_snapshot()
+        raw = self._path("memory", "tracemalloc")
+        snapshot.dump(raw)
+        report = self._path("memory", "txt")
+        with open(report, "w", encoding="utf-8") as f:
+            f.write(memory_report(snapshot, self.last_snapshot))
+        self.last_snapshot = snapshot
+        return [report, raw]
+
+    def _write_profile(self, profile):
+        raw = self._path("profile", "prof")
+        profile.dump_stats(raw)
+        text = io.StringIO()
+        stats = pstats.Stats(profile, stream=text)
+        text.write("By cumulative time\n")
+        stats.sort_stats("cumulative").print_stats(TOP)
+        text.write("\nBy own time\n")
+        stats.sort_stats("tottime").print_stats(TOP)
+        report = self._path("profile", "txt")
+        with open(report, "w", encoding="utf-8") as f:
+            f.write(text.getvalue())
+        return [report, raw]
+
+
+def install_signal_handlers(profiler, run=None):
+    """SIGUSR1 toggles profiling, SIGUSR2 writes a memory snapshot (POSIX only; main thread only).
+
+    `run(func)` decides where the work happens; the dashboard passes a function that
+    queues it on the Tk thread, so cProfile attaches to the main loop.
+    """
+    if not hasattr(signal, "SIGUSR1"):
+        return False
+    run = run or (lambda func: func())
+    signal.signal(signal.SIGUSR1, lambda signum, frame: run(profiler.toggle))
+    signal.signal(signal.SIGUSR2, lambda signum, frame: run(profiler.snapshot))
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("toggle", help="start or stop profiling in a running dashboard").add_argument("pid", type=int)
+    commands.add_parser("snapshot", help="write a memory snapshot in a running dashboard").add_argument("pid", type=int)
+    diff = commands.add_parser("diff", help="compare two .tracemalloc snapshots")
+    diff.add_argument("old")
+    diff.add_argument("new")
+    diff.add_argument("--top", type=int, default=TOP)
+    args = parser.parse_args(argv)
+
+    if args.command == "diff":
+        sys.stdout.write(memory_report(tracemalloc.Snapshot.load(args.new), tracemalloc.Snapshot.load(args.old), args.top))
+    elif not hasattr(signal, "SIGUSR1"):
+        parser.error("signals are not available on this platform; use the Diagnostics window")
+    else:
+        os.kill(args.pid, signal.SIGUSR1 if args.command == "toggle" else signal.SIGUSR2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import matplotlib.dates as mdates
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from .logs import get_logger
+
+log = get_logger("render_worker")
+
+# Margins of the 2x2 trend grid, shared by the Tk figures and the worker-rendered bitmaps
+SUBPLOT_LAYOUT = {"left": 0.08, "right": 0.97, "bottom": 0.1, "top": 0.94, "hspace": 0.3, "wspace": 0.25}
+
+
+def set_date_axis(ax):
+    """Numeric (matplotlib date) x-axis; ticks adapt to the visible span, from seconds to months."""
+    locator = mdates.AutoDateLocator(minticks=3, maxticks=7)
+    ax.xaxis.set_major_locator(locator)
+    ax.xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator))
+    spec = ax.get_subplotspec()
+    if spec is None or spec.is_last_row():
+        ax.set_xlabel("Time")  # Upper rows of a shared-x grid keep their x labels hidden
+
+
+def render_panels(job):
+    """Draw a 2x2 trend grid with Agg and return it as binary PPM, ready for tk.PhotoImage.
+
+    Runs in the worker process. `job` holds only plain data: pixel size, dpi and per
+    panel a title, optional y-limits and (x, y, style, label) series, plus optional x-limits.
+    """
+    dpi = job["dpi"]
+    fig = Figure(figsize=(job["width"] / dpi, job["height"] / dpi), dpi=dpi, facecolor='white')
+    canvas = FigureCanvasAgg(fig)
+    axes = fig.subplots(2, 2, sharex=True).flat
+    fig.subplots_adjust(**SUBPLOT_LAYOUT)
+    for ax, panel in zip(axes, job["panels"]):
+        for x, y, style, label in panel["series"]:
+            ax.plot(x, y, style, label=label)
+        if panel["ylim"]:
+            ax.set_ylim(*panel["ylim"])
+        if job.get("xlim"):
+            ax.set_xlim(*job["xlim"])
+        ax.set_title(panel["title"])
+        ax.legend(loc="upper left")
+        ax.grid(True)
+        set_date_axis(ax)
+    canvas.draw()
+    width, height = canvas.get_width_height()
+    rgb = np.asarray(canvas.buffer_rgba())[..., :3]
+    return b"P6 %d %d 255\n" % (width, height) + rgb.tobytes()
+
+
+class ProcessRenderer:
+    """Runs render_panels in a worker process so heavy redraws never block the Tk main loop.
+
+    Each key (a notebook tab) has at most one job in the worker. Requests that arrive while
+    it renders replace each other, so only the newest one is built and submitted; a job
+    that was superseded while running is dropped when it finishes. Results are collected
+    by polling with root.after, so callbacks always run on the Tk thread.
+    """
+
+    def __init__(self, root, workers=1, poll_ms=50):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.workers = workers
+        self.executor = self._start_executor()
+        self.generation = {}  # key -> newest requested generation
+        self.waiting = {}     # key -> (generation, build, on_done), not submitted yet
+        self.running = {}     # key -> (generation, future, on_done)
+        self._pending = None
+
+    def _start_executor(self):
+        # Spawn rather than fork: the worker must not inherit the Tk interpreter
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def request(self, key, build, on_done):
+        """Queue a render; build() makes the job at submit time, so a burst of requests costs one job."""
+        self.generation[key] = self.generation.get(key, 0) + 1
+        self.waiting[key] = (self.generation[key], build, on_done)
+        self._schedule()
+
+    def discard(self, key):
+        """Forget `key`'s queued render and drop the one in flight when it finishes (tab released)."""
+        if key in self.generation:
+            self.generation[key] += 1
+        self.waiting.pop(key, None)
+
+    def _schedule(self):
+        if self._pending is None:
+            self._pending = self.root.after(self.poll_ms, self._poll)
+
+    def _restart(self, reason):
+        log.error("Render worker died, restarting: %s", reason)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.executor = self._start_executor()
+
+    def _poll(self):
+        self._pending = None
+        broken = None
+        for key, (generation, future, on_done) in list(self.running.items()):
+            if not future.done():
+                continue
+            del self.running[key]
+            if generation != self.generation[key]:
+                # Stale: newer data arrived while this one was rendering. It is not shown,
+                # but a worker that died on it still has to be noticed
+                if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+                    broken = future.exception()
+                continue
+            try:
+                on_done(future.result())
+            except BrokenProcessPool as e:
+                broken = e
+            except Exception as e:
+                log.exception("Render of %s failed: %s", key, e)
+        if broken is not None:
+            self._restart(broken)  # Once per poll, however many results failed
+        submit_failed = None
+        for key in [key for key in self.waiting if key not in self.running]:
+            generation, build, on_done = self.waiting.pop(key)
+            try:
+                job = build()
+                if job is not None:
+                    self.running[key] = (generation, self.executor.submit(render_panels, job), on_done)
+            except BrokenProcessPool as e:
+                # The pool died with none of our results to show it; keep the request
+                self.waiting.setdefault(key, (generation, build, on_done))
+                submit_failed = e
+            except Exception as e:
+                log.exception("Building the render of %s failed: %s", key, e)
+        if submit_failed is not None and broken is None:
+            self._restart(submit_failed)
+        if self.running or self.waiting:
+            self._schedule()
+
+    def close(self):
+        if self._pending is not None:
+            self.root.after_cancel(self._pending)
+            self._pending = None
+        self.executor.shutdown(wait=False, cancel_futures=True)
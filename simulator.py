@@ -0,0 +1,241 @@
+"""Deterministic PV fleet simulator for demos, load tests and repeatable benchmark inputs.
+
+    python -m inverter_monitoring.simulator --inverters 500 --stream --interval 10 --speed 60
+    python -m inverter_monitoring.simulator --inverters 500 --archive bench_data --days 7
+    python -m inverter_monitoring.simulator --inverters 500 --config-out fleet.json
+
+Every inverter follows a clear-sky curve between sunrise and sunset. Clouds pass over the
+whole fleet, reaching each inverter with its own lag, and each day has its own haze and
+ambient temperature. Weather and noise are pure functions of (seed, inverter, time), so
+a seed always gives the same fleet. The energy counter integrates the power between an
+inverter's samples and never decreases. Samples have the shape of fetch_inverter_data().
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional
+
+SIM_PREFIX = "sim"
+CLOUD_CELL_SECONDS = 120  # Length of one cloud cell as it passes an inverter
+
+
+def sim_device_id(index, prefix=SIM_PREFIX):
+    return "%s%0*d" % (prefix, 22 - len(prefix), index)  # Same length as a real Tuya device ID
+
+
+def inverters(count, prefix=SIM_PREFIX):
+    """INVERTERS entries for `count` simulated inverters whose device IDs start with `prefix`."""
+    return [{"device_id": sim_device_id(i, prefix), "ip": "", "local_key": "", "sheet": f"Sim {i + 1}"}
+            for i in range(count)]
+
+
+def _rng(*key):
+    return random.Random(zlib.crc32(repr(key).encode()))
+
+
+class SimClock:
+    """Simulated time: starts at `start` and runs `speed` times faster than the wall clock."""
+
+    def __init__(self, start: Optional[datetime] = None, speed: float = 1.0):
+        self.start = (start or datetime.now()).timestamp()
+        self.speed = speed
+        self.origin = time.monotonic()
+
+    def now(self) -> float:
+        return self.start + (time.monotonic() - self.origin) * self.speed
+
+
+class SimulatedInverter:
+    def __init__(self, device_id, seed):
+        rng = _rng(seed, device_id)
+        self.device_id = device_id
+        self.peak_w = rng.uniform(1500, 5000)
+        self.sunrise = rng.uniform(5.75, 6.25)
+        self.sunset = rng.uniform(19.75, 20.25)
+        self.cloud_lag = rng.uniform(0, 600)  # Seconds until a cloud over the fleet reaches it
+        self.temp_offset = rng.uniform(-2, 2)
+        self.grid_v = rng.uniform(226, 234)
+        self.energy_kwh = rng.uniform(1000, 20000)
+        self.last_t = None
+        self.last_ac_w = 0.0
+
+
+class FleetSimulator:
+    """Samples for a set of simulated inverters; IDs not seen before are added on first use.
+
+    sample() is thread-safe. Pass `clock` (a SimClock) to run faster than real time; without
+    one, samples are taken at the wall-clock time.
+    """
+
+    def __init__(self, device_ids: Iterable[str] = (), seed: int = 0, clock: Optional[SimClock] = None):
+        self.seed = seed
+        self.clock = clock
+        self.inverters: Dict[str, SimulatedInverter] = {}
+        self.lock = threading.Lock()
+        for device_id in device_ids:
+            self.add(device_id)
+
+    def __contains__(self, device_id):
+        return device_id in self.inverters
+
+    def add(self, device_id) -> SimulatedInverter:
+        inverter = self.inverters.get(device_id)
+        if inverter is None:
+            inverter = self.inverters[device_id] = SimulatedInverter(device_id, self.seed)
+        return inverter
+
+    def now(self) -> float:
+        return self.clock.now() if self.clock else time.time()
+
+    def clearness(self, t):
+        """Share of clear-sky irradiance at epoch second t: the day's haze times the cloud cover."""
+        day = int(t // 86400)
+        haze = _rng(self.seed, "haze", day).uniform(0.75, 1.0)
+        cell, offset = divmod(t / CLOUD_CELL_SECONDS, 1)
+        here, following = self._cloud(int(cell)), self._cloud(int(cell) + 1)
+        return haze * (here + (following - here) * offset)
+
+    def _cloud(self, cell):
+        rng = _rng(self.seed, "cloud", cell)
+        return rng.uniform(0.2, 0.7) if rng.random() < 0.25 else 1.0
+
+    def ambient(self, t, hour):
+        day_mean = _rng(self.seed, "temp", int(t // 86400)).uniform(10, 25)
+        return day_mean + 6 * math.sin(2 * math.pi * (hour - 9) / 24)
+
+    def sample(self, device_id: str, t: Optional[float] = None) -> Dict:
+        """One fetch_inverter_data()-shaped reading of `device_id` at epoch second t (default: now)."""
+        t = self.now() if t is None else t
+        moment = datetime.fromtimestamp(t)
+        hour = moment.hour + moment.minute / 60 + moment.second / 3600
+        noise = _rng(self.seed, device_id, int(t))
+        with self.lock:
+            inverter = self.add(device_id)
+            daylight = (hour - inverter.sunrise) / (inverter.sunset - inverter.sunrise)
+            sun = math.sin(math.pi * daylight) if 0 < daylight < 1 else 0.0
+            dc_power = inverter.peak_w * sun * self.clearness(t - inverter.cloud_lag) * noise.uniform(0.98, 1.0)
+            ac_power = dc_power * 0.96
+            if inverter.last_t is not None and t > inverter.last_t:
+                # Trapezoid over the gap; the counter only grows, even if samples come out of order
+                hours = (t - inverter.last_t) / 3600
+                inverter.energy_kwh += (inverter.last_ac_w + ac_power) / 2 * hours / 1000
+            if inverter.last_t is None or t > inverter.last_t:
+                inverter.last_t, inverter.last_ac_w = t, ac_power
+            energy_kwh = inverter.energy_kwh
+        dc_voltage = 280 + 60 * sun + noise.uniform(-2, 2) if dc_power > 1 else 0.0
+        ac_voltage = inverter.grid_v + noise.uniform(-1.5, 1.5)
+        temp = self.ambient(t, hour) + inverter.temp_offset + 25 * dc_power / inverter.peak_w
+        return {
+            "timestamp": moment.strftime("%H:%M:%S"),
+            "important_dps": {
+                "reverse_energy_total (kWh)": round(energy_kwh, 2),
+                "temp_current (°C)": int(temp),
+                "ac_power (W)": round(ac_power, 1)
+            },
+            "extracted": {
+                "phase_a": {
+                    "ac_voltage": round(ac_voltage, 1),
+                    "frequency": round(50 + noise.uniform(-0.05, 0.05), 1),
+                    "ac_current (A)": ac_power / ac_voltage
+                },
+                "pv1_dc_data": {
+                    "dc_voltage": round(dc_voltage, 1),
+                    "dc_current": round(dc_power / dc_voltage, 1) if dc_voltage else 0.0,
+                    "dc_power": round(dc_power, 1)
+                }
+            }
+        }
+
+
+def sample_row(moment, data):
+    """A sample as a row under file_ops.HEADERS."""
+    important, phase_a, dc = data["important_dps"], data["extracted"]["phase_a"], data["extracted"]["pv1_dc_data"]
+    return [moment.strftime("%Y-%m-%d %H:%M:%S"), important["reverse_energy_total (kWh)"],
+            important["temp_current (°C)"], important["ac_power (W)"], phase_a["ac_voltage"],
+            phase_a["frequency"], round(phase_a["ac_current (A)"], 3), dc["dc_voltage"],
+            dc["dc_current"], dc["dc_power"]]
+
+
+def write_archive(base_folder, inverters, first_day, days, interval=300, seed=0, window=(6, 20)):
+    """Fill base_folder with `days` daily workbooks in the SAVE_DIR layout, one sheet per inverter.
+
+    Samples are taken every `interval` seconds within the recording window (hours). Returns
+    the number of rows written.
+    """
+    import pandas as pd
+    from .file_ops import HEADERS
+    simulator = FleetSimulator((inverter["device_id"] for inverter in inverters), seed)
+    rows_written = 0
+    for day in range(days):
+        start = datetime.combine(first_day + timedelta(days=day), datetime.min.time())
+        moments = [start + timedelta(seconds=s) for s in range(window[0] * 3600, window[1] * 3600 + 1, interval)]
+        folder = os.path.join(base_folder, start.strftime("%Y-%m"))
+        os.makedirs(folder, exist_ok=True)
+        with pd.ExcelWriter(os.path.join(folder, start.strftime("%Y-%m-%d.xlsx")), engine="openpyxl") as writer:
+            for inverter in inverters:
+                rows = [sample_row(m, simulator.sample(inverter["device_id"], m.timestamp())) for m in moments]
+                pd.DataFrame(rows, columns=HEADERS).to_excel(writer, sheet_name=inverter["sheet"], index=False)
+                rows_written += len(rows)
+    return rows_written
+
+
+def write_config(path, inverters, **overrides):
+    """A config.json listing `inverters`, with `overrides` (SIM_SEED=..., FAKE_CLOUD=...) over the defaults."""
+    from .config import DEFAULT_CONFIG
+    config = dict(DEFAULT_CONFIG, INVERTERS=inverters, **overrides)
+    with open(path, "w") as f:
+        json.dump(config, f, indent=4)
+
+
+def stream(inverters, interval, speed, seed, out=sys.stdout):
+    """Print one JSON line per inverter every `interval` simulated seconds, until interrupted."""
+    clock = SimClock(speed=speed)
+    simulator = FleetSimulator((inverter["device_id"] for inverter in inverters), seed, clock)
+    next_t = clock.now()
+    while True:
+        for inverter in inverters:
+            record = {"sheet": inverter["sheet"], "time": datetime.fromtimestamp(next_t).isoformat(timespec="seconds")}
+            record.update(simulator.sample(inverter["device_id"], next_t))
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        out.flush()
+        next_t += interval
+        time.sleep(max(0.0, (next_t - clock.now()) / speed))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--inverters", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--interval", type=float, default=300, help="simulated seconds between samples")
+    parser.add_argument("--speed", type=float, default=1.0, help="simulated seconds per wall-clock second")
+    parser.add_argument("--stream", action="store_true", help="print samples as JSON lines")
+    parser.add_argument("--archive", metavar="DIR", help="write a history archive (SAVE_DIR layout) here")
+    parser.add_argument("--days", type=int, default=1, help="days in --archive, ending yesterday")
+    parser.add_argument("--config-out", metavar="PATH", help="write a config.json with the simulated fleet")
+    args = parser.parse_args(argv)
+
+    fleet = inverters(args.inverters)
+    if args.config_out:
+        write_config(args.config_out, fleet, SIM_SEED=args.seed, SIM_SPEED=args.speed)
+        print(f"Wrote {args.config_out} with {args.inverters} inverters")
+    if args.archive:
+        first_day = datetime.now().date() - timedelta(days=args.days)
+        started = time.perf_counter()
+        rows = write_archive(args.archive, fleet, first_day, args.days, int(args.interval), args.seed)
+        print(f"Wrote {rows} rows to {args.archive} in {time.perf_counter() - started:.1f}s")
+    if args.stream:
+        try:
+            stream(fleet, args.interval, args.speed, args.seed)
+        except (KeyboardInterrupt, BrokenPipeError):
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+import math
+from datetime import datetime
+from typing import Dict, List, Optional
+
+STAT_COLUMNS = ["AC Power (W)", "AC Voltage (V)", "Frequency (Hz)", "AC Current (A)",
+                "DC Power (W)", "DC Voltage (V)", "DC Current (A)", "Temp (°C)", "Reverse Energy (kWh)"]
+MAX_INTEGRATION_GAP_HOURS = 0.5  # Don't integrate power across longer outages
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and not math.isnan(value)
+
+
+def counter_energy(readings: List[float]) -> float:
+    """Energy between consecutive lifetime-counter readings; a drop means the counter restarted from 0."""
+    total = 0.0
+    for previous, current in zip(readings, readings[1:]):
+        total += current - previous if current >= previous else current
+    return total
+
+
+class RunningStats:
+    """Streaming min/max/mean/variance for one metric (Welford), O(1) per sample."""
+    __slots__ = ("count", "mean", "_m2", "min", "max")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value) -> None:
+        if not _is_number(value):
+            return
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, count: int, mean: float, m2: float, min_value: float, max_value: float) -> None:
+        """Fold in a pre-aggregated block (Chan et al.), used when seeding from loaded history."""
+        if count <= 0:
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self._m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+        self.min = min_value if self.min is None else min(self.min, min_value)
+        self.max = max_value if self.max is None else max(self.max, max_value)
+
+    def merge_series(self, series) -> None:
+        values = series.dropna()
+        if values.empty:
+            return
+        mean = float(values.mean())
+        self.merge(len(values), mean, float(((values - mean) ** 2).sum()), float(values.min()), float(values.max()))
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+
+class InverterStats:
+    """Per-inverter accumulators for today (reset at midnight) and for everything loaded since start."""
+
+    def __init__(self):
+        self.total = {column: RunningStats() for column in STAT_COLUMNS}
+        self.today = {column: RunningStats() for column in STAT_COLUMNS}
+        self.day = None
+        self._reset_day(None)
+
+    def _reset_day(self, day) -> None:
+        self.day = day
+        for stats in self.today.values():
+            stats.reset()
+        self.peak_power = None
+        self.peak_time = None
+        self.energy_today = 0.0
+        self._counter_times = []   # Today's lifetime-counter readings, oldest first
+        self._counter_values = []
+        self._counted = 0.0        # counter_energy(self._counter_values)
+        self._integrated = 0.0     # Trapezoidal AC energy, used when the counter is missing
+        self._last_time = None
+        self._last_power = None
+
+    def update(self, timestamp: datetime, row: Dict) -> None:
+        """Fold one sample (keyed by history column names) into the accumulators."""
+        for column, stats in self.total.items():
+            stats.add(row.get(column))
+
+        day = timestamp.date()
+        if self.day is not None and day < self.day:
+            return  # Late sample from an earlier day only counts towards the totals
+        if day != self.day:
+            self._reset_day(day)
+        for column, stats in self.today.items():
+            stats.add(row.get(column))
+
+        power = row.get("AC Power (W)")
+        if _is_number(power):
+            if self.peak_power is None or power > self.peak_power:
+                self.peak_power = power
+                self.peak_time = timestamp
+            if self._last_time is not None and timestamp > self._last_time:
+                hours = (timestamp - self._last_time).total_seconds() / 3600
+                if hours <= MAX_INTEGRATION_GAP_HOURS:
+                    self._integrated += (power + self._last_power) / 2 * hours / 1000
+            if self._last_time is None or timestamp > self._last_time:
+                self._last_time = timestamp
+                self._last_power = power
+
+        counter = row.get("Reverse Energy (kWh)")
+        if _is_number(counter):
+            self._add_counter([timestamp], [counter])
+        elif not self._counter_values:
+            self.energy_today = self._integrated
+
+    def _add_counter(self, times: List[datetime], values: List[float]) -> None:
+        """Fold today's counter readings (oldest first) into energy_today."""
+        if self._counter_times and times[0] < self._counter_times[-1]:
+            # Older readings (history arriving after live samples): merge and add up again
+            merged = sorted(zip(self._counter_times + times, self._counter_values + values), key=lambda pair: pair[0])
+            self._counter_times = [time for time, _ in merged]
+            self._counter_values = [value for _, value in merged]
+            self._counted = counter_energy(self._counter_values)
+        else:
+            self._counted += counter_energy(self._counter_values[-1:] + values)
+            self._counter_times += times
+            self._counter_values += values
+        self.energy_today = self._counted
+
+    def seed(self, historical_data) -> None:
+        """Fold in a block of history with one vectorized pass per column.
+
+        Blocks may arrive in any order and after live samples (history loads in the
+        background): older days only count towards the totals, and the "latest" power and
+        counter readings are only replaced by newer ones.
+        """
+        if historical_data is None or historical_data.empty or "Timestamp" not in historical_data:
+            return
+        import pandas as pd
+
+        data = historical_data.dropna(subset=["Timestamp"]).sort_values("Timestamp")
+        if data.empty:
+            return
+        numeric = {column: pd.to_numeric(data[column], errors="coerce")
+                   for column in STAT_COLUMNS if column in data}
+        for column, values in numeric.items():
+            self.total[column].merge_series(values)
+
+        last_day = data["Timestamp"].iloc[-1].date()
+        if self.day is not None and last_day < self.day:
+            return
+        if last_day != self.day:
+            self._reset_day(last_day)
+        today_mask = (data["Timestamp"].dt.date == last_day).to_numpy()
+        times = data["Timestamp"][today_mask]
+        for column, values in numeric.items():
+            self.today[column].merge_series(values[today_mask])
+
+        power = numeric.get("AC Power (W)")
+        if power is not None:
+            power = power[today_mask]
+            valid = power.notna()
+            if valid.any():
+                peak_index = power[valid].idxmax()
+                if self.peak_power is None or power[peak_index] > self.peak_power:
+                    self.peak_power = float(power[peak_index])
+                    self.peak_time = data.loc[peak_index, "Timestamp"].to_pydatetime()
+                hours = times[valid].diff().dt.total_seconds().to_numpy() / 3600
+                watts = power[valid].to_numpy()
+                segments = (watts[1:] + watts[:-1]) / 2 * hours[1:] / 1000
+                self._integrated += float(segments[hours[1:] <= MAX_INTEGRATION_GAP_HOURS].sum())
+                last_time = times[valid].iloc[-1].to_pydatetime()
+                if self._last_time is None or last_time > self._last_time:
+                    self._last_time = last_time
+                    self._last_power = float(watts[-1])
+
+        counter = numeric.get("Reverse Energy (kWh)")
+        counter = counter[today_mask].dropna() if counter is not None else None
+        if counter is not None and not counter.empty:
+            self._add_counter(data.loc[counter.index, "Timestamp"].tolist(), counter.astype(float).tolist())
+        elif not self._counter_values:
+            self.energy_today = self._integrated
+
+    def limits(self, columns: List[str], scope: str = "total") -> Optional[tuple]:
+        """Combined (min, max) across columns, or None if nothing has been seen yet."""
+        source = self.total if scope == "total" else self.today
+        lows = [source[c].min for c in columns if source[c].min is not None]
+        highs = [source[c].max for c in columns if source[c].max is not None]
+        if not lows or not highs:
+            return None
+        return min(lows), max(highs)
+
+    def summary(self) -> List[Dict]:
+        """One row per metric, used for exports."""
+        rows = []
+        for column in STAT_COLUMNS:
+            today, total = self.today[column], self.total[column]
+            rows.append({
+                "Metric": column,
+                "Today Min": today.min, "Today Max": today.max,
+                "Today Mean": today.mean if today.count else None,
+                "Today Std": today.std if today.count else None,
+                "All Min": total.min, "All Max": total.max,
+                "All Mean": total.mean if total.count else None,
+                "Samples": total.count,
+            })
+        rows.append({"Metric": "Peak AC Power Today (W)", "Today Max": self.peak_power,
+                     "Peak Time": self.peak_time.strftime("%H:%M:%S") if self.peak_time else None})
+        rows.append({"Metric": "Energy Today (kWh)", "Today Max": self.energy_today})
+        return rows
@@ -0,0 +1,9 @@
+import os
+import sys
+
+# The modules import each other as inverter_monitoring.*; reuse the benchmarks' way of
+# making a checkout under any directory name importable under that name
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+from common import ensure_importable  # noqa: E402
+
+ensure_importable()
@@ -0,0 +1,27 @@
+import numpy as np
+
+from inverter_monitoring.decimate import m4_indices
+
+
+def test_m4_keeps_first_last_min_max_of_every_bucket():
+    rng = np.random.default_rng(3)
+    x = np.sort(rng.uniform(0, 1000, 20000))
+    y = rng.normal(size=len(x))
+    y[rng.random(len(x)) < 0.01] = np.nan
+    columns = 100
+    kept = set(m4_indices(x, y, columns).tolist())
+
+    buckets = np.clip(((x - x[0]) / (x[-1] - x[0]) * columns).astype(int), 0, columns - 1)
+    for bucket in np.unique(buckets):
+        members = np.flatnonzero(buckets == bucket)
+        assert members[0] in kept and members[-1] in kept
+        values = y[members]
+        if not np.isnan(values).all():
+            assert members[np.nanargmin(values)] in kept
+            assert members[np.nanargmax(values)] in kept
+    assert len(kept) <= 4 * columns
+
+
+def test_m4_returns_everything_when_already_small():
+    x = np.arange(10.0)
+    assert m4_indices(x, x, 5).tolist() == list(range(10))
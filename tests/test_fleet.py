@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+
+from inverter_monitoring.fleet import FLEET_COLUMNS, HOLD_BINS, FleetAggregator
+
+BIN_SECONDS = 300
+IDS = ["a", "b", "c"]
+
+
+def history(seed, n=400):
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2026-06-01 05:00")
+    # Irregular sampling with gaps longer than the hold window
+    times = start + pd.to_timedelta(np.sort(rng.integers(0, 2 * 86400, n)), unit="s")
+    frame = pd.DataFrame({"Timestamp": times})
+    for column in FLEET_COLUMNS:
+        values = rng.uniform(0, 1000, n)
+        values[rng.random(n) < 0.1] = np.nan
+        frame[column] = values
+    return frame
+
+
+def reference(histories):
+    """Fleet totals with plain pandas: last reading per bin, carried forward, summed."""
+    grid = None
+    columns = {}
+    for inverter_id, frame in histories.items():
+        binned = frame.set_index("Timestamp")[FLEET_COLUMNS]
+        columns[inverter_id] = binned
+        first, last = binned.index.min().floor(f"{BIN_SECONDS}s"), binned.index.max().floor(f"{BIN_SECONDS}s")
+        grid = (first, last) if grid is None else (min(grid[0], first), max(grid[1], last))
+    index = pd.date_range(grid[0], grid[1], freq=f"{BIN_SECONDS}s")
+    totals = {}
+    for metric in FLEET_COLUMNS:
+        per_inverter = [binned[metric].dropna().resample(f"{BIN_SECONDS}s").last().reindex(index)
+                        .ffill(limit=HOLD_BINS[metric]) for binned in columns.values()]
+        totals[metric] = pd.concat(per_inverter, axis=1).sum(axis=1, min_count=1).to_numpy()
+    return index, totals
+
+
+def assert_matches(fleet, histories):
+    index, totals = reference(histories)
+    frame = fleet.totals_frame()
+    assert (frame["Timestamp"].to_numpy() == index.to_numpy()).all()
+    for metric in FLEET_COLUMNS:
+        np.testing.assert_allclose(frame[metric].to_numpy(), totals[metric], equal_nan=True, atol=1e-6)
+
+
+def test_load_matches_pandas_reference():
+    histories = {inverter_id: history(seed) for seed, inverter_id in enumerate(IDS)}
+    fleet = FleetAggregator(IDS, BIN_SECONDS)
+    fleet.load(histories)
+    assert_matches(fleet, histories)
+
+
+def test_day_blocks_in_any_order_match_reference():
+    histories = {inverter_id: history(seed) for seed, inverter_id in enumerate(IDS)}
+    blocks = [(inverter_id, day) for inverter_id, frame in histories.items()
+              for _, day in frame.groupby(frame["Timestamp"].dt.date)]
+    np.random.default_rng(7).shuffle(blocks)
+    fleet = FleetAggregator(IDS, BIN_SECONDS)
+    for inverter_id, block in blocks:
+        fleet.add_frame(inverter_id, block)
+    assert_matches(fleet, histories)
+
+
+def test_live_samples_match_reference():
+    histories = {inverter_id: history(seed, 60) for seed, inverter_id in enumerate(IDS)}
+    fleet = FleetAggregator(IDS, BIN_SECONDS)
+    rows = pd.concat([frame.assign(inverter=inverter_id) for inverter_id, frame in histories.items()])
+    for row in rows.sort_values("Timestamp", kind="stable").to_dict("records"):
+        fleet.add_sample(row["inverter"], row["Timestamp"], row)
+    assert_matches(fleet, histories)
+
+    latest = fleet.latest()
+    shares = fleet.shares("AC Power (W)")
+    assert [row["inverter"] for row in shares] == IDS
+    total = latest["AC Power (W)"]
+    values = [row["value"] for row in shares if row["value"] is not None]
+    if total is not None:
+        assert np.isclose(sum(values), total)
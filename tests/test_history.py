@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+
+from inverter_monitoring.history import SUMMARY_SECONDS, summarize
+
+
+def test_summarize_interleaves_min_and_max_per_bin():
+    times = pd.date_range("2026-06-01 06:00", periods=600, freq="10s")
+    values = np.sin(np.arange(600) / 7.0) * 100
+    frame = pd.DataFrame({"Timestamp": times, "AC Power (W)": values})
+    summary = summarize(frame)
+
+    bins = frame.set_index("Timestamp")["AC Power (W)"].resample(f"{SUMMARY_SECONDS}s")
+    lows, highs = summary.iloc[0::2], summary.iloc[1::2]
+    assert len(lows) == len(highs) == len(bins.min())
+    np.testing.assert_allclose(lows["AC Power (W)"], bins.min().to_numpy())
+    np.testing.assert_allclose(highs["AC Power (W)"], bins.max().to_numpy())
+    assert (lows["Timestamp"].to_numpy() == bins.min().index.to_numpy()).all()
+    offset = (highs["Timestamp"].to_numpy() - lows["Timestamp"].to_numpy()).astype("timedelta64[s]")
+    assert (offset == np.timedelta64(SUMMARY_SECONDS // 2, "s")).all()
+
+
+def test_summarize_drops_empty_bins_and_empty_frames():
+    frame = pd.DataFrame({"Timestamp": pd.to_datetime(["2026-06-01 06:00", "2026-06-01 09:00"]),
+                          "AC Power (W)": [1.0, 2.0]})
+    assert len(summarize(frame)) == 4
+    assert summarize(frame.iloc[:0]).empty
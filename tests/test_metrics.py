@@ -0,0 +1,31 @@
+from inverter_monitoring.metrics import INVERTER_WINDOW, Registry
+
+
+def test_percentiles_over_the_window():
+    registry = Registry()
+    for ms in range(1, 101):
+        registry.observe("fetch", float(ms), "Inverter 1")
+    snapshot = registry.snapshot()
+    fetch = snapshot["stages"]["fetch"]
+    assert fetch["count"] == 100
+    assert (fetch["p50"], fetch["p95"], fetch["p99"], fetch["max"]) == (51.0, 96.0, 100.0, 100.0)
+    assert fetch["mean"] == 50.5
+    assert snapshot["inverters"] == ["Inverter 1"]
+
+    # Per-inverter windows only keep the newest INVERTER_WINDOW samples; counts keep growing
+    mine = registry.snapshot("Inverter 1")["stages"]["fetch"]
+    assert mine["count"] == 100
+    assert mine["p50"] == float(100 - INVERTER_WINDOW + INVERTER_WINDOW // 2 + 1)
+
+
+def test_counters_gauges_and_reset():
+    registry = Registry()
+    registry.incr("fetch_failures")
+    registry.incr("fetch_failures", 2)
+    registry.gauge("backlog", lambda: 7)
+    registry.gauge("broken", lambda: 1 / 0)
+    snapshot = registry.snapshot()
+    assert snapshot["counters"] == {"fetch_failures": 3}
+    assert snapshot["gauges"] == {"backlog": 7, "broken": None}
+    registry.reset()
+    assert registry.snapshot()["stages"] == {} and registry.snapshot()["counters"] == {}
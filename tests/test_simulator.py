@@ -0,0 +1,23 @@
+from inverter_monitoring.simulator import FleetSimulator, sim_device_id
+
+NOON = 1780315200.0  # 2026-06-01 12:00 UTC
+
+
+def samples(seed):
+    simulator = FleetSimulator([sim_device_id(i) for i in range(3)], seed=seed)
+    return [simulator.sample(sim_device_id(i), NOON + step * 300) for step in range(12) for i in range(3)]
+
+
+def test_same_seed_gives_same_samples():
+    assert samples(4) == samples(4)
+
+
+def test_different_seeds_differ():
+    assert samples(4) != samples(5)
+
+
+def test_energy_counter_never_decreases():
+    simulator = FleetSimulator(seed=1)
+    readings = [simulator.sample("sim0", NOON + step * 600)["important_dps"]["reverse_energy_total (kWh)"]
+                for step in range(72)]
+    assert readings == sorted(readings)
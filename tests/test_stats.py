@@ -0,0 +1,65 @@
+import math
+import random
+
+import pandas as pd
+
+from inverter_monitoring.stats import InverterStats, RunningStats
+
+
+def one_pass(values):
+    stats = RunningStats()
+    for value in values:
+        stats.add(value)
+    return stats
+
+
+def test_merge_matches_one_pass():
+    rng = random.Random(1)
+    values = [rng.uniform(-50, 500) for _ in range(1000)]
+    merged = one_pass(values[:300])
+    merged.merge_series(pd.Series(values[300:700]))
+    block = one_pass(values[700:])
+    merged.merge(block.count, block.mean, block._m2, block.min, block.max)
+
+    expected = one_pass(values)
+    assert merged.count == expected.count
+    assert math.isclose(merged.mean, expected.mean, rel_tol=1e-12)
+    assert math.isclose(merged.variance, expected.variance, rel_tol=1e-9)
+    assert (merged.min, merged.max) == (expected.min, expected.max)
+
+
+def test_merge_into_empty_and_skips_nan():
+    stats = RunningStats()
+    stats.merge_series(pd.Series([1.0, float("nan"), 3.0]))
+    assert stats.count == 2
+    assert stats.mean == 2.0
+    assert stats.variance == 2.0
+    stats.merge(0, 0.0, 0.0, 0.0, 0.0)
+    assert stats.count == 2
+
+
+def counter_rows(readings, start="2026-06-01 08:00"):
+    times = pd.date_range(start, periods=len(readings), freq="5min")
+    return pd.DataFrame({"Timestamp": times, "Reverse Energy (kWh)": readings})
+
+
+def test_energy_today_survives_a_counter_reset():
+    # 100 -> 103 is 3 kWh, then the counter restarts from 0 and reaches 2 kWh: 5 kWh in all
+    readings = [100.0, 101.0, 103.0, 0.5, 2.0]
+    live = InverterStats()
+    for row in counter_rows(readings).to_dict("records"):
+        live.update(row["Timestamp"].to_pydatetime(), row)
+    assert math.isclose(live.energy_today, 5.0)
+
+    seeded = InverterStats()
+    seeded.seed(counter_rows(readings))
+    assert math.isclose(seeded.energy_today, 5.0)
+
+
+def test_energy_today_with_history_after_live_samples():
+    frame = counter_rows([10.0, 11.0, 0.0, 1.5, 2.5])
+    stats = InverterStats()
+    for row in frame.iloc[3:].to_dict("records"):
+        stats.update(row["Timestamp"].to_pydatetime(), row)
+    stats.seed(frame.iloc[:3])
+    assert math.isclose(stats.energy_today, 3.5)